@@ -0,0 +1,217 @@
+# bench.py
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(DIRECTORIO, '..', 'src'))
+
+from movimientos import successors, apply_moves
+from estado import Estado
+from bitboard import Layout
+from frontera import Frontera, FronteraFIFO, FronteraLIFO, FronteraCubetas
+from solver import buscar
+
+# Puzzle de referencia de los micro-benchmarks (primer ejemplo del README)
+PUZZLE_MICRO = 'BBoJoooHoJKLGHAAKLGDDDKMooIEEMFFIooo'
+
+# Configuraciones de los macro-benchmarks: (estrategia, heurística, longitud óptima máxima).
+# WAStar y Beam (pesos y anchura por defecto) se comparan con AStar por la longitud y el coste.
+# IDA* repite mucho trabajo con el coste por movimiento: solo se mide en los puzzles cortos. ARA*,
+# HDA*, PBFS y EBFS tardan menos de medio segundo incluso en el puzzle de 51 movimientos, así que
+# se miden en todo el corpus. La memoria pico de HDA* y PBFS es solo la del proceso coordinador.
+CONFIGURACIONES = [
+    ('BFS', None, None), ('DFS', None, None), ('UC', None, None), ('GBF', 2, None), ('AStar', 2, None),
+    ('AStar', 3, None), ('AStar', 4, None), ('WAStar', 4, None), ('Beam', 4, None), ('BiBFS', None, None),
+    ('IDAStar', 3, 10), ('ARAStar', 3, None), ('HDAStar', 3, None), ('PBFS', None, None), ('EBFS', None, None),
+]
+
+# Tabla de transposición de IDA* en los benchmarks (sin tabla es demasiado lento en puzzles largos)
+TAMANO_TABLA = 100000
+
+# Procesos de HDA* y PBFS: fijos para que los resultados se puedan comparar entre máquinas
+PROCESOS = 2
+
+# Por debajo de este tiempo (segundos) las diferencias se consideran ruido
+TIEMPO_MINIMO = 0.001
+
+# Ídem para la memoria pico (bytes): incluye reservas únicas del proceso
+MEMORIA_MINIMA = 1 << 20
+
+# QUE: Mide el tiempo medio por llamada de una función (mejor de varias rondas).
+# POR QUE: Cada ronda repite la función hasta superar una duración mínima; tomar la mejor ronda
+#          reduce el ruido de otros procesos.
+def medir(funcion, rondas=5, duracion=0.1):
+    mejor = float('inf')
+    for _ in range(rondas):
+        repeticiones = 0
+        t0 = time.perf_counter_ns()
+        while True:
+            funcion()
+            repeticiones += 1
+            transcurrido = time.perf_counter_ns() - t0
+            if transcurrido >= duracion * 1e9:
+                break
+        mejor = min(mejor, transcurrido / repeticiones)
+    return mejor
+
+# QUE: Llena y vacía una frontera con prioridades enteras pequeñas.
+# POR QUE: Coste medio de insertar + extraer de cada implementación de frontera.
+def _frontera(clase, n=10000):
+    def ejecutar():
+        frontera = clase()
+        for i in range(n):
+            frontera.insertar(i, i % 64)
+        while not frontera.vacia():
+            frontera.extraer()
+    return ejecutar
+
+# QUE: Micro-benchmarks de las operaciones del bucle de búsqueda.
+# POR QUE: Aíslan el coste de generar sucesores, aplicar movimientos, evaluar heurísticas y operar
+#          la frontera. Resultado en nanosegundos por operación.
+def micro():
+    layout = Layout(PUZZLE_MICRO)
+    offsets = layout.codificar(PUZZLE_MICRO)
+    estado = Estado(PUZZLE_MICRO)
+    casos = {
+        'successors': lambda: successors(PUZZLE_MICRO),
+        'Layout.sucesores': lambda: list(layout.sucesores(offsets)),
+        'apply_moves': lambda: apply_moves(PUZZLE_MICRO, ['A+1']),
+    }
+    for tipo in (0, 1, 2):
+        casos[f'Estado.heuristica({tipo})'] = lambda tipo=tipo: estado.heuristica(tipo)
+    for tipo in (0, 1, 2, 3, 4):
+        casos[f'Layout.heuristica({tipo})'] = lambda tipo=tipo: layout.heuristica(offsets, tipo)
+
+    resultados = {}
+    for nombre, funcion in casos.items():
+        resultados[nombre] = round(medir(funcion), 1)
+
+    # La frontera se mide por operación (inserción + extracción)
+    for clase in (FronteraFIFO, FronteraLIFO, FronteraCubetas, Frontera):
+        resultados[clase.__name__] = round(medir(_frontera(clase), rondas=3) / 10000, 1)
+    return resultados
+
+# QUE: Ejecuta una búsqueda completa y devuelve sus métricas.
+# POR QUE: Tiempo de pared, nodos por segundo, longitud y coste de la solución; la memoria pico se
+#          mide en una segunda ejecución con tracemalloc para no distorsionar el tiempo.
+def ejecutar_busqueda(puzzle, estrategia, heuristica):
+    profundidad = max(40, puzzle['moves']) if estrategia == 'DFS' else None
+
+    t0 = time.perf_counter()
+    camino, stats = buscar(puzzle['s'], estrategia, profundidad, heuristica, TAMANO_TABLA, procesos=PROCESOS)
+    tiempo = time.perf_counter() - t0
+
+    tracemalloc.start()
+    buscar(puzzle['s'], estrategia, profundidad, heuristica, TAMANO_TABLA, procesos=PROCESOS)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'tiempo_s': round(tiempo, 4),
+        'tn': stats.tn,
+        'en': stats.en,
+        'nodos_s': round(stats.tn / tiempo) if tiempo > 0 else None,
+        'memoria_pico': pico,
+        'longitud': len(camino) - 1 if camino else None,
+        'costo': camino[-1].costo if camino else None,
+    }
+
+# QUE: Macro-benchmarks: cada configuración sobre cada puzzle del corpus seleccionado.
+# POR QUE: Mide el efecto de un cambio sobre búsquedas completas de dificultad creciente.
+def macro(corpus, configuraciones, progreso=None):
+    resultados = {}
+    for puzzle in corpus:
+        for estrategia, heuristica, max_movimientos in configuraciones:
+            if max_movimientos is not None and puzzle['moves'] > max_movimientos:
+                continue
+            nombre = estrategia if heuristica is None else f'{estrategia}(h{heuristica})'
+            clave = f"{nombre}|{puzzle['moves']}|{puzzle['s']}"
+            resultados[clave] = ejecutar_busqueda(puzzle, estrategia, heuristica)
+            if progreso:
+                progreso(clave, resultados[clave])
+    return resultados
+
+# QUE: Lee el corpus graduado (JSON lines) filtrando por longitud óptima máxima.
+def leer_corpus(ruta, max_movimientos=None):
+    corpus = []
+    with open(ruta, encoding='utf-8') as f:
+        for linea in f:
+            if linea.strip():
+                puzzle = json.loads(linea)
+                if max_movimientos is None or puzzle['moves'] <= max_movimientos:
+                    corpus.append(puzzle)
+    return corpus
+
+# QUE: Compara unos resultados con una línea base guardada.
+# POR QUE: Marca como regresión todo tiempo o memoria que empeore más de la tolerancia y como
+#          cambio toda solución de distinta longitud o coste. Devuelve la lista de avisos.
+def comparar(actual, base, tolerancia):
+    avisos = []
+    for nombre, valor in actual.get('micro', {}).items():
+        anterior = base.get('micro', {}).get(nombre)
+        if anterior and valor > anterior * (1 + tolerancia):
+            avisos.append(f"REGRESION micro {nombre}: {anterior} ns -> {valor} ns (+{valor / anterior - 1:.0%})")
+
+    for clave, datos in actual.get('macro', {}).items():
+        anterior = base.get('macro', {}).get(clave)
+        if anterior is None:
+            continue
+        if max(datos['tiempo_s'], anterior['tiempo_s']) >= TIEMPO_MINIMO and \
+                datos['tiempo_s'] > anterior['tiempo_s'] * (1 + tolerancia):
+            avisos.append(f"REGRESION tiempo {clave}: {anterior['tiempo_s']} s -> {datos['tiempo_s']} s "
+                          f"(+{datos['tiempo_s'] / anterior['tiempo_s'] - 1:.0%})")
+        if max(datos['memoria_pico'], anterior['memoria_pico']) >= MEMORIA_MINIMA and \
+                datos['memoria_pico'] > anterior['memoria_pico'] * (1 + tolerancia):
+            avisos.append(f"REGRESION memoria {clave}: {anterior['memoria_pico']} B -> {datos['memoria_pico']} B")
+        if (datos['longitud'], datos['costo']) != (anterior['longitud'], anterior['costo']):
+            avisos.append(f"CAMBIO solución {clave}: longitud {anterior['longitud']} -> {datos['longitud']}, "
+                          f"costo {anterior['costo']} -> {datos['costo']}")
+    return avisos
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks del solucionador de Rush Hour")
+    parser.add_argument('--corpus', default=os.path.join(DIRECTORIO, 'corpus.jsonl'), help="Corpus graduado (JSON lines)")
+    parser.add_argument('--max-moves', type=int, help="Solo puzzles con solución óptima de como mucho N movimientos")
+    parser.add_argument('--strategy', action='append', help="Solo estas estrategias (puede repetirse)")
+    parser.add_argument('--no-micro', action='store_true', help="Omite los micro-benchmarks")
+    parser.add_argument('--no-macro', action='store_true', help="Omite los macro-benchmarks")
+    parser.add_argument('-o', help="Guarda los resultados en este fichero JSON (p. ej. como línea base)")
+    parser.add_argument('--baseline', help="Compara con una línea base JSON guardada con -o")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="Empeoramiento relativo tolerado (por defecto 0.15)")
+    args = parser.parse_args()
+
+    resultados = {'entorno': {'python': platform.python_version(), 'plataforma': platform.platform()}}
+
+    if not args.no_micro:
+        resultados['micro'] = micro()
+        for nombre, ns in resultados['micro'].items():
+            print(f"{nombre:28} {ns:>12.1f} ns/op")
+
+    if not args.no_macro:
+        configuraciones = [c for c in CONFIGURACIONES if not args.strategy or c[0] in args.strategy]
+        corpus = leer_corpus(args.corpus, args.max_moves)
+
+        def mostrar(clave, datos):
+            print(f"{clave:60} {datos['tiempo_s']:>9.4f} s {datos['nodos_s'] or 0:>9} nodos/s "
+                  f"{datos['memoria_pico'] / 1e6:>8.2f} MB", flush=True)
+
+        resultados['macro'] = macro(corpus, configuraciones, mostrar)
+
+    if args.o:
+        with open(args.o, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            base = json.load(f)
+        avisos = comparar(resultados, base, args.tolerance)
+        for aviso in avisos:
+            print(aviso)
+        print(f"Regresiones y cambios: {len(avisos)}")
+        if avisos:
+            sys.exit(1)
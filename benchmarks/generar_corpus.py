@@ -0,0 +1,77 @@
+# generar_corpus.py
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bitboard import Layout
+from basedatos import bfs_retrogrado
+
+# Disposiciones semilla: los dos puzzles del README y disposiciones con estados lejanos a la meta. La
+# última tiene estados a 51 movimientos (comprobado con la BFS hacia atrás de basedatos), el máximo
+# de un tablero de 6x6
+SEMILLAS = [
+    'BBoJoooHoJKLGHAAKLGDDDKMooIEEMFFIooo',
+    'HBBCCCHDDKoMAAJKoMEEJFFMoIooLooIGGLo',
+    'oooHHooooCCoAADLBEMoDLBEMGKKIFMGJJIF',
+    'oGBKKooGBHLIAAoHLIDMMCFJDooCFJoEEEoJ',
+    'EIoHHHEIKoBBAAKooLCCJJFLDDoGFMoNNGoM',
+    'JoEEoLJoIGoLAAIGBoMMMKBHoDDKBHoCCoFF',
+    'FFEEMoooJGMHAAJGoHoDDoLLNBoIICNBKKoC',
+    'GBBoLoGHIoLMGHIAAMCCCKoMooJKDDEEJFFo',
+]
+
+# Distancias óptimas (en movimientos) que se buscan en cada disposición (en 6x6 no hay más de 51)
+DISTANCIAS = [1, 2, 3, 5, 8, 10, 12, 15, 18, 20, 22, 25, 28, 30, 35, 40, 45, 48, 50, 51]
+
+# QUE: Grado de dificultad según la longitud óptima de la solución.
+# POR QUE: Permite filtrar el corpus (p. ej. solo puzzles rápidos) y agrupar los resultados.
+def grado(movimientos):
+    if movimientos <= 3:
+        return 'trivial'
+    if movimientos <= 10:
+        return 'facil'
+    if movimientos <= 20:
+        return 'medio'
+    if movimientos <= 30:
+        return 'dificil'
+    return 'experto'
+
+# QUE: Genera el corpus graduado a partir de las disposiciones semilla.
+# POR QUE: La búsqueda en anchura hacia atrás da la distancia exacta de todos los estados de una
+#          disposición. Para cada distancia objetivo se toma un único puzzle, alternando la semilla de
+#          la que se parte para variar las disposiciones, y dentro de ella el estado de menor vector
+#          de offsets (determinista: el corpus se regenera siempre igual).
+def generar(semillas):
+    espacios = []
+    for semilla in semillas:
+        layout = Layout(semilla)
+        por_distancia = {}
+        for estado, d in bfs_retrogrado(layout).items():
+            if d in DISTANCIAS and (d not in por_distancia or estado < por_distancia[d]):
+                por_distancia[d] = estado
+        espacios.append((layout, por_distancia))
+
+    corpus = []
+    for k, d in enumerate(DISTANCIAS):
+        for j in range(len(espacios)):
+            layout, por_distancia = espacios[(k + j) % len(espacios)]
+            if d in por_distancia:
+                corpus.append({'s': layout.decodificar(por_distancia[d]), 'moves': d, 'grade': grado(d)})
+                break
+    return corpus
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Genera el corpus graduado de puzzles para los benchmarks")
+    parser.add_argument('-o', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus.jsonl'),
+                        help="Fichero de salida (JSON lines, compatible con la acción batch)")
+    args = parser.parse_args()
+
+    corpus = generar(SEMILLAS)
+    with open(args.o, 'w', encoding='utf-8') as f:
+        for puzzle in corpus:
+            f.write(json.dumps(puzzle) + '\n')
+    print(f"Puzzles: {len(corpus)}")
+    print(f"Longitud máxima: {max(p['moves'] for p in corpus)}")
@@ -0,0 +1,189 @@
+# anytime.py
+import heapq
+import time
+from itertools import count
+from nodo import Nodo
+from estado import Estado
+from solver import Estadisticas
+from limites import LimiteAlcanzado, OPTIMA, SOLUCION, SIN_SOLUCION
+
+# Pesos sucesivos de la heurística (el último, 1, es A*)
+PESOS = (5, 3, 2, 1.5, 1.25, 1)
+
+# QUE: Búsqueda anytime ARA* (A* ponderado con peso decreciente que reutiliza la búsqueda anterior).
+# POR QUE: Con un peso alto encuentra enseguida una primera solución; cada iteración reduce el peso
+#          y mejora la solución reaprovechando los costes g ya calculados. Solo se reexpanden los
+#          estados cuyo g ha mejorado (lista INCONS). Cada mejora se comunica a
+#          al_mejorar(camino, stats, peso, cota). La cota es el factor de suboptimalidad demostrado:
+#          coste de la solución / menor g + h pendiente. Termina al demostrar la optimalidad
+#          (cota <= 1), al acabar con peso 1 o al superar un límite; siempre devuelve la mejor
+#          solución encontrada. La cota solo es válida con heurísticas admisibles (3 y 4): con las
+#          demás no se calcula (None).
+def buscar_anytime(inicio, heuristic_type, pesos=PESOS, al_mejorar=None, limites=None):
+    layout = inicio.layout
+    if layout is None:
+        raise ValueError("ARAStar requiere un tablero válido para el motor de offsets")
+
+    stats = Estadisticas()
+    stats.iteraciones = 0
+    t0 = time.perf_counter_ns()
+
+    raiz = inicio.offsets
+    heuristicas = {raiz: layout.heuristica(raiz, heuristic_type)}
+
+    # Mejor coste conocido de cada estado y su predecesor (estado, acción, coste de la acción, id). Cada
+    # mejora de g es un nodo nuevo, con el siguiente id de la búsqueda (como en AlmacenNodos)
+    ids = count()
+    g = {raiz: 0}
+    padre = {raiz: (None, '___', 0, next(ids))}
+    stats.generar()
+
+    # Mejor meta encontrada y su coste
+    meta = None
+    incumbente = float('inf')
+    mejor_camino = None
+
+    # Estados pendientes para la siguiente iteración: abiertos e inconsistentes (g mejorado tras cerrarse)
+    pendientes = {raiz}
+    desempate = count()
+
+    # Cota demostrada al terminar la última iteración completa (None mientras no haya ninguna)
+    admisible = heuristic_type in (3, 4)
+    cota = None
+
+    try:
+        for peso in pesos:
+            stats.iteraciones += 1
+
+            # Se reconstruye la frontera con el nuevo peso
+            abiertos = [(g[e] + peso * heuristicas[e], next(desempate), e) for e in pendientes]
+            heapq.heapify(abiertos)
+            cerrados = set()
+            inconsistentes = set()
+
+            # Se expande mientras algún estado pueda mejorar la meta (con el peso actual). Los límites se
+            # comprueban antes de sacar un estado: si se interrumpe, todo estado cerrado está expandido
+            # y los abiertos e inconsistentes siguen completos para calcular la cota
+            while abiertos and abiertos[0][0] < incumbente:
+                if limites is not None:
+                    limites.comprobar(stats)
+                f, _, estado = heapq.heappop(abiertos)
+
+                # Entrada obsoleta: estado ya cerrado o cuyo g ha mejorado desde que se insertó
+                if estado in cerrados or f != g[estado] + peso * heuristicas[estado]:
+                    stats.podar()
+                    continue
+                cerrados.add(estado)
+
+                stats.expandir()
+
+                g_estado = g[estado]
+                h_estado = heuristicas[estado]
+                for accion, hijo, coste, movido in layout.movimientos(estado):
+                    nuevo_g = g_estado + coste
+                    if nuevo_g >= g.get(hijo, float('inf')):
+                        continue
+                    g[hijo] = nuevo_g
+                    padre[hijo] = (estado, accion, coste, next(ids))
+                    stats.generar()
+
+                    if hijo not in heuristicas:
+                        heuristicas[hijo] = layout.heuristica_incremental(h_estado, estado, hijo, movido, heuristic_type)
+
+                    # Las metas no se expanden: actualizan la mejor solución
+                    if layout.es_meta(hijo):
+                        if nuevo_g < incumbente:
+                            meta, incumbente = hijo, nuevo_g
+                        continue
+
+                    if hijo in cerrados:
+                        inconsistentes.add(hijo)
+                    else:
+                        heapq.heappush(abiertos, (nuevo_g + peso * heuristicas[hijo], next(desempate), hijo))
+
+            # Estados que quedan pendientes para la siguiente iteración
+            pendientes = {e for _, _, e in abiertos if e not in cerrados} | inconsistentes
+            if meta is None:
+                continue
+
+            # Cota de suboptimalidad: min(peso, coste de la solución / menor g + h pendiente)
+            minimo = _minimo(pendientes, g, heuristicas)
+            if admisible:
+                cota = max(1, peso if minimo == 0 else min(peso, incumbente / minimo))
+            mejor_camino = _publicar(layout, padre, heuristicas, meta, mejor_camino, stats, t0,
+                                     cota, peso, al_mejorar)
+
+            # Optimalidad demostrada: nada pendiente puede mejorar la solución
+            if minimo >= incumbente:
+                stats.cota = 1 if admisible else None
+                stats.motivo = OPTIMA
+                break
+    except LimiteAlcanzado as e:
+        stats.motivo = e.motivo
+        if meta is not None:
+            # Meta encontrada en la iteración interrumpida: el peso en curso no está demostrado. Sí lo
+            # está coste / menor g + h de los abiertos e inconsistentes (todo camino óptimo pasa por
+            # uno de ellos), sin superar la cota de la última iteración completa
+            minimo = _minimo({e for _, _, e in abiertos if e not in cerrados} | inconsistentes, g, heuristicas)
+            if admisible and minimo > 0:
+                interrumpida = incumbente / minimo
+                cota = max(1, interrumpida if cota is None else min(cota, interrumpida))
+            mejor_camino = _publicar(layout, padre, heuristicas, meta, mejor_camino, stats, t0,
+                                     cota, peso, al_mejorar)
+
+    stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+    if stats.motivo is None:
+        stats.motivo = SOLUCION if mejor_camino else SIN_SOLUCION
+    return mejor_camino, stats
+
+# QUE: Actualiza la mejor solución si la meta actual la mejora y la comunica a al_mejorar.
+# POR QUE: Devuelve el camino vigente (el nuevo o el anterior) y deja la cota en las estadísticas.
+def _publicar(layout, padre, heuristicas, meta, mejor_camino, stats, t0, cota, peso, al_mejorar):
+    stats.cota = cota
+    if mejor_camino is not None and mejor_camino[-1].costo <= _costo(padre, meta):
+        return mejor_camino
+
+    camino = _camino(layout, padre, heuristicas, meta)
+    stats.df = len(camino) - 1
+    if al_mejorar is not None:
+        stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+        al_mejorar(camino, stats, peso, cota)
+    return camino
+
+# Menor g + h de un conjunto de estados (infinito si está vacío)
+def _minimo(estados, g, heuristicas):
+    return min((g[e] + heuristicas[e] for e in estados), default=float('inf'))
+
+# Coste acumulado hasta un estado siguiendo sus predecesores
+def _costo(padre, estado):
+    costo = 0
+    while estado is not None:
+        estado, _, coste, _ = padre[estado]
+        costo += coste
+    return costo
+
+# QUE: Reconstruye el camino de nodos hasta una meta a partir de los predecesores.
+# POR QUE: Formato común de salida (valor = g + h, como en A*).
+def _camino(layout, padre, heuristicas, meta):
+    estados = []
+    estado = meta
+    while estado is not None:
+        estados.append(estado)
+        estado = padre[estado][0]
+
+    actual = None
+    for estado in reversed(estados):
+        _, accion, coste, ident = padre[estado]
+        costo = actual.costo + coste if actual else 0
+        h = heuristicas[estado]
+        actual = Nodo(
+            Estado.desde_offsets(layout, estado),
+            padre=actual,
+            accion=accion,
+            costo=costo,
+            profundidad=actual.profundidad + 1 if actual else 0,
+            heuristica=h,
+            valor=costo + h,
+            id=ident
+        )
+    return actual.camino()
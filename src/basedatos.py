@@ -0,0 +1,216 @@
+# basedatos.py
+import mmap
+import struct
+import time
+from nodo import Nodo
+from estado import Estado
+from bitboard import Layout
+from solver import Estadisticas
+from canonica import canonizar, invertir
+from tablero import Geometria, CLASICO
+
+# Cabecera del fichero: firma, versión, bytes por clave y número de vehículos; desde la versión 2
+# le sigue la geometría del tablero (filas, columnas y fila de salida) y desde la 3 los bytes por
+# distancia (las versiones anteriores usan siempre 1)
+MAGICO = b'RHDB'
+VERSION = 3
+CABECERA = struct.Struct('<4sBBB')
+GEOMETRIA = struct.Struct('<BBB')
+ANCHO_DISTANCIA = struct.Struct('<B')
+VEHICULO = struct.Struct('<cBBB')
+TOTAL = struct.Struct('<Q')
+
+# QUE: Descripción fija de una disposición (vehículo, orientación, carril, longitud).
+# POR QUE: Dos puzzles comparten espacio de estados si y solo si coinciden en esta firma.
+def firma(layout):
+    return tuple(zip(layout.vehiculos, layout.horizontal, layout.carril, layout.longitud))
+
+# QUE: Bases del sistema de numeración mixto (número de offsets posibles de cada vehículo).
+# POR QUE: Permite numerar cada estado con un entero compacto y ordenable.
+def _bases(layout):
+    return [len(m) for m in layout.mascaras]
+
+# QUE: Convierte un vector de offsets en su clave entera (numeración en base mixta).
+# POR QUE: La clave ocupa muchos menos bytes que el vector de offsets o la cadena.
+def _clave(offsets, bases):
+    clave = 0
+    for p, b in zip(reversed(offsets), reversed(bases)):
+        clave = clave * b + p
+    return clave
+
+# QUE: Búsqueda en anchura hacia atrás desde todos los estados meta de una disposición.
+# POR QUE: Calcula la distancia exacta (en movimientos) a la meta de todo estado resoluble. Con
+#          varios procesos cada capa se expande en paralelo (paralelo.BFSParalela).
+def bfs_retrogrado(layout, procesos=None):
+    if procesos is not None and procesos > 1:
+        from paralelo import BFSParalela
+        bfs = BFSParalela(layout, list(layout.estados_meta()), procesos, con_padres=False, buscar_meta=False)
+        try:
+            while bfs.capa()[0]:
+                pass
+            distancias = bfs.distancias()
+            bfs.cerrar()
+        finally:
+            bfs.terminar()
+        return distancias
+
+    distancias = {}
+    capa = []
+    for meta in layout.estados_meta():
+        distancias[meta] = 0
+        capa.append(meta)
+
+    # Los movimientos son reversibles: los sucesores son también los predecesores
+    d = 0
+    while capa:
+        d += 1
+        nueva_capa = []
+        for estado in capa:
+            for _, hijo, _ in layout.sucesores(estado):
+                if hijo not in distancias:
+                    distancias[hijo] = d
+                    nueva_capa.append(hijo)
+        capa = nueva_capa
+    return distancias
+
+# QUE: Construye la base de distancias de la disposición de una cadena y la guarda en disco.
+# POR QUE: Acción 'build-db'; todos los puzzles de la misma disposición se resuelven después sin búsqueda.
+#          Se trabaja sobre la forma canónica, así que también sirve para los puzzles que solo
+#          difieren en las letras de los vehículos.
+def construir_bd(cadena, ruta, procesos=None):
+    layout = Layout(canonizar(cadena)[0])
+    distancias = bfs_retrogrado(layout, procesos)
+
+    bases = _bases(layout)
+    total_claves = 1
+    for b in bases:
+        total_claves *= b
+    ancho = max(1, ((total_claves - 1).bit_length() + 7) // 8)
+
+    # Claves ordenadas en big-endian: el orden de los bytes coincide con el orden numérico
+    filas = sorted((_clave(e, bases), d) for e, d in distancias.items())
+
+    # Las distancias de más de 255 movimientos (posibles en 7x7 y 8x8) necesitan 2 bytes; el ancho
+    # se decide antes de abrir el fichero para no dejarlo a medias
+    maxima = max((d for _, d in filas), default=0)
+    ancho_distancia = max(1, (maxima.bit_length() + 7) // 8)
+
+    with open(ruta, 'wb') as f:
+        f.write(CABECERA.pack(MAGICO, VERSION, ancho, len(layout.vehiculos)))
+        f.write(GEOMETRIA.pack(*layout.geometria))
+        f.write(ANCHO_DISTANCIA.pack(ancho_distancia))
+        for v, horizontal, carril, longitud in firma(layout):
+            f.write(VEHICULO.pack(v.encode('latin-1'), horizontal, carril, longitud))
+        f.write(TOTAL.pack(len(filas)))
+        f.write(b''.join(c.to_bytes(ancho, 'big') for c, _ in filas))
+        f.write(b''.join(d.to_bytes(ancho_distancia, 'big') for _, d in filas))
+
+    return len(filas), maxima
+
+# QUE: Base de distancias cargada desde disco mediante mmap.
+# POR QUE: No se lee el fichero completo; el sistema operativo pagina solo lo que se consulta.
+class BaseDistancias:
+
+    def __init__(self, ruta):
+        self._fichero = open(ruta, 'rb')
+        self._datos = mmap.mmap(self._fichero.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magico, version, self.ancho, n = CABECERA.unpack_from(self._datos, 0)
+        if magico != MAGICO or version not in (1, 2, VERSION):
+            raise ValueError(f"{ruta} no es una base de distancias válida")
+
+        # Las bases de la versión 1 son siempre de tableros 6x6 y hasta la 2 las distancias ocupan 1 byte
+        pos = CABECERA.size
+        self.ancho_distancia = 1
+        if version == 1:
+            self.geometria = CLASICO
+        else:
+            self.geometria = Geometria(*GEOMETRIA.unpack_from(self._datos, pos))
+            pos += GEOMETRIA.size
+        if version >= 3:
+            (self.ancho_distancia,) = ANCHO_DISTANCIA.unpack_from(self._datos, pos)
+            pos += ANCHO_DISTANCIA.size
+        firma_bd = []
+        for _ in range(n):
+            v, horizontal, carril, longitud = VEHICULO.unpack_from(self._datos, pos)
+            firma_bd.append((v.decode('latin-1'), bool(horizontal), carril, longitud))
+            pos += VEHICULO.size
+        self.firma = tuple(firma_bd)
+
+        (self.total,) = TOTAL.unpack_from(self._datos, pos)
+        self._inicio_claves = pos + TOTAL.size
+        self._inicio_distancias = self._inicio_claves + self.total * self.ancho
+
+    # QUE: Devuelve la distancia a la meta de un estado o None si no es resoluble.
+    # POR QUE: Búsqueda binaria sobre las claves ordenadas del fichero mapeado.
+    def distancia(self, offsets, bases):
+        objetivo = _clave(offsets, bases).to_bytes(self.ancho, 'big')
+        datos, ancho, base = self._datos, self.ancho, self._inicio_claves
+        lo, hi = 0, self.total
+        while lo < hi:
+            mid = (lo + hi) // 2
+            clave = datos[base + mid * ancho:base + (mid + 1) * ancho]
+            if clave < objetivo:
+                lo = mid + 1
+            elif clave > objetivo:
+                hi = mid
+            else:
+                pos = self._inicio_distancias + mid * self.ancho_distancia
+                return int.from_bytes(datos[pos:pos + self.ancho_distancia], 'big')
+        return None
+
+    def cerrar(self):
+        self._datos.close()
+        self._fichero.close()
+
+# QUE: Resuelve un puzzle bajando por el gradiente de distancias de la base.
+# POR QUE: Devuelve una solución óptima en O(longitud de la solución) consultas, sin búsqueda.
+def resolver_con_bd(inicio_cadena, bd):
+    canonica, mapa = canonizar(inicio_cadena)
+    original = str.maketrans(invertir(mapa))
+    layout = Layout(canonica)
+    if firma(layout) != bd.firma or layout.geometria != bd.geometria:
+        raise ValueError("La base de distancias corresponde a otra disposición de vehículos")
+
+    bases = _bases(layout)
+    stats = Estadisticas()
+    t0 = time.perf_counter_ns()
+
+    offsets = layout.codificar(canonica)
+    d = bd.distancia(offsets, bases)
+    stats.generar()
+
+    if d is None:
+        stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+        return None, stats
+
+    # Se materializan los nodos en el mismo formato que BFS (valor = profundidad),
+    # con las letras originales del puzzle consultado. El id de cada nodo es su orden de generación
+    # entre los sucesores consultados
+    actual = Nodo(Estado(inicio_cadena))
+    camino = [actual]
+    while d > 0:
+        stats.expandir()
+        for accion, hijo, coste in layout.sucesores(offsets):
+            stats.generar()
+            if bd.distancia(hijo, bases) == d - 1:
+                break
+        else:
+            raise ValueError("Base de distancias inconsistente")
+
+        offsets, d = hijo, d - 1
+        prof = actual.profundidad + 1
+        actual = Nodo(
+            Estado(layout.decodificar(offsets).translate(original)),
+            padre=actual,
+            accion=accion.translate(original),
+            costo=actual.costo + coste,
+            profundidad=prof,
+            valor=prof,
+            id=stats.tn - 1
+        )
+        camino.append(actual)
+
+    stats.df = actual.profundidad
+    stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+    return camino, stats
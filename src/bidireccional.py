@@ -0,0 +1,136 @@
+# bidireccional.py
+import time
+from itertools import count
+from nodo import Nodo
+from estado import Estado
+from solver import Estadisticas
+
+# QUE: Invierte una acción ("B+2" -> "B-2").
+# POR QUE: Los movimientos son reversibles; la búsqueda hacia atrás recorre las aristas al revés.
+def invertir_accion(accion):
+    return accion[0] + ('-' if accion[1] == '+' else '+') + accion[2:]
+
+# QUE: Búsqueda en anchura bidireccional desde el estado inicial y desde todos los estados meta.
+# POR QUE: Cada frente solo necesita alcanzar la mitad de la profundidad de la solución, lo que
+#          reduce drásticamente los nodos expandidos en puzzles con soluciones largas, manteniendo
+#          la optimalidad en número de movimientos de BFS.
+def buscar_bidireccional(inicio, limites=None):
+    layout = inicio.layout
+    if layout is None:
+        raise ValueError("BiBFS requiere un tablero válido para el motor de offsets")
+
+    stats = Estadisticas()
+    t0 = time.perf_counter_ns()
+
+    # Identificadores de los nodos en orden de generación, compartidos por los dos frentes
+    ids = count()
+
+    # Padres del frente hacia delante: estado -> (estado anterior, acción, coste, id); None en la raíz
+    adelante = {inicio.offsets: (None, '___', 0, next(ids))}
+    stats.generar()
+
+    # Sucesores del frente hacia atrás: estado -> (estado siguiente hacia la meta, acción, coste, id)
+    atras = {}
+    for meta in layout.estados_meta():
+        atras[meta] = (None, '___', 0, next(ids))
+        stats.generar()
+
+    capa_adelante = [inicio.offsets]
+    capa_atras = list(atras)
+
+    # Profundidad alcanzada por cada frente (todas sus capas hasta ella están completas)
+    prof_adelante = prof_atras = 0
+
+    # Distancia de cada estado a su origen en cada frente (para elegir el mejor encuentro)
+    dist_adelante = {inicio.offsets: 0}
+    dist_atras = dict.fromkeys(atras, 0)
+
+    encuentro = None
+    if inicio.offsets in atras:
+        encuentro = inicio.offsets
+
+    while encuentro is None and capa_adelante and capa_atras:
+        # Se expande completa la capa más pequeña para equilibrar ambos frentes
+        hacia_delante = len(capa_adelante) <= len(capa_atras)
+        propios, ajenos = (adelante, atras) if hacia_delante else (atras, adelante)
+        dist_propia, dist_ajena = (dist_adelante, dist_atras) if hacia_delante else (dist_atras, dist_adelante)
+        capa = capa_adelante if hacia_delante else capa_atras
+        prof = (prof_adelante if hacia_delante else prof_atras) + 1
+
+        nueva_capa = []
+        mejor = None
+        for estado in capa:
+            stats.expandir()
+            if limites is not None:
+                limites.comprobar(stats)
+            for accion, hijo, coste in layout.sucesores(estado):
+                if hijo in propios:
+                    stats.podar()
+                    continue
+
+                stats.generar()
+                if hacia_delante:
+                    propios[hijo] = (estado, accion, coste, next(ids))
+                else:
+                    # Se guarda el movimiento en el sentido hijo -> estado (hacia la meta)
+                    propios[hijo] = (estado, invertir_accion(accion), coste, next(ids))
+                dist_propia[hijo] = prof
+                nueva_capa.append(hijo)
+
+                # Encuentro: la capa se termina para quedarse con el de menor longitud total
+                if hijo in ajenos:
+                    total = prof + dist_ajena[hijo]
+                    if mejor is None or total < mejor[0]:
+                        mejor = (total, hijo)
+
+        if hacia_delante:
+            prof_adelante = prof
+            capa_adelante = nueva_capa
+        else:
+            prof_atras = prof
+            capa_atras = nueva_capa
+
+        if mejor is not None:
+            encuentro = mejor[1]
+
+    stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+
+    if encuentro is None:
+        stats.df = prof_adelante + prof_atras
+        return None, stats
+
+    # Tramo inicial: del encuentro hacia atrás hasta el inicio por los padres del frente hacia delante.
+    # Cada estado conserva el id con el que lo generó su frente
+    tramo = []
+    estado = encuentro
+    while adelante[estado][0] is not None:
+        padre, accion, coste, ident = adelante[estado]
+        tramo.append((accion, estado, coste, ident))
+        estado = padre
+    tramo.reverse()
+
+    # Tramo final: del encuentro hasta la meta por los enlaces del frente hacia atrás
+    estado = encuentro
+    while atras[estado][0] is not None:
+        siguiente, accion, coste, _ = atras[estado]
+        tramo.append((accion, siguiente, coste, atras[siguiente][3]))
+        estado = siguiente
+
+    # Se materializan los nodos en el mismo formato que BFS (valor = profundidad)
+    actual = Nodo(inicio, id=adelante[inicio.offsets][3])
+    camino = [actual]
+    for accion, offsets, coste, ident in tramo:
+        prof = actual.profundidad + 1
+        actual = Nodo(
+            Estado.desde_offsets(layout, offsets),
+            padre=actual,
+            accion=accion,
+            costo=actual.costo + coste,
+            profundidad=prof,
+            valor=prof,
+            id=ident
+        )
+        camino.append(actual)
+
+    stats.df = len(tramo)
+    return camino, stats
@@ -0,0 +1,320 @@
+# bitboard.py
+from movimientos import vehiculo
+from tablero import def_tablero, geometria, CLASICO
+
+# QUE: Convierte una lista de casillas (r, c) en una máscara de bits (un bit por casilla).
+# POR QUE: Cada casilla del tablero se representa con un bit (índice r * columnas + c). Hasta 8x8
+#          la máscara cabe en una palabra de 64 bits.
+def mascara(celdas, columnas=CLASICO.columnas):
+    m = 0
+    for r, c in celdas:
+        m |= 1 << (r * columnas + c)
+    return m
+
+# QUE: Disposición fija e inmutable de los vehículos de un puzzle con sus tablas precompiladas.
+# POR QUE: Un vehículo nunca cambia de carril, orientación ni longitud, así que basta con guardar
+#          por nodo el desplazamiento (offset) de cada vehículo dentro de su carril. Los movimientos
+#          legales y las máscaras de ocupación se calculan una sola vez y se comparten entre nodos.
+#          Un estado es un objeto bytes con un offset por vehículo (en el orden de self.vehiculos).
+#          Las dimensiones del tablero y la fila de salida forman parte de la disposición
+#          (self.geometria); por defecto se deducen de la longitud de la cadena.
+class Layout:
+
+    def __init__(self, cadena, fila_salida=None):
+        self.geometria = geo = geometria(cadena, fila_salida)
+        self.fila_salida = geo.fila_salida
+
+        posiciones = vehiculo(def_tablero(cadena))
+
+        # Vehículos en orden alfabético (mismo orden determinista que movimientos.successors)
+        self.vehiculos = tuple(sorted(posiciones))
+        self.indice = {v: i for i, v in enumerate(self.vehiculos)}
+
+        # Propiedades fijas de cada vehículo
+        horizontal, carril, longitud = [], [], []
+
+        # Por vehículo y offset: máscara de bits de las casillas ocupadas
+        mascaras = []
+
+        # Por vehículo y offset: (movimientos '+', movimientos '-')
+        tablas = []
+
+        for v in self.vehiculos:
+            pos_list = posiciones[v]
+            rows = [r for r, _ in pos_list]
+            cols = [c for _, c in pos_list]
+
+            # Misma regla de orientación que movimientos.successors
+            es_horizontal = len(set(rows)) == 1
+            lineas = cols if es_horizontal else rows
+            if (not es_horizontal and len(set(cols)) != 1) or \
+                    sorted(lineas) != list(range(min(lineas), min(lineas) + len(lineas))):
+                raise ValueError(f"El vehículo {v} no es recto y contiguo")
+
+            largo = len(pos_list)
+            fijo = rows[0] if es_horizontal else cols[0]
+
+            horizontal.append(es_horizontal)
+            carril.append(fijo)
+            longitud.append(largo)
+
+            # Máscara del vehículo para cada offset posible dentro de su carril
+            columnas = geo.columnas
+            if es_horizontal:
+                masc = tuple(mascara(((fijo, p + k) for k in range(largo)), columnas)
+                             for p in range(columnas - largo + 1))
+            else:
+                masc = tuple(mascara(((p + k, fijo) for k in range(largo)), columnas)
+                             for p in range(geo.filas - largo + 1))
+            mascaras.append(masc)
+
+            tabla = []
+            for p in range(len(masc)):
+                crecientes = range(p + 1, len(masc))
+                decrecientes = range(p - 1, -1, -1)
+
+                # En horizontal '+' es derecha (offset creciente); en vertical '+' es arriba
+                mas, menos = (crecientes, decrecientes) if es_horizontal else (decrecientes, crecientes)
+                # Coste de un movimiento: longitud del carril menos los pasos (como en movimientos)
+                carril_total = columnas if es_horizontal else geo.filas
+                tabla.append((
+                    self._desplazamientos(v, '+', masc, p, mas, carril_total),
+                    self._desplazamientos(v, '-', masc, p, menos, carril_total),
+                ))
+            tablas.append(tuple(tabla))
+
+        self.horizontal = tuple(horizontal)
+        self.carril = tuple(carril)
+        self.longitud = tuple(longitud)
+        self.mascaras = tuple(mascaras)
+        self.tablas = tuple(tablas)
+
+        # Datos del coche rojo para la meta y las heurísticas
+        self.rojo = self.indice.get('A')
+
+        # Por offset del coche rojo: ¿ocupa la salida?, columna más a la derecha y
+        # casillas de la fila de salida a su derecha
+        self.meta = ()
+        self.salida = ()
+        if self.rojo is not None:
+            self.meta = tuple(bool(m & (1 << geo.casilla_meta)) for m in self.mascaras[self.rojo])
+            salida = []
+            for m in self.mascaras[self.rojo]:
+                max_col = max(idx % geo.columnas for idx in range(geo.casillas) if m >> idx & 1)
+                salida.append((max_col, mascara(((geo.fila_salida, c) for c in range(max_col + 1, geo.columnas)),
+                                                geo.columnas)))
+            self.salida = tuple(salida)
+
+        # Por vehículo vertical y offset: casillas que debería liberar para dejar la fila de salida
+        # (una entrada por sentido posible: subir justo por encima o bajar justo por debajo)
+        despeje = []
+        for i, masc in enumerate(self.mascaras):
+            opciones = []
+            for p, m in enumerate(masc):
+                if self.horizontal[i]:
+                    opciones.append(())
+                    continue
+                destinos = [q for q in (geo.fila_salida - self.longitud[i], geo.fila_salida + 1)
+                            if 0 <= q < len(masc)]
+                opciones.append(tuple(masc[q] & ~m for q in destinos))
+            despeje.append(tuple(opciones))
+        self.despeje = tuple(despeje)
+
+        # Base de patrones de la heurística 4 (se construye bajo demanda)
+        self.patrones = None
+
+    # QUE: Calcula la lista ordenada de desplazamientos desde el offset p en un sentido.
+    # POR QUE: Las casillas a liberar son acumulativas, lo que permite cortar al primer choque.
+    @staticmethod
+    def _desplazamientos(v, direccion, mascaras, p, destinos, carril_total):
+        movs = []
+        camino = 0
+        for pasos, q in enumerate(destinos, start=1):
+            camino |= mascaras[q] & ~mascaras[p]
+            # (acción, nuevo offset, casillas que deben estar libres, coste)
+            movs.append((f"{v}{direccion}{pasos}", bytes((q,)), camino, carril_total - pasos))
+        return tuple(movs)
+
+    # QUE: Convierte la cadena de un estado en su vector de offsets.
+    # POR QUE: Es la representación por nodo que usan la búsqueda y las tablas precompiladas.
+    def codificar(self, cadena):
+        offsets = [None] * len(self.vehiculos)
+        columnas = self.geometria.columnas
+        for idx, ch in enumerate(cadena):
+            if ch != 'o':
+                i = self.indice[ch]
+                if offsets[i] is None:
+                    # La primera casilla en orden de lectura marca el offset del vehículo
+                    offsets[i] = idx % columnas if self.horizontal[i] else idx // columnas
+        return bytes(offsets)
+
+    # QUE: Reconstruye la cadena de un estado a partir de su vector de offsets.
+    # POR QUE: Solo hace falta para imprimir (nodos, sucesores); la búsqueda no la usa.
+    def decodificar(self, offsets):
+        columnas = self.geometria.columnas
+        casillas = ['o'] * self.geometria.casillas
+        for i, p in enumerate(offsets):
+            v = self.vehiculos[i]
+            if self.horizontal[i]:
+                base = self.carril[i] * columnas + p
+                for k in range(self.longitud[i]):
+                    casillas[base + k] = v
+            else:
+                for k in range(self.longitud[i]):
+                    casillas[(p + k) * columnas + self.carril[i]] = v
+        return ''.join(casillas)
+
+    # QUE: Calcula la máscara de ocupación de un vector de offsets.
+    # POR QUE: Es la única información adicional que necesita la generación de sucesores.
+    def ocupacion(self, offsets):
+        ocupado = 0
+        for masc, p in zip(self.mascaras, offsets):
+            ocupado |= masc[p]
+        return ocupado
+
+    # QUE: Genera los sucesores (acción, offsets, coste) de un vector de offsets.
+    # POR QUE: Sustituye el recorrido del tablero por consultas a tablas y operaciones de bits,
+    #          respetando el orden de movimientos.successors (vehículo, '+' antes que '-', pasos).
+    def sucesores(self, offsets):
+        ocupado = self.ocupacion(offsets)
+        for i, p in enumerate(offsets):
+            prefijo = offsets[:i]
+            sufijo = offsets[i + 1:]
+            for movs in self.tablas[i][p]:
+                for accion, nuevo, camino, coste in movs:
+                    # Las casillas del camino son acumulativas: el primer choque corta la dirección
+                    if ocupado & camino:
+                        break
+                    yield accion, prefijo + nuevo + sufijo, coste
+
+    # QUE: Como sucesores(), añadiendo el índice del vehículo movido (acción, offsets, coste, vehículo).
+    # POR QUE: Con el vehículo movido la heurística del hijo se obtiene de la del padre
+    #          (ver heuristica_incremental) sin recorrer el tablero.
+    def movimientos(self, offsets):
+        ocupado = self.ocupacion(offsets)
+        for i, p in enumerate(offsets):
+            prefijo = offsets[:i]
+            sufijo = offsets[i + 1:]
+            for movs in self.tablas[i][p]:
+                for accion, nuevo, camino, coste in movs:
+                    if ocupado & camino:
+                        break
+                    yield accion, prefijo + nuevo + sufijo, coste, i
+
+    # QUE: Comprueba si el coche rojo ocupa la casilla de salida.
+    # POR QUE: Test de meta en O(1) a partir del offset del vehículo 'A'.
+    def es_meta(self, offsets):
+        return self.rojo is not None and self.meta[offsets[self.rojo]]
+
+    # QUE: Enumera todos los estados meta de esta disposición (coche rojo en la salida).
+    # POR QUE: Son el punto de partida de las búsquedas hacia atrás (BiBFS).
+    def estados_meta(self):
+        if self.rojo is None:
+            return
+
+        n = len(self.vehiculos)
+        offsets = [0] * n
+
+        # Se coloca primero el coche rojo para podar antes las colisiones con la salida
+        orden = [self.rojo] + [i for i in range(n) if i != self.rojo]
+
+        def colocar(k, ocupado):
+            if k == n:
+                yield bytes(offsets)
+                return
+            i = orden[k]
+            for p, m in enumerate(self.mascaras[i]):
+                if i == self.rojo and not self.meta[p]:
+                    continue
+                if not ocupado & m:
+                    offsets[i] = p
+                    yield from colocar(k + 1, ocupado | m)
+
+        yield from colocar(0, 0)
+
+    # QUE: Calcula la heurística (tipos 0 a 4) sobre un vector de offsets.
+    # POR QUE: Misma definición que Estado.heuristica sin recorrer la cadena.
+    def heuristica(self, offsets, tipo):
+        if tipo not in (0, 1, 2, 3, 4):
+            raise ValueError("Heurística inválida: debe ser 0, 1, 2, 3 o 4")
+
+        if self.rojo is None:
+            return 0
+
+        if tipo == 3:
+            return self._bloqueos_recursivos(offsets)
+
+        if tipo == 4:
+            if self.patrones is None:
+                from patrones import BasePatrones
+                self.patrones = BasePatrones(self, offsets)
+            return self.patrones.heuristica(offsets)
+
+        max_col, zona = self.salida[offsets[self.rojo]]
+        h0 = self.geometria.columna_salida - max_col
+        if tipo == 0:
+            return h0
+
+        # Vehículos distintos que ocupan la fila de salida a la derecha del coche rojo
+        h1 = 0
+        if zona:
+            h1 = sum(1 for masc, p in zip(self.mascaras, offsets) if masc[p] & zona)
+        return h1 if tipo == 1 else h0 + h1
+
+    # QUE: Heurística de un hijo a partir de la de su padre y del vehículo movido.
+    # POR QUE: Las heurísticas 0, 1 y 2 solo cambian si se mueve el coche rojo (se recalculan) o si
+    #          un vehículo entra o sale de la zona de la fila de salida a la derecha del coche rojo (±1),
+    #          así que el coste por hijo es O(1). Las heurísticas 3 y 4 se evalúan completas.
+    def heuristica_incremental(self, h, padre, hijo, i, tipo):
+        if tipo > 2 or i == self.rojo:
+            return self.heuristica(hijo, tipo)
+        if tipo == 0:
+            return h
+
+        zona = self.salida[padre[self.rojo]][1]
+        mascaras = self.mascaras[i]
+        return h + bool(mascaras[hijo[i]] & zona) - bool(mascaras[padre[i]] & zona)
+
+    # QUE: Cota inferior admisible del coste "bloqueadores de los bloqueadores" (heurística 3).
+    # POR QUE: Todo vehículo que obligatoriamente debe moverse aporta al menos el coste de su
+    #          movimiento más barato (N - (N - longitud) = longitud en un carril de N casillas). Deben
+    #          moverse el coche rojo, sus bloqueadores directos y los vehículos que impiden a un
+    #          bloqueador dejar la fila de salida cuando solo tiene un sentido posible. Si todos los sentidos de un bloqueador están
+    #          ocupados por vehículos no contados, al menos uno más debe moverse.
+    def _bloqueos_recursivos(self, offsets):
+        rojo = self.rojo
+        if self.meta[offsets[rojo]]:
+            return 0
+
+        _, zona = self.salida[offsets[rojo]]
+        actuales = [masc[p] for masc, p in zip(self.mascaras, offsets)]
+        longitud = self.longitud
+
+        contados = {rojo}
+        forzados = set()
+        alternativas = []
+        for j, m in enumerate(actuales):
+            if j == rojo or not m & zona:
+                continue
+            contados.add(j)
+
+            # Vehículos que ocupan las casillas a liberar en cada sentido de salida del bloqueador
+            conjuntos = [{k for k, mk in enumerate(actuales) if mk & necesarias}
+                         for necesarias in self.despeje[j][offsets[j]]]
+            if not conjuntos or not all(conjuntos):
+                continue
+            if len(conjuntos) == 1:
+                forzados |= conjuntos[0]
+            else:
+                alternativas.append(conjuntos)
+
+        contados |= forzados
+        h = sum(longitud[k] for k in contados)
+
+        # Como mucho un vehículo extra: varios bloqueadores podrían liberarse con el mismo
+        extra = 0
+        for conjuntos in alternativas:
+            restos = [c - contados for c in conjuntos]
+            if all(restos):
+                extra = max(extra, min(longitud[k] for c in restos for k in c))
+        return h + extra
@@ -0,0 +1,130 @@
+# cache.py
+import sqlite3
+import time
+from nodo import Nodo
+from estado import Estado
+from canonica import canonizar, invertir, traducir_acciones
+
+# Estrategias cuya solución es óptima y, por tanto, también lo es cualquier sufijo de ella.
+# A* e IDA* solo lo son con heurísticas admisibles (3 y 4).
+ESTRATEGIAS_OPTIMAS = {'BFS', 'UC', 'BiBFS'}
+ESTRATEGIAS_ADMISIBLES = {'AStar', 'IDAStar'}
+HEURISTICAS_ADMISIBLES = {3, 4}
+
+# QUE: Caché persistente de soluciones en SQLite con expulsión LRU.
+# POR QUE: Muchas consultas se repiten o son estados intermedios de soluciones ya calculadas;
+#          al guardar una solución óptima se indexa cada estado del camino con el sufijo restante.
+#          Las entradas van por estrategia y heurística, pero un acierto solo garantiza una solución
+#          óptima, no idéntica a la de la búsqueda: el sufijo de otra solución puede ser un camino
+#          distinto de la misma longitud (BFS, BiBFS) o del mismo coste (UC, AStar, IDAStar).
+class CacheSoluciones:
+
+    def __init__(self, ruta, capacidad=100000):
+        # Número máximo de estados indexados
+        self.capacidad = capacidad
+
+        # Contadores acumulados de aciertos y fallos de esta instancia
+        self.aciertos = 0
+        self.fallos = 0
+
+        self._conexion = sqlite3.connect(ruta, timeout=30)
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS soluciones ("
+            "clave TEXT PRIMARY KEY, acciones TEXT NOT NULL, uso INTEGER NOT NULL)"
+        )
+        self._conexion.execute("CREATE INDEX IF NOT EXISTS soluciones_uso ON soluciones (uso)")
+        self._conexion.commit()
+
+    # QUE: Indica si los resultados de una estrategia pueden guardarse y reutilizarse.
+    # POR QUE: Solo el sufijo de una solución óptima es a su vez óptimo.
+    @staticmethod
+    def admite(estrategia, heuristica):
+        if estrategia in ESTRATEGIAS_OPTIMAS:
+            return True
+        return estrategia in ESTRATEGIAS_ADMISIBLES and heuristica in HEURISTICAS_ADMISIBLES
+
+    @staticmethod
+    def _clave(cadena, estrategia, heuristica):
+        return f"{estrategia}|{heuristica}|{cadena}"
+
+    # QUE: Busca la solución (lista de acciones) de un estado; None si no está en la caché.
+    # POR QUE: Las entradas se guardan en forma canónica (canonica.canonizar), así que los puzzles
+    #          que solo difieren en las letras comparten entrada; las acciones se devuelven con las
+    #          letras originales. Un acierto renueva la marca de uso de la entrada (política LRU).
+    def consultar(self, cadena, estrategia, heuristica):
+        canonica, mapa = canonizar(cadena)
+        clave = self._clave(canonica, estrategia, heuristica)
+        fila = self._conexion.execute("SELECT acciones FROM soluciones WHERE clave = ?", (clave,)).fetchone()
+        if fila is None:
+            self.fallos += 1
+            return None
+
+        self.aciertos += 1
+        self._conexion.execute("UPDATE soluciones SET uso = ? WHERE clave = ?", (time.time_ns(), clave))
+        self._conexion.commit()
+        if not fila[0]:
+            return []
+        return traducir_acciones(fila[0].split(','), invertir(mapa))
+
+    # QUE: Guarda una solución indexando cada estado del camino con su sufijo de acciones.
+    # POR QUE: Una consulta posterior de cualquier estado intermedio se responde al instante.
+    def guardar(self, camino, estrategia, heuristica):
+        # El renombrado canónico es el mismo para todos los estados del camino
+        _, mapa = canonizar(camino[0].estado.cadena)
+        traduccion = str.maketrans(mapa)
+        acciones = traducir_acciones([nodo.accion for nodo in camino[1:]], mapa)
+        uso = time.time_ns()
+        filas = [
+            (self._clave(nodo.estado.cadena.translate(traduccion), estrategia, heuristica), ','.join(acciones[i:]), uso)
+            for i, nodo in enumerate(camino[:-1])
+        ]
+        self._conexion.executemany("INSERT OR REPLACE INTO soluciones VALUES (?, ?, ?)", filas)
+
+        # Expulsión LRU: se eliminan las entradas usadas hace más tiempo
+        (total,) = self._conexion.execute("SELECT COUNT(*) FROM soluciones").fetchone()
+        if total > self.capacidad:
+            self._conexion.execute(
+                "DELETE FROM soluciones WHERE clave IN "
+                "(SELECT clave FROM soluciones ORDER BY uso LIMIT ?)",
+                (total - self.capacidad,)
+            )
+        self._conexion.commit()
+
+    def cerrar(self):
+        self._conexion.close()
+
+# QUE: Reconstruye el camino de nodos a partir del estado inicial y una lista de acciones.
+# POR QUE: Un acierto de la caché debe devolverse en el mismo formato que una búsqueda. El camino
+#          es óptimo para la estrategia (misma longitud o mismo coste que el de la búsqueda) aunque
+#          puede no ser el mismo que esta habría encontrado.
+def reconstruir_camino(inicio, acciones, estrategia, heuristica):
+    informada = estrategia in ('GBF', 'AStar', 'IDAStar')
+    h = inicio.heuristica(heuristica) if informada else 0
+    actual = Nodo(inicio, heuristica=h, valor=h)
+    camino = [actual]
+
+    # Los nodos se numeran en el orden del camino (no hay más nodos que los suyos)
+    for ident, accion in enumerate(acciones, 1):
+        estado = actual.estado
+        for accion_hijo, hijo, coste in estado.sucesores():
+            if accion_hijo == accion:
+                break
+        else:
+            raise ValueError(f"Acción inválida en la caché: {accion}")
+
+        prof = actual.profundidad + 1
+        costo = actual.costo + coste
+        h = hijo.heuristica(heuristica) if informada else 0
+
+        # Mismo valor que asignaría la estrategia en la búsqueda
+        if estrategia in ('BFS', 'BiBFS'):
+            valor = prof
+        elif estrategia == 'UC':
+            valor = costo
+        else:
+            valor = costo + h
+
+        actual = Nodo(hijo, padre=actual, accion=accion, costo=costo, profundidad=prof, heuristica=h, valor=valor,
+                      id=ident)
+        camino.append(actual)
+    return camino
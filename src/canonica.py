@@ -0,0 +1,42 @@
+# canonica.py
+from movimientos import vehiculo
+from tablero import def_tablero
+
+# Letras disponibles para los vehículos distintos del coche rojo
+LETRAS = 'BCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+# QUE: Renombra los vehículos de una cadena en un orden canónico y devuelve el renombrado usado.
+# POR QUE: Dos tableros que solo difieren en las letras de los vehículos son el mismo puzzle.
+#          El orden es por carril (primero horizontales por fila, luego verticales por columna) y,
+#          dentro del carril, por posición. Como un vehículo nunca cambia de carril ni adelanta a
+#          otro del mismo carril, el renombrado es el mismo para todos los estados de un puzzle.
+#          El coche rojo 'A' y las casillas vacías 'o' no cambian.
+def canonizar(cadena):
+    posiciones = vehiculo(def_tablero(cadena))
+
+    def orden(v):
+        pos_list = posiciones[v]
+        rows = [r for r, _ in pos_list]
+        cols = [c for _, c in pos_list]
+        if len(set(rows)) == 1:
+            return (0, rows[0], min(cols))
+        return (1, cols[0], min(rows))
+
+    otros = sorted((v for v in posiciones if v != 'A'), key=orden)
+    if len(otros) > len(LETRAS):
+        raise ValueError("Demasiados vehículos para renombrarlos")
+
+    mapa = {v: LETRAS[i] for i, v in enumerate(otros)}
+    if 'A' in posiciones:
+        mapa['A'] = 'A'
+    return cadena.translate(str.maketrans(mapa)), mapa
+
+# QUE: Invierte un renombrado (canónico -> original).
+# POR QUE: Para devolver los resultados con las letras del tablero consultado.
+def invertir(mapa):
+    return {nueva: original for original, nueva in mapa.items()}
+
+# QUE: Traduce la letra del vehículo de cada acción ("K+2" -> "C+2") según un renombrado.
+# POR QUE: Las soluciones guardadas en forma canónica se devuelven con las letras originales.
+def traducir_acciones(acciones, mapa):
+    return [mapa[a[0]] + a[1:] for a in acciones]
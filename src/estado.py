@@ -1,39 +1,85 @@
 # estado.py
-from movimientos import successors, apply_moves
-from tablero import def_tablero
+from movimientos import successors, iter_successors, apply_moves
+from tablero import def_tablero, geometria
+from bitboard import Layout
 
-# QUE: Representa un estado del juego Rush Hour (cadena de 36 caracteres).
+# QUE: Representa un estado del juego Rush Hour (cadena de 36, 49 o 64 caracteres).
 # POR QUE: Encapsula la configuración del tablero para los algoritmos de búsqueda.
 class Estado:
-    
-    def __init__(self, cadena, tablero=None, posiciones=None):
+    # Sin __dict__: con layout cada nodo solo guarda el vector de offsets
+    __slots__ = ('_cadena', '_tablero', '_posiciones', 'layout', 'offsets')
+
+    def __init__(self, cadena, tablero=None, posiciones=None, layout=None):
         # Comprobación básica de validez del estado
-        # El tablero siempre debe ser una cadena de 36 caracteres (6x6)
-        if len(cadena) != 36:
-            raise ValueError("El estado debe tener 36 caracteres")
+        # La cadena debe corresponder a un tablero de 6x6, 7x7 u 8x8 (o al de la disposición)
+        if layout is None:
+            geometria(cadena)
+        elif len(cadena) != layout.geometria.casillas:
+            raise ValueError(f"El estado debe tener {layout.geometria.casillas} caracteres")
         
         # Almacena la representación compacta del tablero
-        self.cadena = cadena
+        self._cadena = cadena
         
         # Reutiliza tablero y posiciones si se pasan
         # Esto evita recalcularlos y mejora el rendimiento en la búsqueda
         if tablero is not None and posiciones is not None:
-            self.tablero = tablero
-            self.posiciones = posiciones
+            self._tablero = tablero
+            self._posiciones = posiciones
         else:
-            # Convierte la cadena plana en una matriz 6x6
-            self.tablero = def_tablero(cadena)
-            
-            # Diccionario: vehículo -> lista de posiciones (r, c)
+            # Se calculan bajo demanda (ver propiedades tablero y posiciones)
+            self._tablero = None
+            self._posiciones = None
+
+        # Disposición compartida opcional (bitboard.Layout) y vector de offsets de este estado
+        self.layout = layout
+        self.offsets = layout.codificar(cadena) if layout is not None else None
+
+    # QUE: Crea un estado directamente a partir de su vector de offsets.
+    # POR QUE: Evita construir y analizar la cadena en cada sucesor; se decodifica solo al imprimir.
+    @classmethod
+    def desde_offsets(cls, layout, offsets):
+        estado = cls.__new__(cls)
+        estado._cadena = None
+        estado._tablero = None
+        estado._posiciones = None
+        estado.layout = layout
+        estado.offsets = offsets
+        return estado
+
+    # Cadena del estado (se reconstruye desde los offsets si hace falta)
+    @property
+    def cadena(self):
+        if self._cadena is None:
+            self._cadena = self.layout.decodificar(self.offsets)
+        return self._cadena
+
+    # Matriz filas x columnas del tablero
+    @property
+    def tablero(self):
+        if self._tablero is None:
+            self._tablero = def_tablero(self.cadena)
+        return self._tablero
+
+    # Diccionario: vehículo -> lista de posiciones (r, c)
+    @property
+    def posiciones(self):
+        if self._posiciones is None:
             # Se ignoran las casillas vacías ('o')
-            self.posiciones = {ch: [] for ch in set(cadena) if ch != 'o'}
+            self._posiciones = {ch: [] for ch in set(self.cadena) if ch != 'o'}
             
             # Recorre el tablero para registrar las posiciones de cada vehículo
-            for r in range(6):
-                for c in range(6):
-                    ch = self.tablero[r][c]
+            tablero = self.tablero
+            for r in range(len(tablero)):
+                for c in range(len(tablero[0])):
+                    ch = tablero[r][c]
                     if ch != 'o':
-                        self.posiciones[ch].append((r, c))
+                        self._posiciones[ch].append((r, c))
+        return self._posiciones
+
+    # Clave compacta para conjuntos de visitados (offsets con layout, cadena sin él)
+    @property
+    def clave(self):
+        return self.offsets if self.layout is not None else self._cadena
 
     # --- Métodos de comportamiento ---
 
@@ -41,7 +87,16 @@ class Estado:
     # POR QUE: Es la operación fundamental para expandir nodos en la búsqueda.
     def successors(self):
         # Devuelve una lista de triples: (acción, nueva_cadena, coste)
-        return successors(self.cadena)
+        return successors(self.cadena, self.layout)
+
+    # QUE: Genera los sucesores como objetos Estado (acción, estado, coste).
+    # POR QUE: Con layout se evita pasar por cadenas; es lo que usa el bucle de búsqueda.
+    def sucesores(self):
+        if self.layout is None:
+            return [(accion, Estado(cadena), coste) for accion, cadena, coste in successors(self.cadena)]
+        layout = self.layout
+        return [(accion, Estado.desde_offsets(layout, offsets), coste)
+                for accion, offsets, coste in layout.sucesores(self.offsets)]
 
     # QUE: Aplica un único movimiento a un vehículo.
     # POR QUE: Permite generar nuevos estados de forma controlada.
@@ -53,13 +108,17 @@ class Estado:
         nueva_cadena = apply_moves(self.cadena, [move])
         
         # Devuelve un nuevo objeto Estado
-        return Estado(nueva_cadena)
+        return Estado(nueva_cadena, layout=self.layout)
 
     # QUE: Comprueba si el estado es objetivo.
     # POR QUE: El problema termina cuando el vehículo A alcanza la salida.
     def es_meta(self):
-        # El coche rojo 'A' debe ocupar la posición (fila 2, columna 5)
-        return any(r == 2 and c == 5 for r, c in self.posiciones.get('A', []))
+        if self.layout is not None:
+            return self.layout.es_meta(self.offsets)
+
+        # El coche rojo 'A' debe ocupar la casilla de salida (fila 2, columna 5 en 6x6)
+        geo = geometria(self.cadena)
+        return any(r == geo.fila_salida and c == geo.columna_salida for r, c in self.posiciones.get('A', []))
 
     # QUE: Calcula el valor heurístico del estado.
     # POR QUE: Guía la búsqueda informada (GBF y A*) hacia la solución.
@@ -71,29 +130,44 @@ class Estado:
             tipo: 0 → distancia del coche rojo a la salida
                   1 → número de vehículos bloqueando la fila de salida
                   2 → suma de ambas (más informada)
+                  3 → bloqueadores y bloqueadores de bloqueadores (admisible)
+                  4 → base de datos de patrones del coche rojo y su fila (admisible)
         
         Returns:
             Valor heurístico (cuanto menor, mejor)
         """
+        if self.layout is not None:
+            return self.layout.heuristica(self.offsets, tipo)
+
+        # Las heurísticas 3 y 4 necesitan la disposición compilada
+        if tipo in (3, 4):
+            layout = Layout(self.cadena)
+            return layout.heuristica(layout.codificar(self.cadena), tipo)
+
         # Buscamos todas las posiciones del coche rojo 'A' en la cadena plana
-        a_positions = [i for i in range(36) if self.cadena[i] == 'A']
+        geo = geometria(self.cadena)
+        columnas = geo.columnas
+        a_positions = [i for i in range(geo.casillas) if self.cadena[i] == 'A']
         
         # Si no existe el coche rojo heurística nula
         if not a_positions:
             return 0
         
         # Columna más a la derecha del coche rojo 
-        max_col = max(i % 6 for i in a_positions)
+        max_col = max(i % columnas for i in a_positions)
+
+        # Índice de la primera casilla de la fila de salida (12 en 6x6: índices 12..17)
+        inicio_fila = geo.fila_salida * columnas
         
         if tipo == 0:
             # Número de casillas que le faltan al coche rojo para salir
-            return 5 - max_col
+            return geo.columna_salida - max_col
         
         elif tipo == 1:
-            # Cuenta vehículos distintos bloqueando la salida en la fila 2
+            # Cuenta vehículos distintos bloqueando la salida en la fila de salida
             blocking = set()
-            for col in range(max_col + 1, 6):
-                idx = 12 + col  # Fila 2 corresponde a índices 12..17
+            for col in range(max_col + 1, columnas):
+                idx = inicio_fila + col
                 ch = self.cadena[idx]
                 if ch != 'o':
                     blocking.add(ch)
@@ -101,16 +175,16 @@ class Estado:
         
         elif tipo == 2:
             # Heurística combinada: distancia + bloqueos
-            h0 = 5 - max_col
+            h0 = geo.columna_salida - max_col
             h1 = len({
-                self.cadena[12 + col]
-                for col in range(max_col + 1, 6)
-                if self.cadena[12 + col] != 'o'
+                self.cadena[inicio_fila + col]
+                for col in range(max_col + 1, columnas)
+                if self.cadena[inicio_fila + col] != 'o'
             })
             return h0 + h1
         
         else:
-            raise ValueError("Heurística inválida: debe ser 0, 1 o 2")
+            raise ValueError("Heurística inválida: debe ser 0, 1, 2, 3 o 4")
 
     # --- Representación y Hashing ---
 
@@ -120,8 +194,34 @@ class Estado:
 
     # Dos estados son iguales si su cadena es idéntica
     def __eq__(self, other):
-        return isinstance(other, Estado) and self.cadena == other.cadena
+        if not isinstance(other, Estado):
+            return False
+        if self.layout is not None and self.layout is other.layout:
+            return self.offsets == other.offsets
+        return self.cadena == other.cadena
 
     # Permite usar Estado en conjuntos y diccionarios
     def __hash__(self):
         return hash(self.cadena)
+
+# QUE: Disposición sobre cadenas con la misma interfaz que bitboard.Layout.
+# POR QUE: Si el tablero no puede compilarse, el bucle de búsqueda trabaja igualmente sobre
+#          cadenas con las funciones originales.
+class DisposicionCadena:
+    def sucesores(self, cadena):
+        return iter_successors(cadena)
+
+    # Sin tablas de movimiento no se conoce el vehículo movido
+    def movimientos(self, cadena):
+        for accion, hijo, coste in iter_successors(cadena):
+            yield accion, hijo, coste, None
+
+    def es_meta(self, cadena):
+        return Estado(cadena).es_meta()
+
+    def heuristica(self, cadena, tipo):
+        return Estado(cadena).heuristica(tipo)
+
+    # Sin disposición compilada la heurística del hijo se calcula completa
+    def heuristica_incremental(self, h, padre, hijo, i, tipo):
+        return Estado(hijo).heuristica(tipo)
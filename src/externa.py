@@ -0,0 +1,207 @@
+# externa.py
+import heapq
+import mmap
+import os
+import tempfile
+import time
+from nodo import Nodo
+from solver import Estadisticas, camino_por_estados
+
+# Registros (hijo, padre) que se ordenan en memoria antes de volcarse a un tramo en disco
+TRAMO = 1 << 18
+
+# Registros que se leen de una vez al recorrer un fichero
+LECTURA = 1 << 12
+
+# Tramos que se mezclan a la vez como máximo (cada uno es un fichero abierto)
+FUSION = 64
+
+# QUE: Recorre un fichero de registros de ancho fijo.
+# POR QUE: Lectura por bloques: la memoria no depende del tamaño del fichero.
+def _leer(ruta, registro):
+    with open(ruta, 'rb') as f:
+        while True:
+            datos = f.read(registro * LECTURA)
+            if not datos:
+                return
+            for p in range(0, len(datos), registro):
+                yield datos[p:p + registro]
+
+# QUE: Ordena un tramo de registros y lo escribe en un fichero.
+def _volcar_tramo(registros, ruta):
+    registros.sort()
+    with open(ruta, 'wb') as f:
+        f.write(b''.join(registros))
+
+# QUE: Reduce los tramos a FUSION como mucho mezclándolos por grupos en tramos más largos.
+# POR QUE: Una sola mezcla de todos los tramos abriría un fichero por tramo y un espacio de estados
+#          grande agotaría los descriptores de fichero. Cada pasada mezcla grupos de FUSION tramos
+#          (conservando los repetidos, que se eliminan en la mezcla final) y borra los de partida.
+def _reducir_tramos(tramos, registro, temporal):
+    pasada = 0
+    while len(tramos) > FUSION:
+        pasada += 1
+        reducidos = []
+        for k in range(0, len(tramos), FUSION):
+            grupo = tramos[k:k + FUSION]
+            ruta = os.path.join(temporal, f'mezcla{pasada}-{len(reducidos)}')
+            with open(ruta, 'wb') as f:
+                escritos = []
+                for datos in heapq.merge(*(_leer(t, registro) for t in grupo)):
+                    escritos.append(datos)
+                    if len(escritos) >= LECTURA:
+                        f.write(b''.join(escritos))
+                        escritos = []
+                f.write(b''.join(escritos))
+            for tramo in grupo:
+                os.remove(tramo)
+            reducidos.append(ruta)
+        tramos = reducidos
+    return tramos
+
+# QUE: Comprueba si un estado está en una capa, avanzando un recorrido ordenado de ella.
+# POR QUE: Los hijos llegan ordenados, así que cada capa anterior se recorre una sola vez (mezcla).
+class _Capa:
+    def __init__(self, ruta, registro, ancho):
+        self._registros = _leer(ruta, registro) if ruta is not None else iter(())
+        self._ancho = ancho
+        self._actual = next(self._registros, None)
+
+    def contiene(self, estado):
+        ancho = self._ancho
+        while self._actual is not None and self._actual[:ancho] < estado:
+            self._actual = next(self._registros, None)
+        return self._actual is not None and self._actual[:ancho] == estado
+
+# QUE: Busca el predecesor de un estado en el fichero (ordenado) de su capa y la posición del estado en él.
+# POR QUE: Búsqueda binaria sobre el fichero mapeado en memoria, como en basedatos.BaseDistancias.
+def _padre(ruta, estado, ancho):
+    registro = 2 * ancho
+    with open(ruta, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+        lo, hi = 0, len(datos) // registro
+        while lo < hi:
+            mid = (lo + hi) // 2
+            clave = datos[mid * registro:mid * registro + ancho]
+            if clave < estado:
+                lo = mid + 1
+            elif clave > estado:
+                hi = mid
+            else:
+                return datos[mid * registro + ancho:(mid + 1) * registro], mid
+    raise KeyError("Estado ausente de su capa")
+
+# QUE: BFS en memoria externa (estrategia EBFS).
+# POR QUE: Cada capa se guarda en disco como registros binarios (estado, predecesor) ordenados por
+#          estado. Los hijos de la capa d se vuelcan en tramos ordenados de TRAMO registros; una
+#          mezcla en streaming de los tramos (en varias pasadas si hay más de FUSION) elimina los
+#          repetidos y, como los movimientos son reversibles, basta con descartar además los estados
+#          de las capas d y d - 1 (detección de duplicados diferida). El resultado es la capa d + 1. La memoria es la de un tramo,
+#          cualquiera que sea el tamaño del espacio de estados. La meta se comprueba al escribir cada
+#          capa y el camino se reconstruye con búsquedas binarias en los ficheros de las capas. El id
+#          de cada nodo es su posición en la numeración de todas las capas, una tras otra. Los
+#          límites se comprueban en cada expansión; al superarlos se borran los ficheros de las capas.
+def buscar_externa(inicio, directorio=None, limites=None):
+    layout = inicio.layout
+    if layout is None:
+        raise ValueError("EBFS requiere un tablero válido para el motor de offsets")
+
+    stats = Estadisticas()
+    stats.duplicados = 0
+    t0 = time.perf_counter_ns()
+    stats.generar()
+
+    raiz = inicio.offsets
+    if layout.es_meta(raiz):
+        stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+        return [Nodo(inicio)], stats
+
+    ancho = len(raiz)
+    registro = 2 * ancho
+
+    with tempfile.TemporaryDirectory(prefix='ebfs-', dir=directorio) as temporal:
+        capas = [os.path.join(temporal, 'capa0')]
+        with open(capas[0], 'wb') as f:
+            f.write(raiz + raiz)
+
+        # Estados de cada capa (para numerar los nodos)
+        tamanos = [1]
+
+        meta = None
+        while meta is None:
+            d = len(capas) - 1
+
+            # 1. Expansión de la capa d en tramos ordenados de hijos (hijo, padre)
+            tramos = []
+            pendientes = []
+            for datos in _leer(capas[d], registro):
+                estado = datos[:ancho]
+                stats.expandir()
+                if limites is not None:
+                    limites.comprobar(stats)
+                for _, hijo, _ in layout.sucesores(estado):
+                    stats.generar()
+                    pendientes.append(hijo + estado)
+                    if len(pendientes) >= TRAMO:
+                        tramos.append(os.path.join(temporal, f'tramo{len(tramos)}'))
+                        _volcar_tramo(pendientes, tramos[-1])
+                        pendientes = []
+            if pendientes:
+                tramos.append(os.path.join(temporal, f'tramo{len(tramos)}'))
+                _volcar_tramo(pendientes, tramos[-1])
+                pendientes = []
+
+            # 2. Mezcla de los tramos (como mucho FUSION a la vez) sin repetidos ni estados de las
+            #    capas d y d - 1
+            tramos = _reducir_tramos(tramos, registro, temporal)
+            actual = _Capa(capas[d], registro, ancho)
+            anterior = _Capa(capas[d - 1] if d > 0 else None, registro, ancho)
+            siguiente = os.path.join(temporal, f'capa{d + 1}')
+            nuevos = 0
+            ultimo = None
+            with open(siguiente, 'wb') as f:
+                escritos = []
+                for datos in heapq.merge(*(_leer(t, registro) for t in tramos)):
+                    hijo = datos[:ancho]
+                    if hijo == ultimo or actual.contiene(hijo) or anterior.contiene(hijo):
+                        stats.descartar_duplicado()
+                        continue
+                    ultimo = hijo
+                    escritos.append(datos)
+                    nuevos += 1
+                    if len(escritos) >= LECTURA:
+                        f.write(b''.join(escritos))
+                        escritos = []
+                    if layout.es_meta(hijo):
+                        meta = datos
+                        break
+                f.write(b''.join(escritos))
+            for tramo in tramos:
+                os.remove(tramo)
+
+            # Sin estados nuevos no hay solución
+            if not nuevos:
+                break
+            capas.append(siguiente)
+            tamanos.append(nuevos)
+            stats.df = d + 1
+
+        camino = None
+        if meta is not None:
+            # 3. Reconstrucción: predecesor de cada estado en el fichero de la capa anterior. La meta
+            #    es el último estado escrito en la suya
+            inicio_capa = [sum(tamanos[:d]) for d in range(len(tamanos))]
+            estados = [meta[:ancho]]
+            ids = [inicio_capa[-1] + tamanos[-1] - 1]
+            padre = meta[ancho:]
+            for d in range(len(capas) - 2, 0, -1):
+                estados.append(padre)
+                padre, posicion = _padre(capas[d], padre, ancho)
+                ids.append(inicio_capa[d] + posicion)
+            estados.append(padre)
+            ids.append(0)
+            estados.reverse()
+            ids.reverse()
+            camino = camino_por_estados(layout, estados, ids)
+
+    stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+    return camino, stats
@@ -1,21 +1,23 @@
-# frontera.py 
+# frontera.py
 import heapq
+from collections import deque
 
 # QUE: Estructura de datos que gestiona los nodos a expandir (cola de prioridad unificada).
-# POR QUE: Implementa la lógica de orden por valor e ID para todas las estrategias.
+# POR QUE: Implementa la lógica de orden por valor e ID para todas las estrategias. Los nodos se
+#          identifican por su ID en el almacén de la búsqueda (nodo.AlmacenNodos).
 class Frontera:
     def __init__(self, estrategia="BFS"):
         # Lista que actúa como heap de prioridad
         self.items = []
-        
-        # Estrategia usada (informativa, el orden real depende de nodo.valor)
+
+        # Estrategia usada (informativa, el orden real depende del valor de cada nodo)
         self.estrategia = estrategia
 
     # QUE: Añade un nodo a la frontera con inserción ordenada.
     # POR QUE: Mantiene el orden por valor (primero) e ID (desempate) sin reordenar todo.
-    def insertar(self, nodo):
+    def insertar(self, ident, valor):
         # heapq mantiene siempre el elemento mínimo en la raíz
-        heapq.heappush(self.items, (nodo.valor, nodo.id, nodo))
+        heapq.heappush(self.items, (valor, ident))
 
     # QUE: Obtiene y elimina el siguiente nodo a expandir (menor valor, menor ID).
     # POR QUE: Es la operación central del bucle de búsqueda.
@@ -23,11 +25,169 @@ class Frontera:
         # Si la frontera está vacía no se puede extraer ningún nodo
         if not self.items:
             return None
-        
-        # Devuelve solo el nodo, ignorando valor e id
-        return heapq.heappop(self.items)[2]
+
+        # Devuelve solo el ID del nodo, ignorando el valor
+        return heapq.heappop(self.items)[1]
 
     # QUE: Verifica si no quedan nodos pendientes de expansión.
     # POR QUE: Condición de terminación cuando no se encuentra solución.
     def vacia(self):
         return len(self.items) == 0
+
+    # Número de nodos pendientes en la frontera
+    def __len__(self):
+        return len(self.items)
+
+# QUE: Frontera FIFO para BFS.
+# POR QUE: En BFS los nodos se insertan en orden de profundidad e ID crecientes, así que una
+#          cola simple extrae exactamente el mismo orden que el heap por (profundidad, ID).
+class FronteraFIFO(Frontera):
+    def __init__(self, estrategia="BFS"):
+        super().__init__(estrategia)
+        self.items = deque()
+
+    def insertar(self, ident, valor):
+        self.items.append(ident)
+
+    def extraer(self):
+        if not self.items:
+            return None
+        return self.items.popleft()
+
+# QUE: Frontera LIFO para DFS.
+# POR QUE: El heap por (-profundidad, ID) extrae el primer hijo del último nodo expandido. Los
+#          hijos de una expansión se acumulan y se apilan en orden inverso al extraer, de modo que
+#          una pila simple reproduce el mismo orden.
+class FronteraLIFO(Frontera):
+    def __init__(self, estrategia="DFS"):
+        super().__init__(estrategia)
+        self.pendientes = []
+
+    def insertar(self, ident, valor):
+        self.pendientes.append(ident)
+
+    def extraer(self):
+        if self.pendientes:
+            self.pendientes.reverse()
+            self.items.extend(self.pendientes)
+            self.pendientes.clear()
+        if not self.items:
+            return None
+        return self.items.pop()
+
+    def vacia(self):
+        return not self.items and not self.pendientes
+
+    def __len__(self):
+        return len(self.items) + len(self.pendientes)
+
+# QUE: Cola de cubetas (bucket queue) indexada por el valor entero del nodo.
+# POR QUE: En UC, GBF y A* las prioridades son enteros pequeños no negativos: insertar y extraer
+#          son O(1) amortizado. Dentro de cada cubeta el orden FIFO coincide con el orden por ID.
+class FronteraCubetas(Frontera):
+    def __init__(self, estrategia="UC"):
+        super().__init__(estrategia)
+
+        # Cubeta i: IDs de los nodos con valor i en orden de inserción
+        self.cubetas = []
+
+        # Menor valor que puede tener una cubeta no vacía
+        self.minimo = 0
+
+        # Número total de nodos en las cubetas
+        self.total = 0
+
+        # Se pasa al heap general si aparece una prioridad que no cabe en una cubeta
+        self.en_heap = False
+
+    def insertar(self, ident, valor):
+        # Valores no enteros o negativos: se pasa al heap general conservando el orden
+        if self.en_heap or valor.__class__ is not int or valor < 0:
+            self._a_heap()
+            heapq.heappush(self.items, (valor, ident))
+            return
+        while len(self.cubetas) <= valor:
+            self.cubetas.append(deque())
+        self.cubetas[valor].append(ident)
+        if valor < self.minimo:
+            self.minimo = valor
+        self.total += 1
+
+    def extraer(self):
+        if self.en_heap:
+            return super().extraer()
+        if not self.total:
+            return None
+        cubetas = self.cubetas
+        while not cubetas[self.minimo]:
+            self.minimo += 1
+        self.total -= 1
+        return cubetas[self.minimo].popleft()
+
+    # QUE: Vuelca todas las cubetas en el heap general.
+    # POR QUE: Alternativa segura si aparece una prioridad que no cabe en una cubeta.
+    def _a_heap(self):
+        self.en_heap = True
+        if not self.total:
+            return
+        for valor, cubeta in enumerate(self.cubetas):
+            for ident in cubeta:
+                heapq.heappush(self.items, (valor, ident))
+            cubeta.clear()
+        self.total = 0
+
+    def vacia(self):
+        return not self.total and not self.items
+
+    def __len__(self):
+        return self.total + len(self.items)
+
+# QUE: Frontera por capas para la búsqueda en haz (Beam).
+# POR QUE: Los hijos de la capa en curso se acumulan en la siguiente; al agotarse la capa en curso
+#          solo pasan a expandirse los 'anchura' mejores por valor (la heurística), con el ID como
+#          desempate. El resto se descarta y se cuenta en 'descartados'.
+class FronteraHaz(Frontera):
+    def __init__(self, anchura, estrategia="Beam"):
+        super().__init__(estrategia)
+        self.items = deque()
+        self.anchura = anchura
+        self.siguiente = []
+        self.descartados = 0
+
+    def insertar(self, ident, valor):
+        self.siguiente.append((valor, ident))
+
+    def extraer(self):
+        if not self.items:
+            if not self.siguiente:
+                return None
+            capa = self.siguiente
+            if len(capa) > self.anchura:
+                self.descartados += len(capa) - self.anchura
+                capa = heapq.nsmallest(self.anchura, capa)
+            else:
+                capa.sort()
+            self.items.extend(ident for _, ident in capa)
+            self.siguiente = []
+        return self.items.popleft()
+
+    def vacia(self):
+        return not self.items and not self.siguiente
+
+    def __len__(self):
+        return len(self.items) + len(self.siguiente)
+
+# QUE: Crea la frontera especializada para cada estrategia.
+# POR QUE: BFS y DFS no necesitan prioridades y UC, GBF, A* y A* ponderado usan prioridades enteras
+#          pequeñas; el orden de expansión (y por tanto la salida) es idéntico al del heap general.
+#          Beam necesita la anchura del haz.
+def nueva_frontera(estrategia, anchura=None):
+    if estrategia == "BFS":
+        return FronteraFIFO(estrategia)
+    if estrategia == "DFS":
+        return FronteraLIFO(estrategia)
+    if estrategia in ("UC", "GBF", "AStar", "WAStar"):
+        return FronteraCubetas(estrategia)
+    if estrategia == "Beam":
+        return FronteraHaz(anchura, estrategia)
+    return Frontera(estrategia)
@@ -0,0 +1,182 @@
+# generador.py
+import json
+import multiprocessing
+import os
+import random
+from bitboard import Layout
+from canonica import canonizar, LETRAS
+from tablero import geometria
+
+# Disposiciones que se envían juntas a cada proceso del pool
+BLOQUE = 16
+
+# Cada cuántas disposiciones se guarda el progreso (y se vacía el fichero de salida)
+GUARDADO = 64
+
+# Intentos de colocar un vehículo antes de dar la disposición por completa
+INTENTOS = 200
+
+# QUE: Construye la disposición número k: un tablero inicial con el coche rojo y n vehículos más.
+# POR QUE: Las disposiciones no se enumeran sistemáticamente sino que se muestrean: cada número
+#          identifica siempre el mismo tablero pseudoaleatorio (generador sembrado con la semilla y
+#          k), así que la muestra es reproducible, se puede repartir entre procesos y reanudar por
+#          donde se quedó. Da igual dónde se coloque cada vehículo dentro de su carril: la
+#          exploración recorre después todos los estados de la disposición (búsqueda exhaustiva).
+def disposicion(k, lado=6, min_vehiculos=8, max_vehiculos=13, semilla=0):
+    rnd = random.Random(f"{semilla}:{k}")
+    geo = geometria('o' * lado * lado)
+    columnas = geo.columnas
+    casillas = ['o'] * geo.casillas
+
+    # Coche rojo (longitud 2) en la fila de salida
+    c = rnd.randrange(columnas - 2)
+    casillas[geo.fila_salida * columnas + c] = casillas[geo.fila_salida * columnas + c + 1] = 'A'
+
+    n = rnd.randint(min_vehiculos, max_vehiculos)
+    letras = iter(LETRAS[:n])
+    letra = next(letras, None)
+    for _ in range(INTENTOS):
+        if letra is None:
+            break
+        # Un tercio de los vehículos son camiones (longitud 3)
+        largo = 3 if rnd.random() < 1 / 3 else 2
+        if rnd.random() < 0.5:
+            r = rnd.randrange(geo.filas)
+            c = rnd.randrange(columnas - largo + 1)
+            celdas = [r * columnas + c + i for i in range(largo)]
+        else:
+            r = rnd.randrange(geo.filas - largo + 1)
+            c = rnd.randrange(columnas)
+            celdas = [(r + i) * columnas + c for i in range(largo)]
+        if all(casillas[idx] == 'o' for idx in celdas):
+            for idx in celdas:
+                casillas[idx] = letra
+            letra = next(letras, None)
+    return ''.join(casillas)
+
+# QUE: Explora los componentes conexos resolubles de una disposición y su estado más lejano a la meta.
+# POR QUE: Una BFS hacia atrás desde todas las metas (como basedatos.bfs_retrogrado) da la distancia
+#          de cada estado resoluble a la meta más cercana; después se etiquetan los componentes
+#          recorriendo esos estados (los movimientos son reversibles, así que un componente con una
+#          meta es resoluble entero). Por componente se devuelve (estado más lejano, distancia,
+#          número de estados); a igual distancia gana el menor vector de offsets (determinista).
+#          Devuelve None si los estados resolubles superan max_estados.
+def componentes(layout, max_estados=None):
+    distancias = {}
+    capa = []
+    for meta in layout.estados_meta():
+        distancias[meta] = 0
+        capa.append(meta)
+
+    d = 0
+    while capa:
+        d += 1
+        nueva_capa = []
+        for estado in capa:
+            for _, hijo, _ in layout.sucesores(estado):
+                if hijo not in distancias:
+                    distancias[hijo] = d
+                    nueva_capa.append(hijo)
+        if max_estados is not None and len(distancias) > max_estados:
+            return None
+        capa = nueva_capa
+
+    resultado = []
+    etiquetados = set()
+    for origen in distancias:
+        if origen in etiquetados:
+            continue
+        etiquetados.add(origen)
+        pila = [origen]
+        tamano = 0
+        lejano, maxima = origen, distancias[origen]
+        while pila:
+            estado = pila.pop()
+            tamano += 1
+            d = distancias[estado]
+            if d > maxima or (d == maxima and estado < lejano):
+                lejano, maxima = estado, d
+            for _, hijo, _ in layout.sucesores(estado):
+                if hijo not in etiquetados:
+                    etiquetados.add(hijo)
+                    pila.append(hijo)
+        resultado.append((lejano, maxima, tamano))
+    return resultado
+
+# QUE: Genera los puzzles de una disposición (uno por componente con al menos min_movimientos).
+# POR QUE: Función de nivel de módulo para poder enviarse a los procesos del pool. Devuelve
+#          (k, puzzles, completa); completa es False si la disposición superó max_estados.
+def explorar(tarea):
+    k, opciones = tarea
+    cadena = disposicion(k, opciones['size'], opciones['min_vehicles'], opciones['max_vehicles'],
+                         opciones['seed'])
+    layout = Layout(cadena)
+    encontrados = componentes(layout, opciones['max_states'])
+    if encontrados is None:
+        return k, [], False
+
+    puzzles = []
+    for estado, movimientos, tamano in encontrados:
+        if movimientos >= opciones['min_moves']:
+            # Letras canónicas: el mismo puzzle sale siempre igual sea cual sea la disposición
+            puzzles.append({'s': canonizar(layout.decodificar(estado))[0], 'moves': movimientos,
+                            'states': tamano, 'layout': k})
+    puzzles.sort(key=lambda p: -p['moves'])
+    return k, puzzles, True
+
+# QUE: Lee el progreso guardado de una generación anterior sobre el mismo fichero.
+# POR QUE: Para reanudar; las opciones deben coincidir o la numeración de disposiciones no sería la misma.
+def _leer_progreso(ruta, opciones):
+    if not os.path.exists(ruta):
+        return 0
+    with open(ruta, encoding='utf-8') as f:
+        progreso = json.load(f)
+    if progreso['options'] != opciones:
+        raise ValueError(f"{ruta} corresponde a una generación con otras opciones")
+    return progreso['next']
+
+# QUE: Guarda el progreso (siguiente disposición pendiente) de forma atómica.
+def _guardar_progreso(ruta, siguiente, opciones):
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump({'next': siguiente, 'options': opciones}, f)
+    os.replace(temporal, ruta)
+
+# QUE: Recorre las disposiciones muestreadas 0..total-1 en paralelo y añade sus puzzles al fichero de salida.
+# POR QUE: Acción 'generate'. Los puzzles se escriben como líneas JSON (compatibles con batch) y el
+#          progreso se guarda en ruta + '.progreso' cada GUARDADO disposiciones, así que una
+#          ejecución interrumpida se reanuda repitiendo la misma orden. Los puzzles ya escritos no
+#          se repiten aunque se vuelva a procesar la última tanda. Solo se exploran las disposiciones
+#          de la muestra: los puzzles más difíciles que se encuentran no tienen por qué ser los más
+#          difíciles que existen. Devuelve un resumen de la ejecución.
+def generar(ruta, total, opciones, procesos=None):
+    ruta_progreso = ruta + '.progreso'
+    inicio = _leer_progreso(ruta_progreso, opciones)
+
+    # Puzzles ya escritos (al reanudar)
+    escritos = set()
+    if inicio and os.path.exists(ruta):
+        with open(ruta, encoding='utf-8') as f:
+            escritos = {json.loads(linea)['s'] for linea in f if linea.strip()}
+
+    resumen = {'layouts': 0, 'puzzles': 0, 'skipped': 0, 'max_moves': 0}
+    tareas = ((k, opciones) for k in range(inicio, total))
+    with open(ruta, 'a' if inicio else 'w', encoding='utf-8') as salida, \
+            multiprocessing.get_context().Pool(procesos or os.cpu_count()) as pool:
+        # imap conserva el orden: el progreso es siempre un prefijo de disposiciones terminadas
+        for k, puzzles, completa in pool.imap(explorar, tareas, chunksize=BLOQUE):
+            resumen['layouts'] += 1
+            resumen['skipped'] += not completa
+            for puzzle in puzzles:
+                if puzzle['s'] in escritos:
+                    continue
+                escritos.add(puzzle['s'])
+                salida.write(json.dumps(puzzle) + '\n')
+                resumen['puzzles'] += 1
+                resumen['max_moves'] = max(resumen['max_moves'], puzzle['moves'])
+            if (k + 1) % GUARDADO == 0:
+                salida.flush()
+                _guardar_progreso(ruta_progreso, k + 1, opciones)
+        salida.flush()
+    _guardar_progreso(ruta_progreso, max(inicio, total), opciones)
+    return resumen
@@ -1,6 +1,7 @@
 # graphic.py
 import pygame
 import time
+from tablero import geometria
 
 # QUE: Muestra una animación gráfica automática de la solución completa usando Pygame.
 # POR QUE: Proporciona una visualización atractiva e interactiva de cómo se resuelve el puzzle paso a paso        
@@ -21,10 +22,15 @@ def visualizar_grafico(camino):
     pygame.init()
     print("Pygame inicializado.")
 
+    # Dimensiones del tablero (6x6, 7x7 u 8x8) y posición de la salida
+    inicio = camino[0].estado
+    geo = inicio.layout.geometria if inicio.layout is not None else geometria(inicio.cadena)
+
     # Configuración de la ventana
-    CELL_SIZE = 100                  # Tamaño de cada casilla en píxeles
+    CELL_SIZE = 600 // geo.columnas  # Tamaño de cada casilla en píxeles (100 en 6x6)
     MARGIN = 50                      # Margen alrededor del tablero
-    WIDTH = HEIGHT = 6 * CELL_SIZE + 2 * MARGIN  # Dimensiones totales de la ventana
+    WIDTH = geo.columnas * CELL_SIZE + 2 * MARGIN  # Dimensiones totales de la ventana
+    HEIGHT = geo.filas * CELL_SIZE + 2 * MARGIN
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Rush Hour - Animación de Solución")
     clock = pygame.time.Clock()      # Control de frames por segundo
@@ -65,23 +71,25 @@ def visualizar_grafico(camino):
         screen.fill((30, 30, 60))  # Color azul oscuro elegante
 
         # Dibujar la cuadrícula del tablero
-        for i in range(7):
+        for i in range(geo.columnas + 1):
             pygame.draw.line(screen, (120, 120, 140),
                              (MARGIN + i * CELL_SIZE, MARGIN),
                              (MARGIN + i * CELL_SIZE, HEIGHT - MARGIN), 4)
+        for i in range(geo.filas + 1):
             pygame.draw.line(screen, (120, 120, 140),
                              (MARGIN, MARGIN + i * CELL_SIZE),
                              (WIDTH - MARGIN, MARGIN + i * CELL_SIZE), 4)
 
-        # Marcar la salida (casilla fila 2, columna 5) con un rectángulo rojo sólido
+        # Marcar la salida (casilla fila 2, columna 5 en 6x6) con un rectángulo rojo sólido
         pygame.draw.rect(screen, (255, 50, 50),
-                         (MARGIN + 5 * CELL_SIZE, MARGIN + 2 * CELL_SIZE, CELL_SIZE, CELL_SIZE), 0)
+                         (MARGIN + geo.columna_salida * CELL_SIZE, MARGIN + geo.fila_salida * CELL_SIZE,
+                          CELL_SIZE, CELL_SIZE), 0)
 
         # Dibujar todos los vehículos del estado actual
         color_idx = 0
-        for r in range(6):
-            for c in range(6):
-                ch = cadena[r * 6 + c]
+        for r in range(geo.filas):
+            for c in range(geo.columnas):
+                ch = cadena[r * geo.columnas + c]
                 if ch == 'o':  # Casilla vacía
                     continue
 
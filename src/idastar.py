@@ -0,0 +1,122 @@
+# idastar.py
+import time
+from itertools import count
+from nodo import Nodo
+from estado import Estado
+from solver import Estadisticas
+
+# QUE: Búsqueda IDA* (profundización iterativa sobre f = g + h con una cota de coste).
+# POR QUE: A* guarda todos los nodos generados; IDA* solo mantiene en memoria el camino actual
+#          (más una tabla de transposición opcional de tamaño acotado) a cambio de repetir trabajo
+#          en cada iteración.
+def buscar_idastar(inicio, heuristic_type, tamano_tabla=0, limites=None):
+    layout = inicio.layout
+    if layout is None:
+        raise ValueError("IDAStar requiere un tablero válido para el motor de offsets")
+
+    stats = Estadisticas()
+    stats.iteraciones = 0
+    t0 = time.perf_counter_ns()
+
+    h_inicial = layout.heuristica(inicio.offsets, heuristic_type)
+    cota = h_inicial
+    stats.generar()
+
+    # Identificadores de los nodos que entran en el camino actual, en orden de generación y sin
+    # repetirse entre iteraciones (la raíz es el 0)
+    ids = count(1)
+
+    solucion = None
+    while solucion is None and cota != float('inf'):
+        stats.iteraciones += 1
+
+        # Menor f que ha superado la cota: será la cota de la siguiente iteración
+        siguiente_cota = float('inf')
+
+        # Tabla de transposición de la iteración: estado -> menor g con el que se ha explorado
+        tabla = {}
+
+        # Camino actual: (offsets, acción, coste de la acción, g, h, id) y sus sucesores pendientes
+        camino = [(inicio.offsets, '___', 0, 0, h_inicial, 0)]
+        en_camino = {inicio.offsets}
+        pendientes = []
+
+        if layout.es_meta(inicio.offsets):
+            solucion = camino
+            break
+
+        stats.expandir()
+        pendientes.append(layout.movimientos(inicio.offsets))
+
+        while pendientes:
+            siguiente = next(pendientes[-1], None)
+
+            # Sin más sucesores: se retrocede un nivel
+            if siguiente is None:
+                pendientes.pop()
+                en_camino.discard(camino.pop()[0])
+                continue
+
+            accion, hijo, coste, movido = siguiente
+            padre = camino[-1]
+            g = padre[3] + coste
+            stats.generar()
+
+            # Se evitan ciclos sobre el camino actual
+            if hijo in en_camino:
+                stats.podar()
+                continue
+
+            # Poda por tabla de transposición: ya explorado con un coste igual o menor
+            if hijo in tabla and tabla[hijo] <= g:
+                stats.podar()
+                continue
+
+            h = layout.heuristica_incremental(padre[4], padre[0], hijo, movido, heuristic_type)
+            f = g + h
+
+            # Poda por cota: se recuerda la menor f que la supera
+            if f > cota:
+                siguiente_cota = min(siguiente_cota, f)
+                stats.podar()
+                continue
+
+            camino.append((hijo, accion, coste, g, h, next(ids)))
+            stats.df = max(stats.df, len(camino) - 1)
+
+            if layout.es_meta(hijo):
+                solucion = camino
+                break
+
+            if len(tabla) < tamano_tabla or hijo in tabla:
+                tabla[hijo] = g
+
+            en_camino.add(hijo)
+            stats.expandir()
+            if limites is not None:
+                limites.comprobar(stats)
+            pendientes.append(layout.movimientos(hijo))
+
+        cota = siguiente_cota
+
+    stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+
+    if solucion is None:
+        return None, stats
+
+    # Se materializan solo los nodos del camino solución (valor = g + h, como en A*)
+    actual = Nodo(inicio, heuristica=h_inicial, valor=h_inicial)
+    resultado = [actual]
+    for offsets, accion, coste, g, h, ident in solucion[1:]:
+        actual = Nodo(
+            Estado.desde_offsets(layout, offsets),
+            padre=actual,
+            accion=accion,
+            costo=g,
+            profundidad=actual.profundidad + 1,
+            heuristica=h,
+            valor=g + h,
+            id=ident
+        )
+        resultado.append(actual)
+    return resultado, stats
@@ -0,0 +1,89 @@
+# limites.py
+import os
+import sys
+import time
+
+# Códigos de motivo de terminación de una búsqueda (Estadisticas.motivo)
+SOLUCION = 'SOLUCION'
+OPTIMA = 'OPTIMA'
+SIN_SOLUCION = 'SIN_SOLUCION'
+MAX_NODOS = 'MAX_NODOS'
+MAX_MEMORIA = 'MAX_MEMORIA'
+TIMEOUT = 'TIMEOUT'
+
+# QUE: Memoria residente del proceso en bytes (None si no puede medirse en este sistema).
+# POR QUE: En Linux se lee la memoria actual de /proc; en otros Unix se usa el pico de
+#          getrusage, que para un límite superior es igual de válido.
+def memoria_residente():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+# QUE: Excepción que interrumpe una búsqueda al superar uno de sus límites.
+# POR QUE: Se lanza desde la expansión de un nodo y se recoge en solver.buscar, de modo que el
+#          bucle de búsqueda no necesita comprobar nada si no hay límites.
+class LimiteAlcanzado(Exception):
+    def __init__(self, motivo, stats):
+        super().__init__(motivo)
+        self.motivo = motivo
+        self.stats = stats
+
+# QUE: Límites de recursos de una búsqueda: nodos generados, memoria residente y tiempo.
+# POR QUE: Una búsqueda sin límites puede agotar la memoria de la máquina. El número de nodos se
+#          comprueba en cada expansión y el tiempo y la memoria cada 'cada' expansiones.
+class Limites:
+    def __init__(self, max_nodos=None, max_memoria=None, tiempo_max=None, cada=256):
+        # Máximo de nodos generados (TN), de memoria residente (bytes) y de tiempo (segundos)
+        self.max_nodos = max_nodos
+        self.max_memoria = max_memoria
+        self.tiempo_max = tiempo_max
+        self.cada = cada
+
+        if max_memoria is not None and memoria_residente() is None:
+            raise ValueError("El límite de memoria no está disponible en este sistema")
+
+        self._inicio = None
+        self._fin = None
+
+    # Comienza a contar el tiempo de la búsqueda
+    def iniciar(self):
+        self._inicio = time.perf_counter()
+        self._fin = self._inicio + self.tiempo_max if self.tiempo_max is not None else None
+
+    # QUE: Devuelve el motivo del primer límite superado o None.
+    def superado(self, stats):
+        if self.max_nodos is not None and stats.tn >= self.max_nodos:
+            return MAX_NODOS
+        if stats.en % self.cada == 0:
+            if self._fin is not None and time.perf_counter() >= self._fin:
+                return TIMEOUT
+            if self.max_memoria is not None and memoria_residente() >= self.max_memoria:
+                return MAX_MEMORIA
+        return None
+
+    # QUE: Lanza LimiteAlcanzado si se ha superado algún límite.
+    # POR QUE: Las estadísticas se cierran con el tiempo transcurrido desde iniciar().
+    def comprobar(self, stats):
+        motivo = self.superado(stats)
+        if motivo is not None:
+            stats.tiempo = int((time.perf_counter() - self._inicio) * 1e6)
+            stats.motivo = motivo
+            raise LimiteAlcanzado(motivo, stats)
+
+    # QUE: Versión de una función de expansión que comprueba los límites después de cada llamada.
+    # POR QUE: Mismo mecanismo que perfil.Perfil: sin límites el bucle usa la función original.
+    def envolver_expandir(self, stats, expandir):
+        comprobar = self.comprobar
+
+        def expandir_con_limites():
+            expandir()
+            comprobar(stats)
+        return expandir_con_limites
@@ -0,0 +1,76 @@
+# lote.py
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from solver import buscar, INFORMADAS
+from limites import Limites
+
+# Cachés de soluciones abiertas en este proceso (una conexión por fichero)
+_caches = {}
+
+# QUE: Devuelve la caché de soluciones de un fichero, abriéndola la primera vez.
+# POR QUE: Cada proceso del pool reutiliza su conexión entre puzzles.
+def _cache(ruta, capacidad):
+    if ruta is None:
+        return None
+    if ruta not in _caches:
+        from cache import CacheSoluciones
+        _caches[ruta] = CacheSoluciones(ruta, capacidad)
+    return _caches[ruta]
+
+# QUE: Convierte las líneas de entrada en tareas (índice, opciones del puzzle).
+# POR QUE: Cada línea es una cadena de estado (36, 49 o 64 caracteres) o un objeto JSON con "s" y, opcionalmente,
+#          "strategy", "heuristic", "depth", "weight" (WAStar), "width" (Beam) y los límites "max_nodes", "max_memory" (MB) y
+#          "timeout" (segundos); lo que falte se toma de las opciones por defecto.
+def leer_tareas(lineas, por_defecto):
+    indice = 0
+    for linea in lineas:
+        linea = linea.strip()
+        if not linea:
+            continue
+        tarea = dict(por_defecto)
+        if linea.startswith('{'):
+            tarea.update(json.loads(linea))
+        else:
+            tarea['s'] = linea
+        tarea['index'] = indice
+        indice += 1
+        yield tarea
+
+# QUE: Resuelve un único puzzle de un lote y devuelve el resultado como diccionario.
+# POR QUE: Función de nivel de módulo para poder enviarse a los procesos del pool.
+def resolver_tarea(tarea):
+    resultado = {'index': tarea['index'], 's': tarea.get('s')}
+    try:
+        estrategia = tarea['strategy']
+        heuristica = tarea.get('heuristic') if estrategia in INFORMADAS else None
+        profundidad = tarea.get('depth') if estrategia == 'DFS' else None
+        if estrategia in INFORMADAS and heuristica is None:
+            raise ValueError("Se requiere heuristic para estrategias GBF, AStar, WAStar, Beam, IDAStar, ARAStar y HDAStar")
+
+        cache = _cache(tarea.get('cache'), tarea.get('cache_size', 100000))
+        limites = None
+        if any(tarea.get(k) is not None for k in ('max_nodes', 'max_memory', 'timeout')):
+            memoria = tarea.get('max_memory')
+            limites = Limites(tarea.get('max_nodes'), memoria * 2**20 if memoria is not None else None,
+                              tarea.get('timeout'))
+        camino, stats = buscar(tarea['s'], estrategia, profundidad, heuristica, cache=cache, limites=limites,
+                               peso=tarea.get('weight'), anchura=tarea.get('width'))
+        resultado['solution'] = [nodo.accion for nodo in camino[1:]] if camino else None
+        resultado['stats'] = stats.como_dict()
+    except Exception as e:
+        resultado['error'] = str(e)
+    return resultado
+
+# QUE: Resuelve un lote de puzzles en paralelo y devuelve los resultados según van terminando.
+# POR QUE: Evita lanzar un intérprete por puzzle y aprovecha todos los núcleos disponibles.
+def resolver_lote(tareas, procesos=None):
+    with ProcessPoolExecutor(max_workers=procesos or os.cpu_count()) as pool:
+        futuros = [pool.submit(resolver_tarea, tarea) for tarea in tareas]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+# QUE: Escribe un resultado como una línea JSON.
+# POR QUE: Formato de salida de la acción 'batch' (JSON lines en orden de finalización).
+def formatear(resultado):
+    return json.dumps(resultado, ensure_ascii=False)
@@ -7,9 +7,9 @@ from tablero import def_tablero
 def vehiculo(tablero):
     pos = defaultdict(list)
     
-    # Recorre todas las casillas del tablero 6x6
-    for r in range(6):
-        for c in range(6):
+    # Recorre todas las casillas del tablero (6x6, 7x7 u 8x8)
+    for r in range(len(tablero)):
+        for c in range(len(tablero[0])):
             # Si la casilla no está vacía ('o'), pertenece a un vehículo
             if (ch := tablero[r][c]) != 'o':
                 pos[ch].append((r, c))
@@ -20,8 +20,9 @@ def vehiculo(tablero):
 # QUE: Aplica una secuencia de movimientos a un estado y devuelve el nuevo estado.
 # POR QUE: Para generar los nuevos estados sucesores y responder a la consulta '--move', incluyendo validaciones de colisión.
 def apply_moves(s, moves):
-    # Convierte la cadena en una matriz 6x6
+    # Convierte la cadena en una matriz de filas x columnas
     tablero = def_tablero(s)
+    filas, columnas = len(tablero), len(tablero[0])
     
     # Procesa cada movimiento de la lista
     for move in moves:
@@ -66,9 +67,9 @@ def apply_moves(s, moves):
             
             # Comprueba límites del tablero y colisiones
             is_valid = (
-                max(new_cols) < 6 and 
+                max(new_cols) < columnas and 
                 all(
-                    0 <= c < 6 and
+                    0 <= c < columnas and
                     (c in current_cols or tablero[rows[0]][c] == 'o')
                     for c in new_cols
                 )
@@ -89,7 +90,7 @@ def apply_moves(s, moves):
             is_valid = (
                 min(new_cols) >= 0 and
                 all(
-                    0 <= c < 6 and
+                    0 <= c < columnas and
                     (c in current_cols or tablero[rows[0]][c] == 'o')
                     for c in new_cols
                 )
@@ -107,9 +108,9 @@ def apply_moves(s, moves):
             current_rows = set(rows)
             
             is_valid = (
-                max(new_rows) < 6 and
+                max(new_rows) < filas and
                 all(
-                    0 <= r < 6 and
+                    0 <= r < filas and
                     (r in current_rows or tablero[r][cols[0]] == 'o')
                     for r in new_rows
                 )
@@ -129,7 +130,7 @@ def apply_moves(s, moves):
             is_valid = (
                 min(new_rows) >= 0 and
                 all(
-                    0 <= r < 6 and
+                    0 <= r < filas and
                     (r in current_rows or tablero[r][cols[0]] == 'o')
                     for r in new_rows
                 )
@@ -146,16 +147,26 @@ def apply_moves(s, moves):
 
 # QUE: Calcula y devuelve la lista de sucesores válidos (acción, estado, costo).
 # POR QUE: Genera todas las transiciones legales desde el estado actual para la expansión en la búsqueda.
-def successors(s):
-    # Convierte la cadena plana en una matriz 6x6
+def successors(s, layout=None):
+    # Con una disposición compilada (bitboard.Layout) se usan sus tablas de movimiento
+    if layout is not None:
+        return [[accion, layout.decodificar(offsets), coste]
+                for accion, offsets, coste in layout.sucesores(layout.codificar(s))]
+    return list(iter_successors(s))
+
+# QUE: Genera uno a uno los sucesores válidos (acción, estado, costo) de una cadena.
+# POR QUE: El consumidor (p. ej. la búsqueda) puede procesar cada sucesor según se genera o parar
+#          antes. Los vehículos se recorren en orden alfabético y, dentro de cada uno, primero '+'
+#          y luego '-' con pasos crecientes: es el orden estable de la salida sin necesidad de
+#          ordenar la lista al final.
+def iter_successors(s):
+    # Convierte la cadena plana en una matriz de filas x columnas
     tablero = def_tablero(s)
+    filas, columnas = len(tablero), len(tablero[0])
     
     # Obtiene las posiciones de todos los vehículos del tablero
     posiciones = vehiculo(tablero)
     
-    # Lista donde se almacenarán los sucesores generados
-    successors_list = []
-    
     # Lista ordenada de vehículos (para asegurar orden determinista)
     vehiculos = sorted(k for k in posiciones if k != 'o')
     
@@ -192,7 +203,7 @@ def successors(s):
             
             # Cuenta casillas libres a la derecha
             c = max_col + 1
-            while c < 6 and tablero[row][c] == 'o':
+            while c < columnas and tablero[row][c] == 'o':
                 max_der += 1
                 c += 1
         else:
@@ -204,17 +215,18 @@ def successors(s):
             
             # Cuenta casillas libres hacia abajo
             r = max_row + 1
-            while r < 6 and tablero[r][col] == 'o':
+            while r < filas and tablero[r][col] == 'o':
                 max_abajo += 1
                 r += 1
         
         # --- Generación de sucesores ---
-        # Para cada dirección posible se generan estados intermedios por número de pasos
+        # Para cada dirección posible se generan estados intermedios por número de pasos,
+        # primero en el sentido '+' (derecha o arriba) y después en el '-' (izquierda o abajo)
         
-        # Movimiento horizontal a la izquierda
-        if horizontal and max_izq > 0:
-            for steps in range(1, max_izq + 1):
-                new_cols = [c - steps for c in cols]
+        # Movimiento horizontal a la derecha
+        if horizontal and max_der > 0:
+            for steps in range(1, max_der + 1):
+                new_cols = [c + steps for c in cols]
                 
                 # Aplica movimiento temporal
                 for r, c in pos_list:
@@ -231,13 +243,13 @@ def successors(s):
                 for r, c in pos_list:
                     tablero[r][c] = vehiculo_temp
                 
-                # Añade sucesor (acción, estado, coste)
-                successors_list.append([f"{vehiculo_temp}-{steps}", new_state, 6 - steps])
+                # Sucesor (acción, estado, coste): el coste es la longitud del carril menos los pasos
+                yield [f"{vehiculo_temp}+{steps}", new_state, columnas - steps]
         
-        # Movimiento horizontal a la derecha
-        if horizontal and max_der > 0:
-            for steps in range(1, max_der + 1):
-                new_cols = [c + steps for c in cols]
+        # Movimiento horizontal a la izquierda
+        if horizontal and max_izq > 0:
+            for steps in range(1, max_izq + 1):
+                new_cols = [c - steps for c in cols]
                 
                 for r, c in pos_list:
                     tablero[r][c] = 'o'
@@ -251,7 +263,7 @@ def successors(s):
                 for r, c in pos_list:
                     tablero[r][c] = vehiculo_temp
                 
-                successors_list.append([f"{vehiculo_temp}+{steps}", new_state, 6 - steps])
+                yield [f"{vehiculo_temp}-{steps}", new_state, columnas - steps]
         
         # Movimiento vertical hacia arriba
         if not horizontal and max_arriba > 0:
@@ -270,7 +282,7 @@ def successors(s):
                 for r, c in pos_list:
                     tablero[r][c] = vehiculo_temp
                 
-                successors_list.append([f"{vehiculo_temp}+{steps}", new_state, 6 - steps])
+                yield [f"{vehiculo_temp}+{steps}", new_state, filas - steps]
         
         # Movimiento vertical hacia abajo
         if not horizontal and max_abajo > 0:
@@ -289,19 +301,4 @@ def successors(s):
                 for r, c in pos_list:
                     tablero[r][c] = vehiculo_temp
                 
-                successors_list.append([f"{vehiculo_temp}-{steps}", new_state, 6 - steps])
-    
-    # --- Ordenación final ---
-    # Garantiza una salida estable e idéntica entre ejecuciones
-    def clave_orden(item):
-        accion = item[0]
-        veh = accion[0]
-        dir_char = accion[1] if len(accion) > 1 and accion[1] in '+-' else ''
-        try:
-            num = int(accion[2:])
-        except:
-            num = 0
-        return (veh, dir_char, num)
-
-    successors_list.sort(key=clave_orden)
-    return successors_list
+                yield [f"{vehiculo_temp}-{steps}", new_state, filas - steps]
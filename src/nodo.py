@@ -1,15 +1,13 @@
 # nodo.py
+from array import array
 
 # QUE: Representa un nodo en el árbol de búsqueda 
 # POR QUE: Almacena el historial (padre, acción), el costo y el valor para la búsqueda.
 class Nodo:
-    # Contador global para asignar IDs únicos a cada nodo
-    contador_id = 0
-
-    def __init__(self, estado, padre=None, accion='___', costo=0, profundidad=0, heuristica=0, valor=0):
-        # Identificador único del nodo (utilizado para desempate en la frontera)
-        self.id = Nodo.contador_id
-        Nodo.contador_id += 1
+    def __init__(self, estado, padre=None, accion='___', costo=0, profundidad=0, heuristica=0, valor=0, id=0):
+        # Identificador único del nodo dentro de su búsqueda (0 para la raíz). Lo asigna cada estrategia
+        # con un contador propio de la búsqueda, en el orden en que se generan los nodos
+        self.id = id
         
         # Estado del problema asociado al nodo
         self.estado = estado
@@ -52,3 +50,84 @@ class Nodo:
     def __str__(self):
         padre_id = self.padre.id if self.padre else 'none'
         return f"[{self.id},{padre_id},{self.accion},{self.estado},{self.costo},{self.profundidad},{self.heuristic},{self.valor}]"
+
+# QUE: Almacén compacto de los nodos de una búsqueda en arrays paralelos.
+# POR QUE: Un Nodo por sucesor generado domina la memoria de BFS y A*. Aquí cada nodo es un índice
+#          (su ID dentro de la búsqueda) en arrays de padre, costo, profundidad, heurística, valor y
+#          acción, y su estado ocupa una franja de ancho fijo de un bytearray (vector de offsets).
+#          Los objetos Nodo solo se crean para el camino solución (ver camino()).
+class AlmacenNodos:
+    def __init__(self, ancho=None):
+        # Índice del padre (-1 para la raíz)
+        self.padre = array('l')
+
+        # Costo acumulado, profundidad y heurística de cada nodo
+        self.costo = array('l')
+        self.profundidad = array('l')
+        self.heuristica = array('l')
+
+        # Valor de ordenación en la frontera
+        self.valor = array('d')
+
+        # Código de la acción (índice en la tabla de acciones distintas)
+        self.accion = array('H')
+        self.acciones = []
+        self._codigos = {}
+
+        # Tabla de estados: franjas de 'ancho' bytes, o lista si los estados no son vectores de offsets
+        self.ancho = ancho
+        self.estados = bytearray() if ancho is not None else []
+
+    # QUE: Añade un nodo y devuelve su ID.
+    # POR QUE: Los IDs son consecutivos desde 0 en cada búsqueda (desempate en la frontera).
+    def nuevo(self, estado, padre, accion, costo, profundidad, heuristica, valor):
+        codigo = self._codigos.get(accion)
+        if codigo is None:
+            codigo = self._codigos[accion] = len(self.acciones)
+            self.acciones.append(accion)
+        self.padre.append(padre)
+        self.costo.append(costo)
+        self.profundidad.append(profundidad)
+        self.heuristica.append(heuristica)
+        self.valor.append(valor)
+        self.accion.append(codigo)
+        if self.ancho is not None:
+            self.estados += estado
+        else:
+            self.estados.append(estado)
+        return len(self.padre) - 1
+
+    # Estado del nodo (vector de offsets o cadena)
+    def estado(self, ident):
+        if self.ancho is None:
+            return self.estados[ident]
+        inicio = ident * self.ancho
+        return bytes(self.estados[inicio:inicio + self.ancho])
+
+    # Número de nodos almacenados
+    def __len__(self):
+        return len(self.padre)
+
+    # QUE: Materializa como objetos Nodo el camino desde la raíz hasta un nodo.
+    # POR QUE: Solo el camino solución necesita nodos completos; crear_estado convierte el estado
+    #          almacenado en el objeto Estado que se imprime.
+    def camino(self, ident, crear_estado):
+        indices = []
+        while ident != -1:
+            indices.append(ident)
+            ident = self.padre[ident]
+
+        padre = None
+        for i in reversed(indices):
+            valor = self.valor[i]
+            padre = Nodo(
+                crear_estado(self.estado(i)),
+                padre=padre,
+                accion=self.acciones[self.accion[i]],
+                costo=self.costo[i],
+                profundidad=self.profundidad[i],
+                heuristica=self.heuristica[i],
+                valor=int(valor) if valor.is_integer() else valor,
+                id=i
+            )
+        return padre.camino()
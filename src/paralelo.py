@@ -0,0 +1,527 @@
+# paralelo.py
+import heapq
+import multiprocessing
+import os
+import queue
+import time
+import zlib
+from itertools import count
+from nodo import Nodo
+from estado import Estado
+from solver import Estadisticas, camino_por_estados
+
+# Nodos que se acumulan para un mismo proceso antes de enviarlos en un solo mensaje
+LOTE = 256
+
+# Expansiones seguidas de un proceso entre dos lecturas de su buzón
+RAFAGA = 64
+
+# QUE: Proceso propietario de un estado (vector de offsets).
+# POR QUE: El hash de Python de bytes cambia entre procesos (PYTHONHASHSEED); crc32 es estable y
+#          reparte los estados de forma uniforme entre los procesos.
+def propietario(estado, procesos):
+    return zlib.crc32(estado) % procesos
+
+# QUE: A* distribuido por hash (HDA*) entre varios procesos.
+# POR QUE: Cada proceso es dueño de los estados cuyo hash le corresponde y mantiene sus propias
+#          listas abierta y cerrada; los hijos de otro proceso se le envían en lotes. La mejor meta
+#          conocida (incumbente) se difunde a todos y poda los nodos con f >= incumbente. La búsqueda
+#          termina cuando ningún proceso tiene nodos con f < incumbente y no queda ningún lote en
+#          tránsito, lo que se detecta con oleadas de sondeo (método de los cuatro contadores): dos
+#          oleadas seguidas con todos los procesos ociosos y los mismos lotes enviados y recibidos.
+#          Con una heurística admisible la solución es óptima; el camino se reconstruye preguntando
+#          a cada propietario por el predecesor de su estado.
+def buscar_hda(inicio, heuristic_type, procesos=None):
+    layout = inicio.layout
+    if layout is None:
+        raise ValueError("HDAStar requiere un tablero válido para el motor de offsets")
+
+    stats = Estadisticas()
+    t0 = time.perf_counter_ns()
+    raiz = inicio.offsets
+    # La heurística se evalúa antes de crear los procesos: así heredan la base de patrones construida
+    h_raiz = layout.heuristica(raiz, heuristic_type)
+
+    if layout.es_meta(raiz):
+        stats.generar()
+        stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+        return [Nodo(inicio, heuristica=h_raiz, valor=h_raiz)], stats
+
+    n = procesos or os.cpu_count()
+    dueno_raiz = propietario(raiz, n)
+    contexto = multiprocessing.get_context()
+    buzones = [contexto.Queue() for _ in range(n)]
+    coordinador = contexto.Queue()
+    trabajadores = [
+        contexto.Process(
+            target=_trabajador,
+            args=(i, n, layout, heuristic_type, buzones, coordinador,
+                  (raiz, h_raiz) if dueno_raiz == i else None, (i - dueno_raiz) % n),
+            daemon=True
+        )
+        for i in range(n)
+    ]
+    for trabajador in trabajadores:
+        trabajador.start()
+
+    try:
+        meta, incumbente = _coordinar(n, buzones, coordinador, trabajadores)
+        camino = None
+        if meta is not None:
+            camino = _camino(layout, meta, n, buzones, coordinador, trabajadores)
+
+        # Estadísticas agregadas de todos los procesos
+        for buzon in buzones:
+            buzon.put(('fin',))
+        for _ in range(n):
+            _, tn, en, cn, duplicados, df = _esperar(coordinador, trabajadores, 'stats')
+            stats.tn += tn
+            stats.en += en
+            stats.cn += cn
+            stats.duplicados = (stats.duplicados or 0) + duplicados
+            stats.df = max(stats.df, df)
+        stats.generar()
+        for trabajador in trabajadores:
+            trabajador.join()
+    finally:
+        for trabajador in trabajadores:
+            if trabajador.is_alive():
+                trabajador.terminate()
+
+    stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+    return camino, stats
+
+# QUE: Bucle del coordinador: difunde el incumbente y detecta la terminación.
+# POR QUE: Cuando todos los procesos se declaran ociosos lanza una oleada de sondeo; cada proceso
+#          responde con sus lotes enviados y recibidos y si sigue ocioso. Los mensajes de un mismo
+#          proceso llegan en orden, así que su última respuesta indica su estado actual.
+def _coordinar(n, buzones, coordinador, trabajadores):
+    meta = None
+    incumbente = float('inf')
+    ociosos = set()
+    ola = 0
+    respuestas = None
+    anterior = None
+
+    def sondear():
+        nonlocal ola, respuestas
+        ola += 1
+        respuestas = {}
+        for buzon in buzones:
+            buzon.put(('sondeo', ola))
+
+    while True:
+        mensaje = _esperar(coordinador, trabajadores)
+        clase = mensaje[0]
+
+        if clase == 'meta':
+            if mensaje[1] < incumbente:
+                incumbente, meta = mensaje[1], mensaje[2]
+                for buzon in buzones:
+                    buzon.put(('meta', incumbente))
+
+        elif clase == 'ocioso':
+            ociosos.add(mensaje[1])
+            if respuestas is None and len(ociosos) == n:
+                sondear()
+
+        elif clase == 'ola' and mensaje[2] == ola:
+            _, ident, _, enviados, recibidos, ocioso = mensaje
+            respuestas[ident] = (enviados, recibidos, ocioso)
+            if ocioso:
+                ociosos.add(ident)
+            else:
+                ociosos.discard(ident)
+
+            if len(respuestas) == n:
+                enviados = sum(r[0] for r in respuestas.values())
+                recibidos = sum(r[1] for r in respuestas.values())
+                respuestas = None
+                if len(ociosos) == n and enviados == recibidos:
+                    # Terminación: dos oleadas seguidas sin ningún cambio
+                    if anterior == enviados:
+                        return meta, incumbente
+                    anterior = enviados
+                    sondear()
+                else:
+                    anterior = None
+                    if len(ociosos) == n:
+                        sondear()
+
+# QUE: Espera el siguiente mensaje para el coordinador (opcionalmente de una clase concreta).
+# POR QUE: Comprueba periódicamente que ningún proceso ha terminado con error; si no, el
+#          coordinador esperaría para siempre.
+def _esperar(coordinador, trabajadores, clase=None):
+    while True:
+        try:
+            mensaje = coordinador.get(timeout=1)
+        except queue.Empty:
+            for trabajador in trabajadores:
+                if trabajador.exitcode not in (None, 0):
+                    raise RuntimeError(f"Un proceso de HDAStar ha terminado con error ({trabajador.exitcode})")
+            continue
+        if clase is None or mensaje[0] == clase:
+            return mensaje
+
+# QUE: Reconstruye el camino solución preguntando a cada propietario por el predecesor del estado.
+def _camino(layout, meta, n, buzones, coordinador, trabajadores):
+    pasos = []
+    estado = meta
+    while estado is not None:
+        buzones[propietario(estado, n)].put(('padre', estado))
+        _, _, padre, accion, costo, profundidad, h, ident = _esperar(coordinador, trabajadores, 'padre')
+        pasos.append((estado, accion, costo, profundidad, h, ident))
+        estado = padre
+
+    actual = None
+    for estado, accion, costo, profundidad, h, ident in reversed(pasos):
+        actual = Nodo(
+            Estado.desde_offsets(layout, estado),
+            padre=actual,
+            accion=accion,
+            costo=costo,
+            profundidad=profundidad,
+            heuristica=h,
+            valor=costo + h,
+            id=ident
+        )
+    return actual.camino()
+
+# QUE: Proceso de HDA*: A* sobre los estados de los que es propietario.
+# POR QUE: Alterna ráfagas de expansiones con la lectura de su buzón (lotes de nodos, nuevo
+#          incumbente, sondeos y consultas de predecesores) y solo se bloquea cuando no tiene nodos
+#          con f < incumbente, tras enviar todos sus lotes pendientes. Los ids de los nodos que acepta
+#          son primero, primero + n, primero + 2n...: únicos en toda la búsqueda sin comunicarse con
+#          los demás procesos (el dueño de la raíz empieza en 0, que es el id de la raíz).
+def _trabajador(ident, n, layout, heuristic_type, buzones, coordinador, raiz, primero):
+    buzon = buzones[ident]
+    stats = Estadisticas()
+    stats.duplicados = 0
+    ids = count(primero, n)
+
+    # Mejor coste conocido de cada estado propio y su predecesor: (padre, acción, g, profundidad, h, id)
+    mejor_costo = {}
+    padres = {}
+    abiertos = []
+    incumbente = float('inf')
+
+    # Lotes pendientes de envío a cada proceso y contadores de lotes para la terminación
+    salida = [[] for _ in range(n)]
+    enviados = 0
+    recibidos = 0
+
+    # QUE: Recibe un nodo propio; lo descarta si no mejora el coste conocido.
+    def recibir(estado, g, profundidad, h, padre, accion):
+        nonlocal incumbente
+        anterior = mejor_costo.get(estado)
+        if anterior is not None and anterior <= g:
+            stats.descartar_duplicado()
+            return
+        mejor_costo[estado] = g
+        padres[estado] = (padre, accion, g, profundidad, h, next(ids))
+        stats.df = max(stats.df, profundidad)
+
+        # Las metas no se expanden: se comunica la nueva mejor solución
+        if layout.es_meta(estado):
+            if g < incumbente:
+                incumbente = g
+                coordinador.put(('meta', g, estado))
+            return
+        heapq.heappush(abiertos, (g + h, h, estado, g, profundidad))
+
+    def enviar(destino):
+        nonlocal enviados
+        if salida[destino]:
+            buzones[destino].put(('nodos', salida[destino]))
+            salida[destino] = []
+            enviados += 1
+
+    def enviar_todo():
+        for destino in range(n):
+            enviar(destino)
+
+    def hay_trabajo():
+        return bool(abiertos) and abiertos[0][0] < incumbente
+
+    if raiz is not None:
+        recibir(raiz[0], 0, 0, raiz[1], None, '___')
+
+    ocioso = False
+    while True:
+        # Buzón: sin trabajo se bloquea hasta el siguiente mensaje
+        while True:
+            if hay_trabajo():
+                ocioso = False
+                try:
+                    mensaje = buzon.get_nowait()
+                except queue.Empty:
+                    break
+            else:
+                enviar_todo()
+                if not ocioso:
+                    ocioso = True
+                    coordinador.put(('ocioso', ident))
+                mensaje = buzon.get()
+
+            clase = mensaje[0]
+            if clase == 'nodos':
+                recibidos += 1
+                for nodo in mensaje[1]:
+                    recibir(*nodo)
+            elif clase == 'meta':
+                incumbente = min(incumbente, mensaje[1])
+            elif clase == 'sondeo':
+                enviar_todo()
+                coordinador.put(('ola', ident, mensaje[1], enviados, recibidos, not hay_trabajo()))
+            elif clase == 'padre':
+                coordinador.put(('padre', mensaje[1], *padres[mensaje[1]]))
+            elif clase == 'fin':
+                coordinador.put(('stats', stats.tn, stats.en, stats.cn, stats.duplicados, stats.df))
+                return
+
+        # Ráfaga de expansiones
+        for _ in range(RAFAGA):
+            if not hay_trabajo():
+                break
+            f, h, estado, g, profundidad = heapq.heappop(abiertos)
+
+            # Entrada obsoleta: el estado se recibió después con menor coste
+            if g > mejor_costo[estado]:
+                stats.podar()
+                continue
+
+            stats.expandir()
+            for accion, hijo, coste, movido in layout.movimientos(estado):
+                stats.generar()
+                nuevo_g = g + coste
+                nuevo_h = layout.heuristica_incremental(h, estado, hijo, movido, heuristic_type)
+
+                # Poda por incumbente: el hijo no puede llevar a una solución mejor
+                if nuevo_g + nuevo_h >= incumbente:
+                    stats.podar()
+                    continue
+
+                destino = propietario(hijo, n)
+                if destino == ident:
+                    recibir(hijo, nuevo_g, profundidad + 1, nuevo_h, estado, accion)
+                else:
+                    salida[destino].append((hijo, nuevo_g, profundidad + 1, nuevo_h, estado, accion))
+                    if len(salida[destino]) >= LOTE:
+                        enviar(destino)
+
+        # Tras cada ráfaga se envían también los lotes incompletos para no retrasar a los demás
+        enviar_todo()
+
+# Estados por mensaje en el intercambio de hijos entre capas de la BFS paralela
+LOTE_CAPA = 4096
+
+# QUE: BFS síncrona por capas repartida entre varios procesos.
+# POR QUE: Cada proceso es dueño de una partición (por hash) de los visitados y expande los estados
+#          propios de la capa en curso. Los hijos se envían a su propietario, que descarta los ya
+#          visitados y forma con el resto su parte de la siguiente capa. Los estados viajan
+#          concatenados en bloques de bytes (vectores de offsets de ancho fijo), mucho más baratos
+#          de serializar que las tuplas. Con 'con_padres' cada visitado guarda su predecesor (para
+#          reconstruir el camino) y si no, su distancia a los estados iniciales.
+class BFSParalela:
+    def __init__(self, layout, iniciales, procesos=None, con_padres=True, buscar_meta=True):
+        self.layout = layout
+        self.n = procesos or os.cpu_count()
+        self.profundidad = 0
+        contexto = multiprocessing.get_context()
+        self.buzones = [contexto.Queue() for _ in range(self.n)]
+        self.coordinador = contexto.Queue()
+        # Los ids de los nodos se reparten como en HDA*: el dueño del primer estado inicial empieza en 0
+        dueno = propietario(iniciales[0], self.n) if iniciales else 0
+        self.trabajadores = [
+            contexto.Process(
+                target=_trabajador_bfs,
+                args=(i, self.n, layout, [e for e in iniciales if propietario(e, self.n) == i],
+                      self.buzones, self.coordinador, con_padres, buscar_meta, (i - dueno) % self.n),
+                daemon=True
+            )
+            for i in range(self.n)
+        ]
+        for trabajador in self.trabajadores:
+            trabajador.start()
+
+    # QUE: Expande la capa en curso en todos los procesos.
+    # POR QUE: Devuelve el número de estados nuevos y las metas encontradas entre ellos.
+    def capa(self):
+        for buzon in self.buzones:
+            buzon.put(('capa',))
+        nuevos = 0
+        metas = []
+        for _ in range(self.n):
+            _, _, cuantos, metas_proceso = _esperar(self.coordinador, self.trabajadores, 'capa')
+            nuevos += cuantos
+            metas.extend(metas_proceso)
+        self.profundidad += 1
+        return nuevos, metas
+
+    # QUE: Reconstruye el camino hasta un estado preguntando a cada propietario por su predecesor.
+    def camino(self, meta):
+        estados = []
+        ids = []
+        estado = meta
+        while estado is not None:
+            estados.append(estado)
+            self.buzones[propietario(estado, self.n)].put(('padre', estado))
+            estado, ident = _esperar(self.coordinador, self.trabajadores, 'padre')[1]
+            ids.append(ident)
+        estados.reverse()
+        ids.reverse()
+        return camino_por_estados(self.layout, estados, ids)
+
+    # QUE: Devuelve todos los visitados (estado -> distancia) reuniendo las particiones.
+    def distancias(self):
+        for buzon in self.buzones:
+            buzon.put(('volcar',))
+        distancias = {}
+        for _ in range(self.n):
+            distancias.update(_esperar(self.coordinador, self.trabajadores, 'volcado')[1])
+        return distancias
+
+    # QUE: Termina los procesos y acumula sus estadísticas en stats.
+    def cerrar(self, stats=None):
+        try:
+            for buzon in self.buzones:
+                buzon.put(('fin',))
+            for _ in range(self.n):
+                _, tn, en, duplicados = _esperar(self.coordinador, self.trabajadores, 'stats')
+                if stats is not None:
+                    stats.tn += tn
+                    stats.en += en
+                    stats.duplicados = (stats.duplicados or 0) + duplicados
+            for trabajador in self.trabajadores:
+                trabajador.join()
+        finally:
+            self.terminar()
+
+    # Interrumpe los procesos que sigan vivos (p. ej. tras un error)
+    def terminar(self):
+        for trabajador in self.trabajadores:
+            if trabajador.is_alive():
+                trabajador.terminate()
+
+# QUE: BFS paralela por capas desde un estado inicial (estrategia PBFS).
+# POR QUE: La meta se comprueba al generar, como en BFS; el camino es de longitud mínima. Entre las
+#          metas de la misma capa se elige la menor para que el resultado no dependa del reparto.
+def buscar_bfs_paralela(inicio, procesos=None):
+    layout = inicio.layout
+    if layout is None:
+        raise ValueError("PBFS requiere un tablero válido para el motor de offsets")
+
+    stats = Estadisticas()
+    stats.duplicados = 0
+    t0 = time.perf_counter_ns()
+    stats.generar()
+    if layout.es_meta(inicio.offsets):
+        stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+        return [Nodo(inicio)], stats
+
+    bfs = BFSParalela(layout, [inicio.offsets], procesos)
+    try:
+        camino = None
+        while True:
+            nuevos, metas = bfs.capa()
+            if not nuevos:
+                break
+            stats.df = bfs.profundidad
+            if metas:
+                camino = bfs.camino(min(metas))
+                break
+        bfs.cerrar(stats)
+    finally:
+        bfs.terminar()
+
+    stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+    return camino, stats
+
+# QUE: Proceso de la BFS paralela: dueño de una partición de los visitados.
+# POR QUE: Atiende las órdenes del coordinador. En cada capa expande sus estados, reparte los hijos
+#          por propietario y espera el marcador de fin de capa de cada uno de los demás procesos
+#          (los mensajes de un mismo emisor llegan en orden) antes de informar al coordinador. Cada
+#          cola tiene su propio hilo de envío, así que los hijos de otro proceso pueden llegar antes
+#          que la orden de la capa: se guardan y se procesan al empezarla. Los ids de los nodos que
+#          acepta son primero, primero + n, primero + 2n... (como en HDA*).
+def _trabajador_bfs(ident, n, layout, iniciales, buzones, coordinador, con_padres, buscar_meta, primero):
+    buzon = buzones[ident]
+    ancho = len(layout.vehiculos)
+    registro = 2 * ancho if con_padres else ancho
+    stats = Estadisticas()
+    stats.duplicados = 0
+    ids = count(primero, n)
+
+    # Visitados propios: estado -> (predecesor, id) (con_padres) o distancia a los iniciales
+    if con_padres:
+        visitados = {e: (None, next(ids)) for e in iniciales}
+    else:
+        visitados = dict.fromkeys(iniciales, 0)
+    capa = list(iniciales)
+    profundidad = 0
+    adelantados = []
+
+    while True:
+        orden = buzon.get()
+        clase = orden[0]
+
+        if clase in ('hijos', 'fin_capa'):
+            adelantados.append(orden)
+
+        elif clase == 'capa':
+            profundidad += 1
+            nueva = []
+            metas = []
+
+            # Hijos de un bloque recibido que aún no se habían visitado
+            def aceptar(bloque):
+                for p in range(0, len(bloque), registro):
+                    hijo = bloque[p:p + ancho]
+                    if hijo in visitados:
+                        stats.descartar_duplicado()
+                        continue
+                    visitados[hijo] = (bloque[p + ancho:p + registro], next(ids)) if con_padres else profundidad
+                    nueva.append(hijo)
+                    if buscar_meta and layout.es_meta(hijo):
+                        metas.append(hijo)
+
+            salida = [[] for _ in range(n)]
+            for estado in capa:
+                stats.expandir()
+                for _, hijo, _ in layout.sucesores(estado):
+                    stats.generar()
+                    destino = propietario(hijo, n)
+                    lote = salida[destino]
+                    lote.append(hijo + estado if con_padres else hijo)
+                    if len(lote) >= LOTE_CAPA:
+                        if destino == ident:
+                            aceptar(b''.join(lote))
+                        else:
+                            buzones[destino].put(('hijos', b''.join(lote)))
+                        salida[destino] = []
+
+            # Últimos lotes y marcador de fin de capa para cada proceso
+            for destino in range(n):
+                if destino != ident:
+                    buzones[destino].put(('hijos', b''.join(salida[destino])))
+                    buzones[destino].put(('fin_capa',))
+            aceptar(b''.join(salida[ident]))
+
+            pendientes = n - 1
+            while pendientes:
+                mensaje = adelantados.pop(0) if adelantados else buzon.get()
+                if mensaje[0] == 'hijos':
+                    aceptar(mensaje[1])
+                else:
+                    pendientes -= 1
+
+            capa = nueva
+            coordinador.put(('capa', ident, len(nueva), metas))
+
+        elif clase == 'padre':
+            coordinador.put(('padre', visitados[orden[1]]))
+        elif clase == 'volcar':
+            coordinador.put(('volcado', visitados))
+        elif clase == 'fin':
+            coordinador.put(('stats', stats.tn, stats.en, stats.duplicados))
+            return
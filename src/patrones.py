@@ -0,0 +1,95 @@
+# patrones.py
+import heapq
+from operator import itemgetter
+
+# Tamaño máximo del espacio abstracto (producto de offsets posibles de los vehículos del patrón)
+LIMITE_PATRON = 200000
+
+# QUE: Base de datos de patrones para la heurística 4.
+# POR QUE: Se abstrae el puzzle dejando solo el coche rojo y los vehículos que cruzan su fila
+#          (y, si el tamaño lo permite, los horizontales que cruzan las columnas de estos).
+#          El coste óptimo exacto en esa abstracción (calculado una vez con Dijkstra hacia atrás
+#          desde sus metas) es una cota inferior admisible y consistente del coste real, porque
+#          quitar vehículos solo puede hacer los movimientos más fáciles.
+class BasePatrones:
+
+    def __init__(self, layout, offsets_inicio):
+        # Se importa aquí para evitar la dependencia circular con bitboard
+        from bitboard import Layout
+
+        rojo = layout.rojo
+        fila = layout.fila_salida
+        max_col, _ = layout.salida[offsets_inicio[rojo]]
+
+        # Candidatos: vehículos horizontales de la fila de salida y verticales a la derecha del coche rojo.
+        # Primero los que bloquean ahora mismo y, después, los más cercanos a la salida.
+        candidatos = []
+        for j in range(len(layout.vehiculos)):
+            if j == rojo:
+                continue
+            if layout.horizontal[j] and layout.carril[j] == fila:
+                candidatos.append((0, 0, j))
+            elif not layout.horizontal[j] and layout.carril[j] > max_col:
+                p = offsets_inicio[j]
+                bloquea = p <= fila < p + layout.longitud[j]
+                candidatos.append((0 if bloquea else 1, -layout.carril[j], j))
+        candidatos.sort()
+
+        # Se añaden vehículos mientras el espacio abstracto no supere el límite
+        patron = [rojo]
+        tamano = len(layout.mascaras[rojo])
+        for _, _, j in candidatos:
+            if tamano * len(layout.mascaras[j]) > LIMITE_PATRON:
+                continue
+            patron.append(j)
+            tamano *= len(layout.mascaras[j])
+
+        # Segundo anillo: vehículos horizontales que cruzan las columnas de los verticales del patrón
+        columnas = 0
+        for j in patron:
+            if not layout.horizontal[j]:
+                for m in layout.mascaras[j]:
+                    columnas |= m
+        for j in range(len(layout.vehiculos)):
+            if j in patron or not layout.horizontal[j]:
+                continue
+            cruza = any(m & columnas for m in layout.mascaras[j])
+            if cruza and tamano * len(layout.mascaras[j]) <= LIMITE_PATRON:
+                patron.append(j)
+                tamano *= len(layout.mascaras[j])
+        patron.sort()
+
+        # Disposición abstracta: solo los vehículos del patrón en su posición inicial
+        cadena = layout.decodificar(offsets_inicio)
+        letras = {layout.vehiculos[j] for j in patron}
+        self.layout = Layout(''.join(ch if ch in letras else 'o' for ch in cadena), fila)
+
+        # Proyección de un vector de offsets completo al espacio abstracto
+        self._proyectar = itemgetter(*patron) if len(patron) > 1 else (lambda o: (o[patron[0]],))
+
+        self.tabla = self._dijkstra()
+
+        # Estados abstractos sin salida: cualquier valor es admisible, se usa el máximo + 1
+        self.sin_salida = max(self.tabla.values(), default=0) + 1
+
+    # QUE: Coste mínimo exacto a la meta de cada estado del espacio abstracto.
+    # POR QUE: Los movimientos son reversibles y de coste simétrico, así que basta un Dijkstra
+    #          desde todas las metas abstractas.
+    def _dijkstra(self):
+        tabla = {}
+        heap = [(0, meta) for meta in self.layout.estados_meta()]
+        heapq.heapify(heap)
+        while heap:
+            coste, estado = heapq.heappop(heap)
+            if estado in tabla:
+                continue
+            tabla[estado] = coste
+            for _, hijo, c in self.layout.sucesores(estado):
+                if hijo not in tabla:
+                    heapq.heappush(heap, (coste + c, hijo))
+        return tabla
+
+    # QUE: Valor heurístico de un estado completo (consulta en la tabla por su proyección).
+    # POR QUE: Evaluación O(1) durante la búsqueda.
+    def heuristica(self, offsets):
+        return self.tabla.get(bytes(self._proyectar(offsets)), self.sin_salida)
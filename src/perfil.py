@@ -0,0 +1,111 @@
+# perfil.py
+import time
+import tracemalloc
+
+# Fases del bucle de búsqueda que se cronometran
+FASES = ('sucesores', 'heuristica', 'frontera', 'duplicados', 'meta')
+
+# QUE: Instrumentación opcional de una búsqueda (tiempos por fase, tamaños máximos y memoria).
+# POR QUE: Para saber en qué se va el tiempo de una búsqueda lenta. El bucle de búsqueda llama a sus
+#          operaciones a través de variables locales; solo si se pasa un Perfil se sustituyen por
+#          versiones cronometradas (ver envolver), así que desactivado no añade ningún coste.
+class Perfil:
+    def __init__(self, progreso=None, cada=10000, memoria=False):
+        # Tiempo acumulado de cada fase (nanosegundos); solo las estrategias del bucle general
+        # (BFS, DFS, UC, GBF y A*) se instrumentan por fases
+        self.tiempos = dict.fromkeys(FASES, 0)
+        self.instrumentado = False
+
+        # Tamaño máximo de la frontera y del índice de estados visitados
+        self.max_frontera = 0
+        self.max_visitados = None
+
+        # Memoria pico de la búsqueda según tracemalloc (bytes); None si no se mide. tracemalloc
+        # ralentiza mucho la búsqueda, así que se activa aparte
+        self.memoria = memoria
+        self.memoria_pico = None
+        self._tracemalloc_propio = False
+
+        # Función progreso(stats, perfil) llamada cada 'cada' expansiones
+        self.progreso = progreso
+        self.cada = cada
+
+    # QUE: Devuelve una versión cronometrada de una función que acumula su tiempo en una fase.
+    # POR QUE: Con lista=True el resultado (un generador) se consume dentro del cronómetro, de modo
+    #          que se mide la generación completa y no solo la creación del generador.
+    def envolver(self, fase, funcion, lista=False):
+        self.instrumentado = True
+        tiempos = self.tiempos
+        reloj = time.perf_counter_ns
+
+        if lista:
+            def cronometrada(*args):
+                t0 = reloj()
+                resultado = list(funcion(*args))
+                tiempos[fase] += reloj() - t0
+                return resultado
+        else:
+            def cronometrada(*args):
+                t0 = reloj()
+                resultado = funcion(*args)
+                tiempos[fase] += reloj() - t0
+                return resultado
+        return cronometrada
+
+    # QUE: Versión cronometrada de extraer() que además registra el tamaño máximo de la frontera.
+    # POR QUE: Entre dos extracciones solo hay inserciones, así que el máximo se alcanza justo antes
+    #          de una extracción.
+    def envolver_extraer(self, frontera):
+        extraer = self.envolver('frontera', frontera.extraer)
+
+        def extraer_medido():
+            if len(frontera) > self.max_frontera:
+                self.max_frontera = len(frontera)
+            return extraer()
+        return extraer_medido
+
+    # QUE: Versión de stats.expandir() que llama a la función de progreso cada 'cada' expansiones.
+    def envolver_expandir(self, stats, expandir):
+        if self.progreso is None or not self.cada:
+            return expandir
+
+        def expandir_con_progreso():
+            expandir()
+            if stats.en % self.cada == 0:
+                self.progreso(stats, self)
+        return expandir_con_progreso
+
+    # QUE: Comienza la medición de memoria.
+    # POR QUE: Si tracemalloc ya estaba activo (p. ej. en los benchmarks) se reutiliza sin pararlo.
+    def iniciar(self):
+        if self.memoria:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._tracemalloc_propio = True
+
+    # QUE: Termina la medición y asocia el perfil a las estadísticas de la búsqueda.
+    def terminar(self, stats):
+        if self.memoria and tracemalloc.is_tracing():
+            self.memoria_pico = tracemalloc.get_traced_memory()[1]
+            if self._tracemalloc_propio:
+                tracemalloc.stop()
+                self._tracemalloc_propio = False
+        stats.perfil = self
+
+    # Perfil como diccionario (mismas etiquetas que la representación textual)
+    def como_dict(self, stats):
+        datos = {'NS': round(stats.tn * 1e6 / stats.tiempo) if stats.tiempo else None}
+        if self.memoria_pico is not None:
+            datos['MP'] = self.memoria_pico
+        if self.instrumentado:
+            datos['MF'] = self.max_frontera
+            datos['MV'] = self.max_visitados
+            for fase in FASES:
+                datos[f'T({fase})'] = self.tiempos[fase] // 1000
+        return datos
+
+    # Representación textual (tiempos por fase en microsegundos, como ET)
+    def texto(self, stats):
+        return '\n'.join(f"{etiqueta}: {valor}" for etiqueta, valor in self.como_dict(stats).items())
@@ -0,0 +1,141 @@
+# repeticion.py
+import json
+import re
+from functools import lru_cache
+from bitboard import Layout
+
+# Motivos por los que se detiene una repetición (Resultado.motivo)
+SINTAXIS = 'SINTAXIS'
+VEHICULO_INEXISTENTE = 'VEHICULO_INEXISTENTE'
+FUERA_DEL_TABLERO = 'FUERA_DEL_TABLERO'
+CHOQUE = 'CHOQUE'
+
+# Formato de una acción: vehículo, sentido y pasos (p. ej. "A+2")
+ACCION = re.compile(r'([A-Z])([+-])([0-9]+)$')
+
+# Disposiciones compiladas que se conservan entre repeticiones de un lote
+DISPOSICIONES = 1024
+
+# QUE: Resultado de repetir una lista de movimientos sobre un estado.
+# POR QUE: Dice si todos los movimientos son legales, dónde y por qué falla el primero que no lo es,
+#          el coste acumulado y si el estado final es meta.
+class Resultado:
+    def __init__(self, layout, offsets, aplicados, costo, indice=None, motivo=None, detalle=None):
+        self.layout = layout
+        self.offsets = offsets
+
+        # Movimientos aplicados (todos si la secuencia es legal) y su coste acumulado
+        self.aplicados = aplicados
+        self.costo = costo
+
+        # Primer movimiento ilegal: índice (desde 0), motivo y detalle legible; None si no hay
+        self.indice = indice
+        self.motivo = motivo
+        self.detalle = detalle
+
+        # ¿El estado al que se llega (tras el último movimiento legal) es meta?
+        self.meta = layout.es_meta(offsets)
+
+    @property
+    def valido(self):
+        return self.motivo is None
+
+    # Cadena del estado final (se decodifica solo si se pide)
+    @property
+    def estado(self):
+        return self.layout.decodificar(self.offsets)
+
+    # Resultado como diccionario (claves de la salida JSON, como en batch)
+    def como_dict(self):
+        datos = {'valid': self.valido, 'goal': self.meta, 'applied': self.aplicados, 'cost': self.costo,
+                 'state': self.estado}
+        if not self.valido:
+            datos['error_index'] = self.indice
+            datos['reason'] = self.motivo
+            datos['detail'] = self.detalle
+        return datos
+
+# QUE: Compila una lista de acciones contra una disposición: (vehículo, sentido, pasos) por acción.
+# POR QUE: Se analiza cada acción una sola vez y el vehículo se traduce a su índice en la
+#          disposición, así que repetir no vuelve a mirar el tablero. Devuelve los movimientos
+#          compilados hasta el primer error y el error (índice, motivo, detalle), o None.
+def compilar(layout, acciones):
+    compilados = []
+    for k, accion in enumerate(acciones):
+        encontrada = ACCION.match(accion.strip())
+        if not encontrada or int(encontrada[3]) < 1:
+            return compilados, (k, SINTAXIS, f"acción mal formada: {accion!r}")
+        vehiculo, sentido, pasos = encontrada[1], encontrada[2], int(encontrada[3])
+        if vehiculo not in layout.indice:
+            return compilados, (k, VEHICULO_INEXISTENTE, f"{accion}: no hay vehículo {vehiculo}")
+        # Índice 0 de las tablas de movimiento: sentido '+'; índice 1: sentido '-'
+        compilados.append((layout.indice[vehiculo], 0 if sentido == '+' else 1, pasos))
+    return compilados, None
+
+# QUE: Aplica una lista de acciones a un estado y se detiene en el primer movimiento ilegal.
+# POR QUE: Los movimientos compilados se aplican de forma incremental sobre el vector de offsets
+#          y la máscara de ocupación con las tablas de la disposición (bitboard.Layout): cada
+#          movimiento cuesta una consulta y una operación de bits, sin recorrer el tablero. Con el
+#          mismo coste que los sucesores de la búsqueda, así que el coste acumulado es comparable.
+def repetir(cadena, acciones, layout=None):
+    if layout is None:
+        layout = Layout(cadena)
+    offsets = bytearray(layout.codificar(cadena))
+    ocupado = layout.ocupacion(offsets)
+    mascaras = layout.mascaras
+    tablas = layout.tablas
+
+    compilados, error = compilar(layout, acciones)
+    costo = 0
+    for k, (i, sentido, pasos) in enumerate(compilados):
+        p = offsets[i]
+        movs = tablas[i][p][sentido]
+        accion = acciones[k]
+        if pasos > len(movs):
+            return Resultado(layout, bytes(offsets), k, costo, k, FUERA_DEL_TABLERO,
+                             f"{accion}: sale del tablero")
+        _, nuevo, camino, coste = movs[pasos - 1]
+        if ocupado & camino:
+            bloqueador = next(layout.vehiculos[j] for j, q in enumerate(offsets)
+                              if j != i and mascaras[j][q] & camino)
+            return Resultado(layout, bytes(offsets), k, costo, k, CHOQUE, f"{accion}: choca con {bloqueador}")
+
+        q = nuevo[0]
+        ocupado = ocupado & ~mascaras[i][p] | mascaras[i][q]
+        offsets[i] = q
+        costo += coste
+
+    if error is not None:
+        return Resultado(layout, bytes(offsets), len(compilados), costo, *error)
+    return Resultado(layout, bytes(offsets), len(compilados), costo)
+
+# Disposición compilada de un estado inicial, compartida por todas las repeticiones que parten de él
+@lru_cache(maxsize=DISPOSICIONES)
+def _layout(cadena):
+    return Layout(cadena)
+
+# QUE: Repite las soluciones de un lote (una por línea) y devuelve un resultado por línea.
+# POR QUE: Acción 'replay -f'. Cada línea es un objeto JSON con el estado "s" y los movimientos en
+#          "moves" (lista o cadena separada por comas) o en "solution", de modo que se puede validar
+#          directamente la salida de batch. La disposición de cada estado inicial se compila una vez.
+def repetir_lote(lineas):
+    indice = 0
+    for linea in lineas:
+        linea = linea.strip()
+        if not linea:
+            continue
+        resultado = {'index': indice}
+        indice += 1
+        try:
+            tarea = json.loads(linea)
+            resultado['index'] = tarea.get('index', resultado['index'])
+            resultado['s'] = tarea['s']
+            acciones = tarea['solution'] if 'solution' in tarea else tarea.get('moves')
+            if not isinstance(acciones, (list, str)):
+                raise ValueError("Se requiere la lista de movimientos en 'moves' o 'solution'")
+            if isinstance(acciones, str):
+                acciones = [a for a in acciones.split(',') if a]
+            resultado.update(repetir(tarea['s'], acciones, _layout(tarea['s'])).como_dict())
+        except Exception as e:
+            resultado['error'] = str(e)
+        yield resultado
@@ -1,14 +1,25 @@
 # rushhour.py
 import argparse
 from movimientos import vehiculo, successors, apply_moves
-from tablero import def_tablero, print_tablero
+from tablero import def_tablero, print_tablero, geometria
+
+# Estrategias de búsqueda disponibles (las que necesitan heurística están en solver.INFORMADAS)
+ESTRATEGIAS = ['BFS', 'DFS', 'UC', 'GBF', 'AStar', 'WAStar', 'Beam', 'BiBFS', 'IDAStar', 'ARAStar', 'HDAStar',
+               'PBFS', 'EBFS']
+
+# Estrategias subóptimas cuya calidad se compara con la solución óptima (--stats --compare-optimal)
+SUBOPTIMAS = ['WAStar', 'Beam']
 
 # QUE: Verifica si la cadena representa un nivel válido y retorna un código de error o 0 si es válido.
 # POR QUE: Para implementar la acción 'verify' que comprueba la validez del nivel según las reglas especificadas.
 def verify(s):
-    # Comprueba longitud y caracteres válidos
-    if len(s) != 36 or not all(c.isupper() or c == 'o' for c in s):
-        return 1 if len(s) != 36 else 2
+    # Comprueba longitud (tablero de 6x6, 7x7 u 8x8) y caracteres válidos
+    try:
+        geo = geometria(s)
+    except ValueError:
+        return 1
+    if not all(c.isupper() or c == 'o' for c in s):
+        return 2
 
     tablero = def_tablero(s)
     posiciones = vehiculo(tablero)
@@ -22,9 +33,10 @@ def verify(s):
     a_rows = {r for r, _ in a_pos}
     a_cols = {c for _, c in a_pos}
 
-    # Debe ser horizontal, estar en fila 2 y ser contiguo
-    if any(r != 2 for r, c in a_pos) or len(a_rows) != 1 or a_cols != set(range(min(a_cols), min(a_cols) + len(a_pos))):
-        return 4 if all(r != 2 for r, _ in a_pos) else 5
+    # Debe ser horizontal, estar en la fila de salida (la 2 en 6x6) y ser contiguo
+    fila = geo.fila_salida
+    if any(r != fila for r, c in a_pos) or len(a_rows) != 1 or a_cols != set(range(min(a_cols), min(a_cols) + len(a_pos))):
+        return 4 if all(r != fila for r, _ in a_pos) else 5
 
     # Validación del resto de vehículos
     for vehiculo_id, pos in posiciones.items():
@@ -60,6 +72,7 @@ def verify(s):
 def question(s, args):
     tablero = def_tablero(s)
     posiciones = vehiculo(tablero)
+    geo = geometria(s)
 
     # Diccionario de acciones disponibles
     actions = {
@@ -67,7 +80,8 @@ def question(s, args):
         'what': lambda: tablero[int(args.what.split(',')[0])][int(args.what.split(',')[1])],
         'size': lambda: len(posiciones.get(args.size, [])),
         'howmany': lambda: len(posiciones),
-        'goal': lambda: 'TRUE' if any(r == 2 and c == 5 for r, c in posiciones.get('A', [])) else 'FALSE',
+        'goal': lambda: 'TRUE' if any(r == geo.fila_salida and c == geo.columna_salida
+                                      for r, c in posiciones.get('A', [])) else 'FALSE',
         'move': lambda: apply_moves(s, args.move.split(',')) if args.move else s
     }
 
@@ -85,7 +99,9 @@ def rushhour():
 
     # Subcomando verify
     verify_parser = subparsers.add_parser('verify')
-    verify_parser.add_argument('-s', required=True)
+    verify_origen = verify_parser.add_mutually_exclusive_group(required=True)
+    verify_origen.add_argument('-s')
+    verify_origen.add_argument('-f', help='Fichero de tableros, uno por línea (- para stdin): un código por línea')
 
     # Subcomando question
     question_parser = subparsers.add_parser('question')
@@ -103,20 +119,103 @@ def rushhour():
     successors_parser = subparsers.add_parser('successors')
     successors_parser.add_argument('-s', required=True)
 
+    # Subcomando replay
+    replay_parser = subparsers.add_parser('replay')
+    replay_origen = replay_parser.add_mutually_exclusive_group(required=True)
+    replay_origen.add_argument('-s', help='Estado inicial (con --moves)')
+    replay_origen.add_argument('-f', help='Fichero de soluciones (un objeto JSON por línea; - para stdin)')
+    replay_parser.add_argument('--moves', default='', help='Movimientos separados por comas (p. ej. A+1,B-2)')
+
+    # Subcomando batch
+    batch_parser = subparsers.add_parser('batch')
+    batch_parser.add_argument('-f', default='-', help='Fichero de puzzles (una cadena o un objeto JSON por línea; - para stdin)')
+    batch_parser.add_argument('--strategy', choices=ESTRATEGIAS, default='BFS')
+    batch_parser.add_argument('--heuristic', type=int, choices=[0,1,2,3,4])
+    batch_parser.add_argument('--depth', type=int)
+    batch_parser.add_argument('--weight', type=float)
+    batch_parser.add_argument('--width', type=int)
+    batch_parser.add_argument('--workers', type=int, help='Número de procesos (por defecto, uno por núcleo)')
+    batch_parser.add_argument('--cache', help='Fichero SQLite de la caché persistente de soluciones')
+    batch_parser.add_argument('--cache-size', type=int, default=100000)
+
+    # Subcomando build-db
+    build_db_parser = subparsers.add_parser('build-db')
+    build_db_parser.add_argument('-s', required=True)
+    build_db_parser.add_argument('-o', required=True, help='Fichero de salida de la base de distancias')
+    build_db_parser.add_argument('--workers', type=int, help='Expande cada capa de la BFS con N procesos')
+
+    # Subcomando generate
+    generate_parser = subparsers.add_parser(
+        'generate', description='Genera puzzles difíciles por muestreo aleatorio sembrado de disposiciones y '
+                                'BFS exhaustiva de los estados de cada una')
+    generate_parser.add_argument('-o', required=True,
+                                 help='Fichero de salida de los puzzles (JSON lines); el progreso se guarda en <o>.progreso')
+    generate_parser.add_argument('--layouts', type=int, required=True, help='Número de disposiciones aleatorias (sembradas) a explorar')
+    generate_parser.add_argument('--size', type=int, choices=[6, 7, 8], default=6, help='Lado del tablero')
+    generate_parser.add_argument('--min-vehicles', type=int, default=8,
+                                 help='Mínimo de vehículos además del coche rojo (por defecto 8)')
+    generate_parser.add_argument('--max-vehicles', type=int, default=13,
+                                 help='Máximo de vehículos además del coche rojo (por defecto 13)')
+    generate_parser.add_argument('--min-moves', type=int, default=1,
+                                 help='Longitud óptima mínima de los puzzles que se guardan')
+    generate_parser.add_argument('--max-states', type=int,
+                                 help='Descarta las disposiciones con más estados resolubles')
+    generate_parser.add_argument('--seed', type=int, default=0, help='Semilla del muestreo de disposiciones')
+    generate_parser.add_argument('--workers', type=int, help='Número de procesos (por defecto, uno por núcleo)')
+
     # Subcomando solver
     solve_parser = subparsers.add_parser('solver')
     solve_parser.add_argument('-s', required=True)
-    solve_parser.add_argument('--strategy', choices=['BFS', 'DFS', 'UC', 'GBF', 'AStar'], required=True)
+    solve_parser.add_argument('--strategy', choices=ESTRATEGIAS)
+    solve_parser.add_argument('--db', help='Base de distancias creada con build-db (resuelve sin búsqueda)')
     solve_parser.add_argument('--depth', type=int)
-    solve_parser.add_argument('--heuristic', type=int, choices=[0,1,2])
-    solve_parser.add_argument('--stats', action='store_true')
+    solve_parser.add_argument('--heuristic', type=int, choices=[0,1,2,3,4])
+    solve_parser.add_argument('--weight', type=float,
+                              help='Peso W de la heurística en WAStar: f = g + W·h (por defecto 2)')
+    solve_parser.add_argument('--width', type=int,
+                              help='Nodos que conserva Beam en cada capa (por defecto 1000)')
+    solve_parser.add_argument('--workers', type=int,
+                              help='Número de procesos de HDAStar y PBFS (por defecto, uno por núcleo)')
+    solve_parser.add_argument('--tmpdir', help='Directorio de los ficheros temporales de EBFS')
+    solve_parser.add_argument('--tt', type=int, default=0,
+                              help='Tamaño máximo de la tabla de transposición de IDAStar (0 = sin tabla)')
+    solve_parser.add_argument('--cache', help='Fichero SQLite de la caché persistente de soluciones')
+    solve_parser.add_argument('--cache-size', type=int, default=100000,
+                              help='Número máximo de estados en la caché (expulsión LRU)')
+    solve_parser.add_argument('--stats', nargs='?', const='text', choices=['text', 'json'],
+                              help='Muestra las estadísticas (--stats=json: una línea JSON)')
+    solve_parser.add_argument('--compare-h2', action='store_true',
+                              help='Con --stats y heurística 3 o 4, repite la búsqueda con la heurística 2 '
+                                   'y muestra sus EN (EN(h2))')
+    solve_parser.add_argument('--compare-optimal', action='store_true',
+                              help='Con --stats en WAStar y Beam, resuelve también con AStar y la heurística 4 '
+                                   'y compara la solución con la óptima (CS, CO, SQ, ET(opt))')
+    solve_parser.add_argument('--profile', action='store_true',
+                              help='Instrumenta la búsqueda: tiempos por fase, tamaños máximos y memoria pico')
+    solve_parser.add_argument('--progress', type=int, metavar='N',
+                              help='Con --profile, muestra el progreso en stderr cada N expansiones')
+    solve_parser.add_argument('--profile-memory', action='store_true',
+                              help='Con --profile, mide la memoria pico con tracemalloc (ralentiza la búsqueda)')
+    solve_parser.add_argument('--max-nodes', type=int, help='Detiene la búsqueda al generar N nodos')
+    solve_parser.add_argument('--max-memory', type=int, metavar='MB',
+                              help='Detiene la búsqueda si la memoria residente supera MB megabytes')
+    solve_parser.add_argument('--timeout', type=float, metavar='S', help='Detiene la búsqueda tras S segundos')
     solve_parser.add_argument('--graphic', action='store_true',
                               help='Muestra una animación gráfica bonita de la solución (requiere Pygame)')
     args = parser.parse_args()
 
     # Ejecuta la acción correspondiente
     if args.action == 'verify':
-        print(verify(args.s))
+        if args.f is not None:
+            import sys
+            from verificacion import verificar_lineas
+
+            entrada = sys.stdin if args.f == '-' else open(args.f, encoding='utf-8')
+            with entrada:
+                for codigo in verificar_lineas(entrada):
+                    sys.stdout.write(f"{codigo}\n")
+        else:
+            print(verify(args.s))
 
     elif args.action == 'question':
         question(args.s, args)
@@ -125,18 +224,170 @@ def rushhour():
         for accion, estado, costo in successors(args.s):
             print(f"[{accion},{estado},{costo}]")
 
+    elif args.action == 'replay':
+        import sys
+        from repeticion import repetir, repetir_lote
+        from lote import formatear
+
+        if args.f is not None:
+            entrada = sys.stdin if args.f == '-' else open(args.f, encoding='utf-8')
+            with entrada:
+                for resultado in repetir_lote(entrada):
+                    print(formatear(resultado), flush=True)
+        else:
+            try:
+                resultado = repetir(args.s, [a for a in args.moves.split(',') if a])
+            except ValueError as e:
+                print(f"Error: {e}")
+                exit(1)
+            print(resultado.estado)
+            print(f"Movimientos: {resultado.aplicados}")
+            print(f"Coste: {resultado.costo}")
+            print(f"Meta: {'TRUE' if resultado.meta else 'FALSE'}")
+            if not resultado.valido:
+                print(f"Movimiento ilegal {resultado.indice}: {resultado.motivo} ({resultado.detalle})")
+                exit(2)
+
+    elif args.action == 'batch':
+        import sys
+        from lote import leer_tareas, resolver_lote, formatear
+
+        por_defecto = {'strategy': args.strategy, 'heuristic': args.heuristic, 'depth': args.depth,
+                       'weight': args.weight, 'width': args.width, 'cache': args.cache, 'cache_size': args.cache_size}
+        entrada = sys.stdin if args.f == '-' else open(args.f, encoding='utf-8')
+        with entrada:
+            tareas = list(leer_tareas(entrada, por_defecto))
+
+        # Cada resultado se emite en cuanto termina, etiquetado con su índice de entrada
+        for resultado in resolver_lote(tareas, args.workers):
+            print(formatear(resultado), flush=True)
+
+    elif args.action == 'build-db':
+        from basedatos import construir_bd
+        estados, maxima = construir_bd(args.s, args.o, args.workers)
+        print(f"Estados: {estados}")
+        print(f"Distancia máxima: {maxima}")
+
+    elif args.action == 'generate':
+        from canonica import LETRAS
+        from generador import generar
+
+        if not 0 <= args.min_vehicles <= args.max_vehicles <= len(LETRAS):
+            print(f"Se requiere 0 <= --min-vehicles <= --max-vehicles <= {len(LETRAS)}")
+            exit(1)
+        if args.workers is not None and args.workers < 1:
+            print("Se requiere al menos un proceso (--workers)")
+            exit(1)
+
+        opciones = {'size': args.size, 'min_vehicles': args.min_vehicles, 'max_vehicles': args.max_vehicles,
+                    'min_moves': args.min_moves, 'max_states': args.max_states, 'seed': args.seed}
+        try:
+            resumen = generar(args.o, args.layouts, opciones, args.workers)
+        except ValueError as e:
+            print(f"Error: {e}")
+            exit(1)
+        print(f"Disposiciones: {resumen['layouts']}")
+        print(f"Descartadas: {resumen['skipped']}")
+        print(f"Puzzles: {resumen['puzzles']}")
+        print(f"Longitud máxima: {resumen['max_moves']}")
+
     elif args.action == 'solver':
-        from solver import buscar
+        from solver import buscar, SIN_LIMITES, INFORMADAS
+
+        # Validación de estrategia (no hace falta si se resuelve con la base de distancias)
+        if args.strategy is None and args.db is None:
+            print("Se requiere --strategy o --db")
+            exit(1)
 
         # Validación de heurística
-        if args.strategy in ['GBF', 'AStar'] and args.heuristic is None:
-            print("Se requiere --heuristic para estrategias GBF y AStar")
+        if args.strategy in INFORMADAS and args.heuristic is None:
+            print("Se requiere --heuristic para estrategias GBF, AStar, WAStar, Beam, IDAStar, ARAStar y HDAStar")
+            exit(1)
+
+        if (args.weight is not None and args.weight <= 0) or (args.width is not None and args.width < 1):
+            print("El peso de WAStar debe ser positivo y la anchura de Beam al menos 1")
+            exit(1)
+        if args.workers is not None and args.workers < 1:
+            print("Se requiere al menos un proceso (--workers)")
             exit(1)
 
+        # Los límites solo se aplican a las búsquedas del proceso principal
+        if args.max_nodes is not None or args.max_memory is not None or args.timeout is not None:
+            if args.db:
+                print("--db no admite --max-nodes, --max-memory ni --timeout (resuelve sin búsqueda)")
+                exit(1)
+            if args.strategy in SIN_LIMITES:
+                print("HDAStar y PBFS no admiten --max-nodes, --max-memory ni --timeout")
+                exit(1)
+
         profundidad_max = args.depth if args.strategy == 'DFS' else None
-        heuristic_type = args.heuristic if args.strategy in ['GBF', 'AStar'] else None
+        heuristic_type = args.heuristic if args.strategy in INFORMADAS else None
+
+        if args.db:
+            from basedatos import BaseDistancias, resolver_con_bd
+            bd = BaseDistancias(args.db)
+            try:
+                camino, stats = resolver_con_bd(args.s, bd)
+            except ValueError as e:
+                print(f"Error: {e}")
+                exit(1)
+            finally:
+                bd.cerrar()
+        else:
+            cache = None
+            if args.cache:
+                from cache import CacheSoluciones
+                cache = CacheSoluciones(args.cache, args.cache_size)
+
+            perfil = None
+            if args.profile:
+                import sys
+                from perfil import Perfil
+
+                def progreso(stats, perfil):
+                    print(f"EN: {stats.en} TN: {stats.tn} MF: {perfil.max_frontera}", file=sys.stderr, flush=True)
 
-        camino, stats = buscar(args.s, args.strategy, profundidad_max, heuristic_type)
+                perfil = Perfil(progreso if args.progress else None, args.progress, args.profile_memory)
+
+            from limites import Limites, SOLUCION, OPTIMA, SIN_SOLUCION
+            limites = None
+            if args.max_nodes is not None or args.max_memory is not None or args.timeout is not None:
+                try:
+                    limites = Limites(args.max_nodes,
+                                      args.max_memory * 2**20 if args.max_memory is not None else None,
+                                      args.timeout)
+                except ValueError as e:
+                    print(f"Error: {e}")
+                    exit(1)
+
+            # ARAStar: cada solución mejorada se muestra en stderr según se encuentra
+            # (la cota solo se conoce con las heurísticas admisibles)
+            def mejora(camino, stats, peso, cota):
+                import sys
+                texto_cota = f", cota {round(cota, 4)}" if cota is not None else ""
+                print(f"Solución: coste {camino[-1].costo}, {len(camino) - 1} movimientos, "
+                      f"peso {peso}{texto_cota}, {stats.tiempo} us", file=sys.stderr, flush=True)
+
+            camino, stats = buscar(args.s, args.strategy, profundidad_max, heuristic_type, args.tt, cache, perfil,
+                                   limites, mejora, args.weight, args.width, args.workers, args.tmpdir)
+
+            # Con --compare-h2 y las heurísticas admisibles (3 y 4) se mide el ahorro frente a la heurística 2
+            # (con los mismos límites; si alguna de las dos búsquedas se interrumpe la comparación no tiene
+            # sentido). Es opcional porque repite la búsqueda entera
+            if args.stats and args.compare_h2 and heuristic_type in (3, 4) and stats.motivo in (None, SOLUCION, OPTIMA, SIN_SOLUCION):
+                _, referencia = buscar(args.s, args.strategy, profundidad_max, 2, args.tt, limites=limites,
+                                       peso=args.weight, anchura=args.width, procesos=args.workers)
+                if referencia.motivo in (None, SOLUCION, OPTIMA, SIN_SOLUCION):
+                    stats.en_referencia = referencia.en
+
+            # Con --compare-optimal las soluciones subóptimas se comparan con la óptima (A* con la
+            # heurística admisible 4). Es opcional porque la búsqueda óptima cuesta mucho más
+            if args.stats and args.compare_optimal and args.strategy in SUBOPTIMAS and stats.motivo in (None, SOLUCION, SIN_SOLUCION):
+                optima, referencia = buscar(args.s, 'AStar', None, 4, limites=limites)
+                if optima:
+                    stats.costo = camino[-1].costo if camino else None
+                    stats.costo_optimo = optima[-1].costo
+                    stats.tiempo_optimo = referencia.tiempo
 
         if camino:
 
@@ -144,7 +395,7 @@ def rushhour():
                 print(nodo)
 
             if args.stats:
-                print(stats)
+                mostrar_estadisticas(stats, args.stats)
 
             # Visualización gráfica 
             if args.graphic:
@@ -167,7 +418,16 @@ def rushhour():
         else:
             print("Sin solución")
             if args.stats:
-                print(stats)
+                mostrar_estadisticas(stats, args.stats)
+
+# QUE: Muestra las estadísticas en texto o como una línea JSON.
+# POR QUE: El formato JSON ('--stats=json') es fácil de procesar desde otros programas.
+def mostrar_estadisticas(stats, formato):
+    if formato == 'json':
+        import json
+        print(json.dumps(stats.como_dict()))
+    else:
+        print(stats)
 
 # Punto de entrada del programa
 if __name__ == '__main__':
@@ -1,8 +1,21 @@
 # solver.py
 import time
-from nodo import Nodo
-from frontera import Frontera
-from estado import Estado
+from nodo import Nodo, AlmacenNodos
+from frontera import nueva_frontera
+from estado import Estado, DisposicionCadena
+from bitboard import Layout
+from limites import LimiteAlcanzado, SOLUCION, SIN_SOLUCION
+
+# Peso por defecto de la heurística en WAStar y anchura por defecto del haz en Beam
+PESO = 2
+ANCHURA = 1000
+
+# Estrategias que no admiten límites: sus nodos se generan en otros procesos, fuera de la vista de
+# limites.Limites (la memoria y los nodos que mide son los del proceso principal)
+SIN_LIMITES = ('HDAStar', 'PBFS')
+
+# Estrategias que necesitan heurística
+INFORMADAS = ('GBF', 'AStar', 'WAStar', 'Beam', 'IDAStar', 'ARAStar', 'HDAStar')
 
 # QUE: Clase auxiliar para recopilar y mostrar estadísticas del proceso de búsqueda.
 # POR QUE: Permite medir el rendimiento del algoritmo.
@@ -23,6 +36,40 @@ class Estadisticas:
         # DF: Profundidad máxima alcanzada
         self.df = 0
 
+        # IT: Iteraciones (solo estrategias iterativas, p. ej. IDAStar o ARAStar)
+        self.iteraciones = None
+
+        # DD: Sucesores repetidos descartados al generarse (sin crear nodo ni entrar en la frontera)
+        self.duplicados = None
+
+        # Aciertos y fallos acumulados de la caché de soluciones (solo si se usa caché)
+        self.aciertos_cache = None
+        self.fallos_cache = None
+
+        # SB: Cota de suboptimalidad demostrada de la solución (coste / coste óptimo <= SB), si se conoce
+        self.cota = None
+
+        # RC: Motivo de terminación (limites.SOLUCION, MAX_NODOS, TIMEOUT...); solo con límites o anytime
+        self.motivo = None
+
+        # Perfil de la búsqueda (perfil.Perfil) si se ha pedido instrumentación
+        self.perfil = None
+
+        # EN de la misma búsqueda con la heurística 2 (para medir el ahorro de las heurísticas 3 y 4)
+        self.en_referencia = None
+
+        # Calidad de una solución subóptima (WAStar, Beam): su coste (CS), el coste óptimo (CO) y el
+        # tiempo de la búsqueda óptima de referencia en microsegundos (ET(opt))
+        self.costo = None
+        self.costo_optimo = None
+        self.tiempo_optimo = None
+
+    # SQ: Coste de la solución respecto al óptimo (1 = óptima; None sin solución)
+    def calidad(self):
+        if self.costo is None or not self.costo_optimo:
+            return None
+        return round(self.costo / self.costo_optimo, 4)
+
     # Incrementa el contador de nodos generados
     def generar(self):
         self.tn += 1
@@ -35,15 +82,152 @@ class Estadisticas:
     def podar(self):
         self.cn += 1
 
+    # Incrementa el contador de sucesores repetidos descartados al generarse
+    def descartar_duplicado(self):
+        self.duplicados += 1
+
+    # Estadísticas como diccionario (mismas etiquetas que la representación textual)
+    def como_dict(self):
+        datos = {'ET': self.tiempo, 'TN': self.tn, 'EN': self.en, 'CN': self.cn, 'DF': self.df}
+        if self.iteraciones is not None:
+            datos['IT'] = self.iteraciones
+        if self.duplicados is not None:
+            datos['DD'] = self.duplicados
+        if self.en_referencia is not None:
+            datos['EN(h2)'] = self.en_referencia
+        if self.aciertos_cache is not None:
+            datos['CH'] = self.aciertos_cache
+            datos['CM'] = self.fallos_cache
+        if self.costo_optimo is not None:
+            datos['CS'] = self.costo
+            datos['CO'] = self.costo_optimo
+            datos['SQ'] = self.calidad()
+            datos['ET(opt)'] = self.tiempo_optimo
+        if self.cota is not None:
+            datos['SB'] = round(self.cota, 4)
+        if self.motivo is not None:
+            datos['RC'] = self.motivo
+        if self.perfil is not None:
+            datos.update(self.perfil.como_dict(self))
+        return datos
+
     # Representación textual de las estadísticas
     def __str__(self):
-        return f"ET: {self.tiempo}\nTN: {self.tn}\nEN: {self.en}\nCN: {self.cn}\nDF: {self.df}"
+        texto = f"ET: {self.tiempo}\nTN: {self.tn}\nEN: {self.en}\nCN: {self.cn}\nDF: {self.df}"
+        if self.iteraciones is not None:
+            texto += f"\nIT: {self.iteraciones}"
+        if self.duplicados is not None:
+            texto += f"\nDD: {self.duplicados}"
+        if self.en_referencia is not None:
+            texto += f"\nEN(h2): {self.en_referencia}\nEN ahorrados: {self.en_referencia - self.en}"
+        if self.aciertos_cache is not None:
+            texto += f"\nCH: {self.aciertos_cache}\nCM: {self.fallos_cache}"
+        if self.costo_optimo is not None:
+            texto += (f"\nCS: {self.costo}\nCO: {self.costo_optimo}\nSQ: {self.calidad()}"
+                      f"\nET(opt): {self.tiempo_optimo}")
+        if self.cota is not None:
+            texto += f"\nSB: {round(self.cota, 4)}"
+        if self.motivo is not None:
+            texto += f"\nRC: {self.motivo}"
+        if self.perfil is not None:
+            texto += "\n" + self.perfil.texto(self)
+        return texto
+
+# QUE: Construye el camino de nodos de una secuencia de estados (vectores de offsets) desde el inicial.
+# POR QUE: Las búsquedas que solo guardan el predecesor de cada estado (PBFS, EBFS) recuperan la
+#          acción y su coste entre los sucesores del predecesor. El valor es la profundidad, como en BFS.
+#          ids es el identificador que cada estado tiene en su búsqueda (uno por estado).
+def camino_por_estados(layout, estados, ids):
+    actual = Nodo(Estado.desde_offsets(layout, estados[0]), id=ids[0])
+    for padre, estado, ident in zip(estados, estados[1:], ids[1:]):
+        accion, coste = next((a, c) for a, hijo, c in layout.sucesores(padre) if hijo == estado)
+        actual = Nodo(
+            Estado.desde_offsets(layout, estado),
+            padre=actual,
+            accion=accion,
+            costo=actual.costo + coste,
+            profundidad=actual.profundidad + 1,
+            valor=actual.profundidad + 1,
+            id=ident
+        )
+    return actual.camino()
 
 # QUE: Función principal que ejecuta la búsqueda en espacio de estados según la estrategia indicada.
-# POR QUE: Es el núcleo del solucionador del puzzle Rush Hour.
-def buscar(inicio_cadena, estrategia, profundidad_max=None, heuristic_type=None):
+# POR QUE: Es el núcleo del solucionador del puzzle Rush Hour. Si se pasa una caché de soluciones
+#          (cache.CacheSoluciones) se consulta antes de buscar y se actualiza con el resultado. Si se
+#          pasa un perfil (perfil.Perfil) se instrumenta la búsqueda y queda en stats.perfil. Con
+#          límites (limites.Limites) la búsqueda se detiene al superarlos y stats.motivo indica por qué.
+#          La estrategia anytime ARAStar comunica cada solución mejorada a al_mejorar. WAStar usa
+#          f = g + peso·h y Beam conserva en cada capa los 'anchura' mejores nodos por heurística.
+#          HDAStar y PBFS reparten la búsqueda entre 'procesos' procesos (por defecto, uno por núcleo).
+#          EBFS guarda las capas en ficheros temporales dentro de 'directorio'.
+def buscar(inicio_cadena, estrategia, profundidad_max=None, heuristic_type=None, tamano_tabla=0, cache=None,
+           perfil=None, limites=None, al_mejorar=None, peso=None, anchura=None, procesos=None, directorio=None):
+    if limites is not None and estrategia in SIN_LIMITES:
+        raise ValueError(f"{estrategia} no admite límites de nodos, memoria o tiempo")
+    if perfil is not None:
+        perfil.iniciar()
+    if limites is not None:
+        limites.iniciar()
+
+    try:
+        if cache is None or not cache.admite(estrategia, heuristic_type):
+            camino, stats = _buscar(inicio_cadena, estrategia, profundidad_max, heuristic_type, tamano_tabla,
+                                    perfil, limites, al_mejorar, peso, anchura, procesos, directorio)
+        else:
+            camino, stats = _buscar_con_cache(inicio_cadena, estrategia, profundidad_max, heuristic_type,
+                                              tamano_tabla, cache, perfil, limites)
+    except LimiteAlcanzado as e:
+        camino, stats = None, e.stats
+
+    if limites is not None and stats.motivo is None:
+        stats.motivo = SOLUCION if camino else SIN_SOLUCION
+
+    if perfil is not None:
+        perfil.terminar(stats)
+    return camino, stats
+
+# QUE: Búsqueda que consulta antes la caché de soluciones y la actualiza con el resultado.
+# POR QUE: Un acierto evita la búsqueda; las estadísticas acumulan aciertos y fallos de la caché.
+def _buscar_con_cache(inicio_cadena, estrategia, profundidad_max, heuristic_type, tamano_tabla, cache, perfil,
+                      limites):
+    from cache import reconstruir_camino
+
+    t0 = time.perf_counter_ns()
+    acciones = cache.consultar(inicio_cadena, estrategia, heuristic_type)
+    if acciones is not None:
+        try:
+            layout = Layout(inicio_cadena)
+        except ValueError:
+            layout = None
+        inicio = Estado(inicio_cadena, layout=layout)
+        camino = reconstruir_camino(inicio, acciones, estrategia, heuristic_type)
+        stats = Estadisticas()
+        stats.df = len(acciones)
+    else:
+        camino, stats = _buscar(inicio_cadena, estrategia, profundidad_max, heuristic_type, tamano_tabla,
+                                perfil, limites)
+        if camino:
+            cache.guardar(camino, estrategia, heuristic_type)
+
+    stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+    stats.aciertos_cache = cache.aciertos
+    stats.fallos_cache = cache.fallos
+    return camino, stats
+
+# QUE: Búsqueda en espacio de estados sin caché.
+# POR QUE: Implementa cada una de las estrategias sobre la disposición compilada del puzzle.
+def _buscar(inicio_cadena, estrategia, profundidad_max=None, heuristic_type=None, tamano_tabla=0, perfil=None,
+            limites=None, al_mejorar=None, peso=None, anchura=None, procesos=None, directorio=None):
+    # Compila la disposición de vehículos una sola vez (carriles, longitudes y tablas de movimiento).
+    # Cada nodo guarda solo el vector de offsets; si el tablero no es válido se usa la cadena.
+    try:
+        layout = Layout(inicio_cadena)
+    except ValueError:
+        layout = None
+
     # Crea el estado inicial a partir de la cadena
-    inicio = Estado(inicio_cadena)
+    inicio = Estado(inicio_cadena, layout=layout)
 
     # Caso especial: el estado inicial ya es meta
     if inicio.es_meta():
@@ -53,28 +237,79 @@ def buscar(inicio_cadena, estrategia, profundidad_max=None, heuristic_type=None)
         stats.df = 0
         return raiz.camino(), stats
 
+    # Búsqueda bidireccional: estrategia independiente con su propio bucle
+    if estrategia == "BiBFS":
+        from bidireccional import buscar_bidireccional
+        return buscar_bidireccional(inicio, limites)
+
+    # IDA*: profundización iterativa con memoria proporcional a la profundidad
+    if estrategia == "IDAStar":
+        from idastar import buscar_idastar
+        return buscar_idastar(inicio, heuristic_type, tamano_tabla, limites)
+
+    # ARA*: búsqueda anytime que mejora la solución reduciendo el peso de la heurística
+    if estrategia == "ARAStar":
+        from anytime import buscar_anytime
+        return buscar_anytime(inicio, heuristic_type, al_mejorar=al_mejorar, limites=limites)
+
+    # HDA*: A* distribuido por hash entre varios procesos
+    if estrategia == "HDAStar":
+        from paralelo import buscar_hda
+        return buscar_hda(inicio, heuristic_type, procesos)
+
+    # BFS síncrona por capas repartida entre varios procesos
+    if estrategia == "PBFS":
+        from paralelo import buscar_bfs_paralela
+        return buscar_bfs_paralela(inicio, procesos)
+
+    # BFS en memoria externa: capas, visitados y predecesores en disco
+    if estrategia == "EBFS":
+        from externa import buscar_externa
+        return buscar_externa(inicio, directorio, limites)
+
+    # Disposición sobre la que se expande: Layout (vectores de offsets) o cadenas si no compila
+    disposicion = layout if layout is not None else DisposicionCadena()
+    informada = estrategia in ["GBF", "AStar", "WAStar", "Beam"]
+
+    # Peso y anchura por defecto si no se indican. Con un peso entero los valores siguen siendo
+    # enteros y WAStar usa la cola de cubetas
+    peso = PESO if peso is None else peso
+    anchura = ANCHURA if anchura is None else anchura
+    if peso <= 0 or anchura < 1:
+        raise ValueError("El peso de WAStar debe ser positivo y la anchura de Beam al menos 1")
+    if estrategia == "WAStar" and peso == int(peso):
+        peso = int(peso)
+
     # Cálculo inicial de heurística si la estrategia lo requiere
     h_inicial = 0
-    if estrategia in ["GBF", "AStar"]:
+    if informada:
         h_inicial = inicio.heuristica(heuristic_type)
 
     # Valor inicial del nodo según la estrategia
     valor_inicial = h_inicial
 
+    # Almacén compacto de nodos: los IDs son índices consecutivos desde 0 en cada búsqueda
+    almacen = AlmacenNodos(len(layout.vehiculos) if layout is not None else None)
+
     # Nodo raíz del árbol de búsqueda
-    raiz = Nodo(
-        inicio,
-        profundidad=0,
-        heuristica=h_inicial,
-        valor=valor_inicial
-    )
-
-    # Inicializa la frontera (cola de prioridad)
-    frontera = Frontera(estrategia)
-    frontera.insertar(raiz)
-
-    # Conjunto de estados visitados (para BFS, UC, GBF, A*)
-    visitados = set()
+    raiz = almacen.nuevo(inicio.clave, -1, '___', 0, 0, h_inicial, valor_inicial)
+
+    # Inicializa la frontera especializada para la estrategia
+    frontera = nueva_frontera(estrategia, anchura)
+    frontera.insertar(raiz, valor_inicial)
+
+    # Índice de estados abiertos y cerrados con el mejor costo g conocido (BFS, UC, GBF, A*).
+    # Los repetidos se descartan al generarse: en BFS y GBF cualquier repetido; en UC y A* solo
+    # si no mejoran el costo. Si lo mejoran se insertan de nuevo (reapertura si ya estaba cerrado)
+    # y la entrada antigua queda obsoleta en la frontera (borrado perezoso). WAStar reabre como A*,
+    # lo que mantiene la cota coste <= peso · óptimo; Beam descarta cualquier repetido como BFS.
+    mejor_costo = {inicio.clave: 0}
+    mejora_costo = estrategia in ["UC", "AStar", "WAStar"]
+
+    # En BFS la meta se comprueba al generar: el primer estado meta generado es el primero que se
+    # extraería, así que la solución es la misma sin expandir la última capa. En el resto de
+    # estrategias el orden de extracción no es el de generación y se comprueba al extraer.
+    meta_al_generar = estrategia == "BFS"
     
     # Diccionario de mejor profundidad alcanzada por estado (usado en DFS)
     mejor_profundidad = {}
@@ -82,6 +317,36 @@ def buscar(inicio_cadena, estrategia, profundidad_max=None, heuristic_type=None)
     # Inicializa estadísticas
     stats = Estadisticas()
     stats.generar()
+    if estrategia != "DFS":
+        stats.duplicados = 0
+
+    # Convierte un estado del almacén en el Estado que se imprime en el camino solución
+    if layout is not None:
+        crear_estado = lambda offsets: Estado.desde_offsets(layout, offsets)
+    else:
+        crear_estado = Estado
+
+    # Operaciones del bucle como variables locales; con perfil se sustituyen por versiones
+    # cronometradas y sin él el bucle no paga nada por la instrumentación
+    movimientos = disposicion.movimientos
+    heuristica_hijo = disposicion.heuristica_incremental
+    es_meta = disposicion.es_meta
+    insertar = frontera.insertar
+    extraer = frontera.extraer
+    costo_previo = mejor_costo.get
+    profundidad_previa = mejor_profundidad.get
+    expandir = stats.expandir
+    if limites is not None:
+        expandir = limites.envolver_expandir(stats, expandir)
+    if perfil is not None:
+        movimientos = perfil.envolver('sucesores', movimientos, lista=True)
+        heuristica_hijo = perfil.envolver('heuristica', heuristica_hijo)
+        es_meta = perfil.envolver('meta', es_meta)
+        insertar = perfil.envolver('frontera', insertar)
+        extraer = perfil.envolver_extraer(frontera)
+        costo_previo = perfil.envolver('duplicados', costo_previo)
+        profundidad_previa = perfil.envolver('duplicados', profundidad_previa)
+        expandir = perfil.envolver_expandir(stats, expandir)
 
     # Marca el inicio del tiempo de ejecución
     t0 = time.perf_counter_ns()
@@ -89,55 +354,73 @@ def buscar(inicio_cadena, estrategia, profundidad_max=None, heuristic_type=None)
     # Bucle principal de búsqueda
     while not frontera.vacia():
         # Extrae el siguiente nodo según la estrategia
-        actual = frontera.extraer()
+        actual = extraer()
+
+        # Clave única del estado (vector de offsets o cadena del tablero)
+        clave = almacen.estado(actual)
+        profundidad = almacen.profundidad[actual]
+        costo = almacen.costo[actual]
 
         # Comprueba si se ha alcanzado la meta
-        if actual.estado.es_meta():
+        if es_meta(clave):
             t1 = time.perf_counter_ns()
             stats.tiempo = (t1 - t0) // 1000
-            stats.df = max(stats.df, actual.profundidad)
-            return actual.camino(), stats
+            stats.df = max(stats.df, profundidad)
+            if perfil is not None:
+                perfil.max_visitados = len(mejor_profundidad if estrategia == "DFS" else mejor_costo)
+            if estrategia == "Beam":
+                stats.cn += frontera.descartados
 
-        # Clave única del estado (cadena del tablero)
-        clave = actual.estado.cadena
+            # Con una heurística admisible WAStar garantiza coste <= peso · coste óptimo
+            if estrategia == "WAStar" and heuristic_type in (3, 4):
+                stats.cota = peso
+            return almacen.camino(actual, crear_estado), stats
 
         # Gestión de estados repetidos
         if estrategia == "DFS":
             # En DFS se permite revisitar estados si se alcanza menor profundidad
-            if clave in mejor_profundidad and mejor_profundidad[clave] <= actual.profundidad:
-                stats.podar()
-                continue
-            mejor_profundidad[clave] = actual.profundidad
-        else:
-            # En el resto de estrategias no se permiten estados repetidos
-            if clave in visitados:
+            anterior = profundidad_previa(clave)
+            if anterior is not None and anterior <= profundidad:
                 stats.podar()
                 continue
-            visitados.add(clave)
+            mejor_profundidad[clave] = profundidad
+        elif mejora_costo and costo > mejor_costo[clave]:
+            # Entrada obsoleta: el estado se insertó después con menor costo
+            stats.podar()
+            continue
 
         # Comprobación del límite de profundidad (solo relevante para DFS)
-        if profundidad_max is not None and actual.profundidad >= profundidad_max:
+        if profundidad_max is not None and profundidad >= profundidad_max:
             stats.podar()
             continue
 
         # Marca el nodo como expandido
-        stats.expandir()
-        stats.df = max(stats.df, actual.profundidad)
+        expandir()
+        stats.df = max(stats.df, profundidad)
 
         # Genera los sucesores del estado actual
-        for accion, nueva_cadena, coste_accion in actual.estado.successors():
-            nueva_prof = actual.profundidad + 1
+        h_actual = almacen.heuristica[actual]
+        for accion, nuevo_estado, coste_accion, movido in movimientos(clave):
+            nueva_prof = profundidad + 1
 
             # Poda por límite de profundidad
             if profundidad_max is not None and nueva_prof > profundidad_max:
                 stats.podar()
                 continue
 
-            # Cálculo de heurística del sucesor si procede
+            # Detección de repetidos en la generación
+            if estrategia != "DFS":
+                nuevo_costo = costo + coste_accion
+                anterior = costo_previo(nuevo_estado)
+                if anterior is not None and (not mejora_costo or anterior <= nuevo_costo):
+                    stats.descartar_duplicado()
+                    continue
+                mejor_costo[nuevo_estado] = nuevo_costo
+
+            # Cálculo de heurística del sucesor si procede (a partir de la del padre y el vehículo movido)
             h = 0
-            if estrategia in ["GBF", "AStar"]:
-                nuevo_estado_temp = Estado(nueva_cadena)
-                h = nuevo_estado_temp.heuristica(heuristic_type)
+            if informada:
+                h = heuristica_hijo(h_actual, clave, nuevo_estado, movido, heuristic_type)
 
             # Cálculo del valor según la estrategia seleccionada
             if estrategia == "DFS":
@@ -145,31 +428,37 @@ def buscar(inicio_cadena, estrategia, profundidad_max=None, heuristic_type=None)
             elif estrategia == "BFS":
                 valor = nueva_prof
             elif estrategia == "UC":
-                valor = actual.costo + coste_accion
+                valor = costo + coste_accion
             elif estrategia == "GBF":
                 valor = h
             elif estrategia == "AStar":
-                valor = actual.costo + coste_accion + h
-
-            # Crea el nuevo estado y nodo hijo
-            nuevo_estado = Estado(nueva_cadena)
+                valor = costo + coste_accion + h
+            elif estrategia == "WAStar":
+                valor = costo + coste_accion + peso * h
+            elif estrategia == "Beam":
+                valor = h
 
-            hijo = Nodo(
-                estado=nuevo_estado,
-                padre=actual,
-                accion=accion,
-                costo=actual.costo + coste_accion,
-                profundidad=nueva_prof,
-                heuristica=h,
-                valor=valor
-            )
+            # Añade el nodo hijo al almacén
+            hijo = almacen.nuevo(nuevo_estado, actual, accion, costo + coste_accion, nueva_prof, h, valor)
 
             # Actualiza estadísticas y añade a la frontera
             stats.generar()
             stats.df = max(stats.df, nueva_prof)
-            frontera.insertar(hijo)
+
+            # Comprobación temprana de meta (solo BFS)
+            if meta_al_generar and es_meta(nuevo_estado):
+                stats.tiempo = (time.perf_counter_ns() - t0) // 1000
+                if perfil is not None:
+                    perfil.max_visitados = len(mejor_costo)
+                return almacen.camino(hijo, crear_estado), stats
+
+            insertar(hijo, valor)
 
     # Si no se encuentra solución
     t1 = time.perf_counter_ns()
     stats.tiempo = (t1 - t0) // 1000
+    if perfil is not None:
+        perfil.max_visitados = len(mejor_profundidad if estrategia == "DFS" else mejor_costo)
+    if estrategia == "Beam":
+        stats.cn += frontera.descartados
     return None, stats
@@ -1,23 +1,66 @@
 # tablero.py
+from collections import namedtuple
 
-# QUE: Convierte una cadena de 36 caracteres en un tablero de 6x6.
+# Lado máximo del tablero: con 8x8 cada casilla sigue cabiendo en un bit de una palabra de 64 bits
+LADO_MAXIMO = 8
+
+# QUE: Dimensiones del tablero y fila de la salida (la salida está siempre en la última columna).
+# POR QUE: Los tableros de 6x6, 7x7 y 8x8 comparten todo el código; solo cambian estos tres números.
+class Geometria(namedtuple('Geometria', ('filas', 'columnas', 'fila_salida'))):
+    __slots__ = ()
+
+    # Número total de casillas (longitud de la cadena del estado)
+    @property
+    def casillas(self):
+        return self.filas * self.columnas
+
+    # Columna de la salida (la última)
+    @property
+    def columna_salida(self):
+        return self.columnas - 1
+
+    # Índice de la casilla de salida dentro de la cadena
+    @property
+    def casilla_meta(self):
+        return self.fila_salida * self.columnas + self.columna_salida
+
+# Tablero clásico: 6x6 con la salida en la fila 2
+CLASICO = Geometria(6, 6, 2)
+
+# QUE: Deduce la geometría de un tablero cuadrado a partir de la longitud de su cadena.
+# POR QUE: La cadena no lleva las dimensiones: 36, 49 y 64 caracteres son 6x6, 7x7 y 8x8. Por
+#          defecto la salida está en la fila central superior ((lado - 1) // 2, la fila 2 en 6x6).
+def geometria(cadena, fila_salida=None):
+    lado = round(len(cadena) ** 0.5)
+    if lado * lado != len(cadena) or not CLASICO.filas <= lado <= LADO_MAXIMO:
+        raise ValueError("El estado debe tener 36, 49 o 64 caracteres")
+    if fila_salida is None:
+        fila_salida = (lado - 1) // 2
+    elif not 0 <= fila_salida < lado:
+        raise ValueError(f"La fila de salida debe estar entre 0 y {lado - 1}")
+    return Geometria(lado, lado, fila_salida)
+
+# QUE: Convierte una cadena de 36, 49 o 64 caracteres en un tablero de 6x6, 7x7 u 8x8.
 # POR QUE: Para facilitar el acceso y la manipulación de las posiciones en la cuadricula del juego.
 def def_tablero(s):
     tablero = []
-    
-    # Divide la cadena en filas consecutivas de 6 caracteres
-    for i in range(6):
-        fila = list(s[i * 6:(i + 1) * 6])
+    geo = geometria(s)
+
+    # Divide la cadena en filas consecutivas de 'columnas' caracteres
+    for i in range(geo.filas):
+        fila = list(s[i * geo.columnas:(i + 1) * geo.columnas])
         tablero.append(fila)
-    
+
     return tablero
 
 # QUE: Imprime una representación del tablero.
-# POR QUE: Funcionalidad adicional para visualizar la solución paso a paso 
+# POR QUE: Funcionalidad adicional para visualizar la solución paso a paso
 def print_tablero(cadena):
-    # Recorre las filas del tablero 
-    for i in range(6):
-        print(' '.join(cadena[i*6:(i+1)*6]))
-    
+    geo = geometria(cadena)
+
+    # Recorre las filas del tablero
+    for i in range(geo.filas):
+        print(' '.join(cadena[i*geo.columnas:(i+1)*geo.columnas]))
+
     # Línea separadora para mejorar la claridad visual
-    print('-' * 12)
+    print('-' * (2 * geo.columnas))
@@ -0,0 +1,134 @@
+# verificacion.py
+from tablero import geometria
+
+# NumPy es opcional: sin él se verifica línea a línea con rushhour.verify
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Tableros que se verifican juntos en cada bloque vectorizado
+BLOQUE = 1 << 16
+
+# Letras de los vehículos (códigos ASCII) y de la casilla vacía
+LETRAS = np.arange(ord('A'), ord('Z') + 1, dtype=np.uint8) if np is not None else None
+VACIA = ord('o')
+ROJO = ord('A')
+
+# QUE: Verifica un bloque de tableros de la misma longitud con operaciones vectorizadas de NumPy.
+# POR QUE: Mismas reglas y mismo orden de comprobación que rushhour.verify, pero cada regla se evalúa
+#          a la vez sobre todos los tableros del bloque (matriz tableros x casillas) en lugar de
+#          casilla a casilla: caracteres válidos (2), coche rojo presente (3), en la fila de salida,
+#          horizontal y contiguo (4 y 5) y, para cada vehículo en orden de primera aparición, tamaño
+#          (6) y forma recta y contigua (7). Devuelve un array con el código de cada tablero.
+def _verificar_bloque(cadenas, geo):
+    n = len(cadenas)
+    filas, columnas = geo.filas, geo.columnas
+    tableros = np.frombuffer(''.join(cadenas).encode('ascii'), dtype=np.uint8).reshape(n, geo.casillas)
+    codigos = np.zeros(n, dtype=np.uint8)
+
+    # Matriz casillas x (1 + filas + columnas): multiplicar por ella la máscara de casillas de un
+    # vehículo da en una sola operación su tamaño y cuántas casillas ocupa en cada fila y columna
+    proyeccion = np.zeros((geo.casillas, 1 + filas + columnas), dtype=np.float32)
+    for idx in range(geo.casillas):
+        proyeccion[idx, 0] = 1
+        proyeccion[idx, 1 + idx // columnas] = 1
+        proyeccion[idx, 1 + filas + idx % columnas] = 1
+
+    # 2: caracteres distintos de mayúsculas y 'o'
+    validos = ((tableros >= LETRAS[0]) & (tableros <= LETRAS[-1])) | (tableros == VACIA)
+    invalidos = ~validos.all(axis=1)
+    codigos[invalidos] = 2
+
+    # Para cada vehículo y tablero: (letras x tableros x casillas) sería demasiado grande, así que
+    # se recorren las 26 letras y se guarda por letra su código de error y su primera aparición
+    error_vehiculo = np.zeros(n, dtype=np.uint8)
+    primera_error = np.full(n, geo.casillas, dtype=np.int64)
+    for letra in LETRAS:
+        celdas = tableros == letra
+        cuentas = celdas.astype(np.float32) @ proyeccion
+        tamano = cuentas[:, 0]
+        presente = tamano > 0
+        # Las letras ausentes de todo el bloque no aportan nada (salvo 'A': su ausencia es el código 3)
+        if letra != ROJO and not presente.any():
+            continue
+        en_fila = cuentas[:, 1:1 + filas] > 0
+        en_columna = cuentas[:, 1 + filas:] > 0
+        horizontal = np.count_nonzero(en_fila, axis=1) == 1
+        vertical = np.count_nonzero(en_columna, axis=1) == 1
+
+        # Extensión (primera y última columna/fila ocupada) para la contigüidad
+        primera_col = en_columna.argmax(axis=1)
+        ultima_col = columnas - 1 - en_columna[:, ::-1].argmax(axis=1)
+        primera_fila = en_fila.argmax(axis=1)
+        ultima_fila = filas - 1 - en_fila[:, ::-1].argmax(axis=1)
+        contigua_h = ultima_col - primera_col + 1 == tamano
+        contigua_v = ultima_fila - primera_fila + 1 == tamano
+
+        if letra == ROJO:
+            # 3: sin coche rojo; 4: fuera de la fila de salida; 5: en ella pero mal colocado
+            pendientes = codigos == 0
+            codigos[pendientes & ~presente] = 3
+            en_salida = en_fila[:, geo.fila_salida]
+            mal = ~(horizontal & en_salida) | ~contigua_h
+            codigos[pendientes & presente & mal & ~en_salida] = 4
+            codigos[pendientes & presente & mal & en_salida] = 5
+
+        recto = horizontal | vertical
+        codigo = np.where(((tamano < 2) | (tamano > 3)) & recto, 6,
+                          np.where(~recto | (horizontal & ~contigua_h) | (vertical & ~contigua_v), 7, 0))
+        codigo[~presente] = 0
+
+        # Cuenta el error del vehículo que aparece antes en el tablero (como el bucle de verify)
+        primera = celdas.argmax(axis=1)
+        antes = (codigo > 0) & (primera < primera_error)
+        error_vehiculo[antes] = codigo[antes]
+        primera_error[antes] = primera[antes]
+
+    pendientes = codigos == 0
+    codigos[pendientes] = error_vehiculo[pendientes]
+    return codigos
+
+# QUE: Verifica muchos tableros y devuelve sus códigos (0 a 7) en el mismo orden.
+# POR QUE: Verificación masiva (acción 'verify -f'). Los tableros se agrupan por longitud (6x6, 7x7 u
+#          8x8) en bloques de BLOQUE y cada bloque se verifica vectorizado. Las longitudes no válidas
+#          dan 1 directamente; los tableros con caracteres no ASCII (y todos si NumPy no está
+#          instalado) se verifican con rushhour.verify.
+def verificar_lote(cadenas):
+    from rushhour import verify
+
+    if np is None:
+        return [verify(s) for s in cadenas]
+
+    codigos = [0] * len(cadenas)
+    grupos = {}
+    for k, s in enumerate(cadenas):
+        if not s.isascii():
+            codigos[k] = verify(s)
+        else:
+            grupos.setdefault(len(s), []).append(k)
+
+    for longitud, indices in grupos.items():
+        try:
+            geo = geometria('o' * longitud)
+        except ValueError:
+            for k in indices:
+                codigos[k] = 1
+            continue
+        for inicio in range(0, len(indices), BLOQUE):
+            bloque = indices[inicio:inicio + BLOQUE]
+            for k, codigo in zip(bloque, _verificar_bloque([cadenas[k] for k in bloque], geo).tolist()):
+                codigos[k] = codigo
+    return codigos
+
+# QUE: Verifica las líneas de un fichero por bloques y genera el código de cada una.
+# POR QUE: La memoria no depende del tamaño del fichero: se leen BLOQUE líneas cada vez.
+def verificar_lineas(lineas):
+    bloque = []
+    for linea in lineas:
+        bloque.append(linea.rstrip('\r\n'))
+        if len(bloque) >= BLOQUE:
+            yield from verificar_lote(bloque)
+            bloque = []
+    if bloque:
+        yield from verificar_lote(bloque)
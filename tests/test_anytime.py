@@ -0,0 +1,48 @@
+# test_anytime.py
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from limites import Limites, OPTIMA
+from solver import buscar
+
+PUZZLE = 'HBBCCCHDDKoMAAJKoMEEJFFMoIooLooIGGLo'
+
+class TestCotaAnytime(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        optima, _ = buscar(PUZZLE, 'AStar', heuristic_type=4)
+        cls.optimo = optima[-1].costo
+
+    # Con cualquier límite de nodos, la cota publicada es cierta: coste / óptimo <= SB
+    def test_cota_interrumpida(self):
+        for max_nodos in range(500, 8000, 500):
+            with self.subTest(max_nodos=max_nodos):
+                camino, stats = buscar(PUZZLE, 'ARAStar', heuristic_type=3, limites=Limites(max_nodos))
+                if camino is None:
+                    self.assertIsNone(stats.cota)
+                    continue
+                self.assertIsNotNone(stats.cota)
+                self.assertLessEqual(camino[-1].costo / self.optimo, stats.cota + 1e-9)
+
+    # Sin límites se demuestra la optimalidad
+    def test_optima(self):
+        camino, stats = buscar(PUZZLE, 'ARAStar', heuristic_type=4)
+        self.assertEqual(camino[-1].costo, self.optimo)
+        self.assertEqual(stats.motivo, OPTIMA)
+        self.assertEqual(stats.cota, 1)
+
+    # Con heurísticas no admisibles no hay cota
+    def test_sin_cota_no_admisible(self):
+        for heuristica in (0, 1, 2):
+            with self.subTest(heuristica=heuristica):
+                _, stats = buscar(PUZZLE, 'ARAStar', heuristic_type=heuristica)
+                self.assertIsNone(stats.cota)
+                _, stats = buscar(PUZZLE, 'ARAStar', heuristic_type=heuristica, limites=Limites(5000))
+                self.assertIsNone(stats.cota)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# test_basedatos.py
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import basedatos
+from basedatos import construir_bd, BaseDistancias, resolver_con_bd, bfs_retrogrado, _bases
+from bitboard import Layout
+from canonica import canonizar
+from solver import buscar
+
+# Puzzle pequeño (pocos vehículos) para que la base se construya en poco tiempo
+PUZZLE = 'ooBoooooBoooAABoCoooooCoDDDoooooEEoo'
+
+class TestBaseDistancias(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, 'bd.rhdb')
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    # Todas las distancias leídas del fichero coinciden con las de la BFS hacia atrás
+    def test_ida_y_vuelta(self):
+        total, maxima = construir_bd(PUZZLE, self.ruta)
+        layout = Layout(canonizar(PUZZLE)[0])
+        distancias = bfs_retrogrado(layout)
+        self.assertEqual(total, len(distancias))
+        self.assertEqual(maxima, max(distancias.values()))
+
+        bd = BaseDistancias(self.ruta)
+        try:
+            self.assertEqual(bd.ancho_distancia, 1)
+            bases = _bases(layout)
+            for estado, d in distancias.items():
+                self.assertEqual(bd.distancia(estado, bases), d)
+        finally:
+            bd.cerrar()
+
+    # La solución de la base tiene la misma longitud que la de BFS
+    def test_resolver(self):
+        construir_bd(PUZZLE, self.ruta)
+        bd = BaseDistancias(self.ruta)
+        try:
+            camino, _ = resolver_con_bd(PUZZLE, bd)
+        finally:
+            bd.cerrar()
+        optimo, _ = buscar(PUZZLE, 'BFS')
+        self.assertEqual(len(camino), len(optimo))
+        self.assertEqual(camino[-1].estado.cadena, optimo[-1].estado.cadena)
+
+    # Distancias de más de 255 movimientos: se guardan con 2 bytes sin perder información
+    def test_distancias_de_dos_bytes(self):
+        original = basedatos.bfs_retrogrado
+
+        def ampliadas(layout, procesos=None):
+            return {e: d * 300 for e, d in original(layout, procesos).items()}
+
+        with mock.patch.object(basedatos, 'bfs_retrogrado', ampliadas):
+            _, maxima = construir_bd(PUZZLE, self.ruta)
+        self.assertGreater(maxima, 255)
+
+        layout = Layout(canonizar(PUZZLE)[0])
+        bd = BaseDistancias(self.ruta)
+        try:
+            self.assertEqual(bd.ancho_distancia, 2)
+            bases = _bases(layout)
+            for estado, d in original(layout).items():
+                self.assertEqual(bd.distancia(estado, bases), d * 300)
+        finally:
+            bd.cerrar()
+
+if __name__ == '__main__':
+    unittest.main()
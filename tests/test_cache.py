@@ -0,0 +1,41 @@
+# test_cache.py
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from cache import CacheSoluciones
+from solver import buscar
+
+PUZZLE = 'HBBCCCHDDKoMAAJKoMEEJFFMoIooLooIGGLo'
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.cache = CacheSoluciones(os.path.join(self.directorio.name, 'cache.db'))
+
+    def tearDown(self):
+        self.cache.cerrar()
+        self.directorio.cleanup()
+
+    # Un acierto sobre un estado intermedio da una solución tan buena como la de la búsqueda
+    # (no necesariamente el mismo camino)
+    def test_aciertos_optimos(self):
+        for estrategia, heuristica in (('BFS', None), ('UC', None), ('AStar', 4)):
+            with self.subTest(estrategia=estrategia):
+                camino, _ = buscar(PUZZLE, estrategia, heuristic_type=heuristica, cache=self.cache)
+                for nodo in camino[1:-1:5]:
+                    cadena = nodo.estado.cadena
+                    cacheado, stats = buscar(cadena, estrategia, heuristic_type=heuristica, cache=self.cache)
+                    buscado, _ = buscar(cadena, estrategia, heuristic_type=heuristica)
+                    self.assertEqual(stats.en, 0)
+                    if estrategia == 'BFS':
+                        self.assertEqual(len(cacheado), len(buscado))
+                    else:
+                        self.assertEqual(cacheado[-1].costo, buscado[-1].costo)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# test_externa.py
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import externa
+from solver import buscar
+
+# Puzzles del README y un tablero de 7x7
+PUZZLES = [
+    'BBoJoooHoJKLGHAAKLGDDDKMooIEEMFFIooo',
+    'HBBCCCHDDKoMAAJKoMEEJFFMoIooLooIGGLo',
+    'KIFFFoDKIMoCNDKoMPCNDAAGPoNoRRGEELLHHQQOOooBBBoJJ',
+]
+
+class TestExterna(unittest.TestCase):
+
+    # EBFS encuentra soluciones de la misma longitud que BFS, con un camino válido
+    def test_longitud_como_bfs(self):
+        for puzzle in PUZZLES:
+            with self.subTest(puzzle=puzzle):
+                optimo, _ = buscar(puzzle, 'BFS')
+                camino, _ = buscar(puzzle, 'EBFS')
+                self.assertEqual(len(camino), len(optimo))
+                self.assertEqual(camino[0].estado.cadena, puzzle)
+                self.assertTrue(camino[-1].estado.es_meta())
+
+    # Con tramos diminutos hay muchos más de FUSION y la mezcla necesita varias pasadas; el resultado
+    # no cambia y no queda ningún fichero temporal
+    def test_mezcla_en_varias_pasadas(self):
+        puzzle = PUZZLES[0]
+        optimo, _ = buscar(puzzle, 'BFS')
+        reducciones = []
+        reducir = externa._reducir_tramos
+
+        def reducir_contando(tramos, registro, temporal):
+            resultado = reducir(tramos, registro, temporal)
+            reducciones.append((len(tramos), len(resultado)))
+            return resultado
+
+        with tempfile.TemporaryDirectory() as directorio, \
+                mock.patch.object(externa, 'TRAMO', 16), mock.patch.object(externa, 'FUSION', 4), \
+                mock.patch.object(externa, '_reducir_tramos', reducir_contando):
+            camino, _ = buscar(puzzle, 'EBFS', directorio=directorio)
+            self.assertEqual(os.listdir(directorio), [])
+
+        self.assertEqual(len(camino), len(optimo))
+        self.assertTrue(any(antes > 4 * 4 for antes, _ in reducciones))
+        self.assertTrue(all(despues <= 4 for _, despues in reducciones))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# test_generador.py
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC)
+
+from generador import generar
+from solver import buscar
+
+# QUE: Ejecuta la acción generate de la línea de órdenes y devuelve su salida.
+def generate(*argumentos):
+    return subprocess.run([sys.executable, os.path.join(SRC, 'rushhour.py'), 'generate', *argumentos],
+                          capture_output=True, text=True, check=True).stdout
+
+# Puzzles de un fichero de salida (una línea JSON por puzzle)
+def leer(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return [json.loads(linea) for linea in f if linea.strip()]
+
+class TestGenerador(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, 'puzzles.jsonl')
+
+    def tearDown(self):
+        self.directorio.cleanup()
+
+    # La orden genera el fichero y repetirla (o ampliarla) reanuda sin duplicar puzzles
+    def test_generate_y_reanudacion(self):
+        salida = generate('-o', self.ruta, '--layouts', '2', '--workers', '1')
+        self.assertIn('Disposiciones: 2', salida)
+        self.assertTrue(os.path.exists(self.ruta))
+        self.assertTrue(os.path.exists(self.ruta + '.progreso'))
+        primeros = leer(self.ruta)
+        self.assertTrue(primeros)
+
+        # Misma orden: no queda nada pendiente y el fichero no cambia
+        salida = generate('-o', self.ruta, '--layouts', '2', '--workers', '1')
+        self.assertIn('Disposiciones: 0', salida)
+        self.assertEqual(leer(self.ruta), primeros)
+
+        # Más disposiciones: solo se añaden las nuevas
+        generate('-o', self.ruta, '--layouts', '4', '--workers', '1')
+        puzzles = leer(self.ruta)
+        self.assertEqual(puzzles[:len(primeros)], primeros)
+        estados = [p['s'] for p in puzzles]
+        self.assertEqual(len(estados), len(set(estados)))
+        self.assertEqual({p['layout'] for p in puzzles} - {0, 1, 2, 3}, set())
+
+    # La longitud anotada de cada puzzle es la óptima (la de BFS)
+    def test_longitudes_optimas(self):
+        opciones = {'size': 6, 'min_vehicles': 8, 'max_vehicles': 13, 'min_moves': 1, 'max_states': None,
+                    'seed': 0}
+        resumen = generar(self.ruta, 2, opciones, procesos=1)
+        puzzles = leer(self.ruta)
+        self.assertEqual(resumen['puzzles'], len(puzzles))
+        for puzzle in puzzles:
+            camino, _ = buscar(puzzle['s'], 'BFS')
+            self.assertEqual(len(camino) - 1, puzzle['moves'])
+
+    # Reanudar con otras opciones es un error (la numeración de disposiciones no sería la misma)
+    def test_opciones_distintas(self):
+        generate('-o', self.ruta, '--layouts', '1', '--workers', '1')
+        with self.assertRaises(subprocess.CalledProcessError):
+            generate('-o', self.ruta, '--layouts', '2', '--workers', '1', '--seed', '1')
+
+if __name__ == '__main__':
+    unittest.main()
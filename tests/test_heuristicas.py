@@ -0,0 +1,58 @@
+# test_heuristicas.py
+import heapq
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from bitboard import Layout
+
+# Puzzles del README y uno pequeño cuyo espacio de estados se recorre entero
+PUZZLES = [
+    'ooBoooooBoooAABoCoooooCoDDDoooooEEoo',
+    'BBoJoooHoJKLGHAAKLGDDDKMooIEEMFFIooo',
+    'HBBCCCHDDKoMAAJKoMEEJFFMoIooLooIGGLo',
+]
+
+# QUE: Coste mínimo a la meta de todos los estados resolubles de una disposición.
+# POR QUE: Dijkstra hacia atrás desde todas las metas; los movimientos son reversibles y el
+#          inverso de un movimiento tiene su mismo coste.
+def costes_a_meta(layout):
+    costes = {}
+    cola = [(0, meta) for meta in layout.estados_meta()]
+    heapq.heapify(cola)
+    while cola:
+        g, estado = heapq.heappop(cola)
+        if estado in costes:
+            continue
+        costes[estado] = g
+        for _, hijo, coste in layout.sucesores(estado):
+            if hijo not in costes:
+                heapq.heappush(cola, (g + coste, hijo))
+    return costes
+
+class TestHeuristicasAdmisibles(unittest.TestCase):
+
+    # Las heurísticas 3 y 4 nunca superan el coste óptimo a la meta, en ningún estado resoluble
+    def test_admisibles(self):
+        for puzzle in PUZZLES:
+            layout = Layout(puzzle)
+            costes = costes_a_meta(layout)
+            for tipo in (3, 4):
+                excesos = [layout.decodificar(e) for e, c in costes.items() if layout.heuristica(e, tipo) > c]
+                self.assertEqual(excesos, [], f"heurística {tipo} no admisible en {puzzle}")
+
+    # El cálculo incremental coincide con el completo en todos los sucesores
+    def test_incremental(self):
+        for puzzle in PUZZLES:
+            layout = Layout(puzzle)
+            for estado in list(costes_a_meta(layout))[:500]:
+                for tipo in (0, 1, 2, 3, 4):
+                    h = layout.heuristica(estado, tipo)
+                    for _, hijo, _, movido in layout.movimientos(estado):
+                        self.assertEqual(layout.heuristica_incremental(h, estado, hijo, movido, tipo),
+                                         layout.heuristica(hijo, tipo))
+
+if __name__ == '__main__':
+    unittest.main()
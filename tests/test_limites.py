@@ -0,0 +1,34 @@
+# test_limites.py
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from limites import Limites, MAX_NODOS, SOLUCION
+from solver import buscar
+
+PUZZLE = 'BBoJoooHoJKLGHAAKLGDDDKMooIEEMFFIooo'
+
+class TestLimites(unittest.TestCase):
+
+    # Las estrategias del proceso principal se detienen al llegar al límite de nodos
+    def test_max_nodos(self):
+        for estrategia, heuristica in (('BFS', None), ('AStar', 3), ('BiBFS', None), ('EBFS', None)):
+            with self.subTest(estrategia=estrategia):
+                camino, stats = buscar(PUZZLE, estrategia, heuristic_type=heuristica, limites=Limites(500))
+                self.assertIsNone(camino)
+                self.assertEqual(stats.motivo, MAX_NODOS)
+                camino, stats = buscar(PUZZLE, estrategia, heuristic_type=heuristica, limites=Limites(10**7))
+                self.assertIsNotNone(camino)
+                self.assertEqual(stats.motivo, SOLUCION)
+
+    # HDAStar y PBFS no pueden aplicar los límites: se rechazan en lugar de ignorarlos
+    def test_rechazados(self):
+        for estrategia, heuristica in (('HDAStar', 3), ('PBFS', None)):
+            with self.subTest(estrategia=estrategia):
+                with self.assertRaises(ValueError):
+                    buscar(PUZZLE, estrategia, heuristic_type=heuristica, limites=Limites(500), procesos=2)
+
+if __name__ == '__main__':
+    unittest.main()
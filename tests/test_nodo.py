@@ -0,0 +1,50 @@
+# test_nodo.py
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from solver import buscar
+
+PUZZLE = 'ooBoooooBoooAABoCoooooCoDDDoooooEEoo'
+
+# (estrategia, heurística, procesos) de las búsquedas que numeran sus nodos fuera de AlmacenNodos
+BUSQUEDAS = [
+    ('BFS', None, None),
+    ('AStar', 3, None),
+    ('BiBFS', None, None),
+    ('IDAStar', 3, None),
+    ('ARAStar', 3, None),
+    ('HDAStar', 3, 2),
+    ('PBFS', None, 2),
+    ('EBFS', None, None),
+]
+
+class TestIdentificadores(unittest.TestCase):
+
+    # Los ids del camino empiezan en 0, no se repiten y no son simplemente la profundidad
+    def test_ids_unicos_por_busqueda(self):
+        for estrategia, heuristica, procesos in BUSQUEDAS:
+            with self.subTest(estrategia=estrategia):
+                camino, stats = buscar(PUZZLE, estrategia, heuristic_type=heuristica, procesos=procesos)
+                ids = [nodo.id for nodo in camino]
+                self.assertEqual(ids[0], 0)
+                self.assertEqual(len(set(ids)), len(ids))
+                self.assertNotEqual(ids, list(range(len(ids))))
+                for nodo in camino[1:]:
+                    self.assertEqual(nodo.padre.id, ids[ids.index(nodo.id) - 1])
+
+    # Dos búsquedas seguidas numeran igual (el contador es de cada búsqueda, no global). En las
+    # paralelas el orden de llegada de los lotes puede cambiar la numeración
+    def test_ids_reproducibles(self):
+        for estrategia, heuristica, procesos in BUSQUEDAS:
+            if procesos is not None:
+                continue
+            with self.subTest(estrategia=estrategia):
+                primero, _ = buscar(PUZZLE, estrategia, heuristic_type=heuristica, procesos=procesos)
+                segundo, _ = buscar(PUZZLE, estrategia, heuristic_type=heuristica, procesos=procesos)
+                self.assertEqual([n.id for n in primero], [n.id for n in segundo])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# test_paralelo.py
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from solver import buscar
+
+# Puzzles del README y un tablero de 7x7
+PUZZLES = [
+    'BBoJoooHoJKLGHAAKLGDDDKMooIEEMFFIooo',
+    'HBBCCCHDDKoMAAJKoMEEJFFMoIooLooIGGLo',
+    'KIFFFoDKIMoCNDKoMPCNDAAGPoNoRRGEELLHHQQOOooBBBoJJ',
+]
+
+# QUE: Comprueba que un camino parte del puzzle, llega a la meta y cuesta lo que dicen sus nodos.
+def comprobar_camino(test, puzzle, camino):
+    test.assertEqual(camino[0].estado.cadena, puzzle)
+    test.assertTrue(camino[-1].estado.es_meta())
+    for padre, hijo in zip(camino, camino[1:]):
+        coste = next(c for a, e, c in padre.estado.sucesores() if a == hijo.accion)
+        test.assertEqual(hijo.costo, padre.costo + coste)
+
+class TestParalelo(unittest.TestCase):
+
+    # HDA* con heurística admisible da el coste óptimo (el de UC), con uno y con varios procesos
+    def test_hda_coste_optimo(self):
+        for puzzle in PUZZLES:
+            optimo, _ = buscar(puzzle, 'UC')
+            for procesos in (1, 3):
+                with self.subTest(puzzle=puzzle, procesos=procesos):
+                    camino, _ = buscar(puzzle, 'HDAStar', heuristic_type=3, procesos=procesos)
+                    comprobar_camino(self, puzzle, camino)
+                    self.assertEqual(camino[-1].costo, optimo[-1].costo)
+
+    # PBFS da soluciones con el mínimo de movimientos (los de BFS)
+    def test_pbfs_longitud_optima(self):
+        for puzzle in PUZZLES:
+            optimo, _ = buscar(puzzle, 'BFS')
+            for procesos in (1, 3):
+                with self.subTest(puzzle=puzzle, procesos=procesos):
+                    camino, _ = buscar(puzzle, 'PBFS', procesos=procesos)
+                    comprobar_camino(self, puzzle, camino)
+                    self.assertEqual(len(camino), len(optimo))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# test_repeticion.py
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from repeticion import (repetir, repetir_lote, SINTAXIS, VEHICULO_INEXISTENTE, FUERA_DEL_TABLERO,
+                        CHOQUE)
+from solver import buscar
+
+PUZZLE = 'BBoJoooHoJKLGHAAKLGDDDKMooIEEMFFIooo'
+
+class TestRepeticion(unittest.TestCase):
+
+    # Una solución de la búsqueda se repite entera, llega a la meta y cuesta lo mismo
+    def test_solucion_valida(self):
+        camino, _ = buscar(PUZZLE, 'UC')
+        resultado = repetir(PUZZLE, [nodo.accion for nodo in camino[1:]])
+        self.assertTrue(resultado.valido)
+        self.assertTrue(resultado.meta)
+        self.assertEqual(resultado.aplicados, len(camino) - 1)
+        self.assertEqual(resultado.costo, camino[-1].costo)
+        self.assertEqual(resultado.estado, camino[-1].estado.cadena)
+
+    # Cada tipo de movimiento ilegal se detecta en su índice, con los anteriores ya aplicados
+    def test_motivos(self):
+        casos = [
+            (['K+1', 'A+'], 1, SINTAXIS),
+            (['K+1', 'Z+1'], 1, VEHICULO_INEXISTENTE),
+            (['K+1', 'K+5'], 1, FUERA_DEL_TABLERO),
+            (['K+1', 'A+1'], 1, CHOQUE),
+            (['A-1'], 0, CHOQUE),
+        ]
+        for acciones, indice, motivo in casos:
+            with self.subTest(acciones=acciones):
+                resultado = repetir(PUZZLE, acciones)
+                self.assertFalse(resultado.valido)
+                self.assertEqual(resultado.indice, indice)
+                self.assertEqual(resultado.motivo, motivo)
+                self.assertEqual(resultado.aplicados, indice)
+                self.assertFalse(resultado.meta)
+
+    # El choque indica el vehículo bloqueador
+    def test_detalle_choque(self):
+        resultado = repetir(PUZZLE, ['A+1'])
+        self.assertEqual(resultado.motivo, CHOQUE)
+        self.assertIn('K', resultado.detalle)
+
+    # El lote acepta la salida de batch y da un error por línea sin detenerse
+    def test_lote(self):
+        lineas = [
+            json.dumps({'s': PUZZLE, 'solution': ['K+1']}),
+            json.dumps({'s': PUZZLE, 'moves': 'K+1,A+9'}),
+            json.dumps({'s': PUZZLE}),
+            '',
+        ]
+        resultados = list(repetir_lote(lineas))
+        self.assertEqual([r['index'] for r in resultados], [0, 1, 2])
+        self.assertTrue(resultados[0]['valid'])
+        self.assertEqual(resultados[1]['reason'], FUERA_DEL_TABLERO)
+        self.assertEqual(resultados[1]['error_index'], 1)
+        self.assertIn('error', resultados[2])
+
+if __name__ == '__main__':
+    unittest.main()